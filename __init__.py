@@ -1,9 +1,29 @@
 # __init__.py
-from .order_check import OrderManager
-from .auth import TokenManager
-from .order_csv import CSVManager
-from .order_slack import SlackManager
-from .order_sms import SMSManager
-from .utils import load_config
+# 하위 모듈은 실제로 사용할 때 로드합니다 (PEP 562).
+# 예: load_config만 필요한 도구는 requests/bcrypt를 불러오지 않습니다.
+import importlib
+
+_LAZY_ATTRIBUTES = {
+    'OrderManager': '.order_check',
+    'AsyncOrderManager': '.async_order_check',
+    'TokenManager': '.auth',
+    'CSVManager': '.order_csv',
+    'SlackManager': '.notifications.slack_manager',
+    'SMSManager': '.order_sms',
+    'KakaoTalkManager': '.order_kakao',
+    'OrderArchive': '.order_archive',
+    'load_config': '.utils',
+}
 
 __all__ = ['OrderManager', 'TokenManager']
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
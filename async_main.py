@@ -0,0 +1,61 @@
+import asyncio
+from order_management.async_order_check import AsyncOrderManager
+from order_management.scheduler import PollScheduler
+from order_management.notifications import SystemMessageTemplate
+from order_management.utils import load_config, setup_logging
+from order_management.config_service import default_config_path, get_config_service
+from order_management.http_client import get_http_client
+from order_management.metrics import start_metrics_server
+
+async def run(config):
+    # AsyncOrderManager 초기화 (30분 주기로 토큰 갱신)
+    async_manager = AsyncOrderManager(
+        client_id=config['CLIENT_ID'],
+        client_secret=config['CLIENT_SECRET'],
+        token_refresh_minutes=30,
+        max_concurrency=int(config.get('ASYNC_MAX_CONCURRENCY', 10))
+    )
+    
+    # 시작 알림 전송
+    startup_message = SystemMessageTemplate.create_startup_message()
+    await asyncio.to_thread(async_manager.slack_manager.send_order_notification, startup_message)
+    async_manager.logger.info("시작 알림 전송 완료")
+    
+    # 주문 모니터링 루프 (주문 유입량에 따라 조회 주기 조정)
+    try:
+        await async_manager.run_forever(scheduler=PollScheduler.from_config(config))
+    finally:
+        async_manager.order_manager.close()
+
+def main():
+    # 로그 출력은 별도 스레드에서 처리하여 주문 조회 루프가 디스크 I/O를 기다리지 않도록 함
+    logger = setup_logging(use_queue=True)
+    logger.info("프로그램 시작 (asyncio 모드)")
+    
+    try:
+        # 설정 로드
+        config_path = default_config_path()
+        
+        config = load_config(config_path)
+        if not config:
+            logger.error(f"설정 파일을 찾을 수 없습니다: {config_path}")
+            return
+        
+        # SIGHUP 수신 시 설정 다시 로드 (kill -HUP <pid>, 재로드는 조회 루프에서 실행)
+        get_config_service(config_path).install_sighup_handler()
+        
+        # 지표 수집 엔드포인트 (METRICS_PORT 설정 시 http://127.0.0.1:<port>/metrics)
+        if config.get('METRICS_PORT'):
+            start_metrics_server(config['METRICS_PORT'], config.get('METRICS_HOST', '127.0.0.1'))
+        
+        asyncio.run(run(config))
+        
+    except KeyboardInterrupt:
+        logger.info("프로그램 종료")
+    except Exception as e:
+        logger.error(f"예상치 못한 오류 발생: {str(e)}", exc_info=True)
+    finally:
+        get_http_client().close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+# async_order_check.py
+import asyncio
+from .order_check import OrderManager
+from .scheduler import PollScheduler
+from .utils import setup_logging
+from .config_service import get_config_service
+
+
+class AsyncOrderManager:
+    """asyncio 기반 주문 처리기 (OrderManager의 동작을 동시 실행으로 처리)"""
+
+    def __init__(self, order_manager=None, max_concurrency=10, order_handlers=None, batch_handlers=None, **kwargs):
+        """
+        order_manager: 기존 OrderManager (없으면 kwargs로 새로 생성)
+        max_concurrency: 동시에 실행할 외부 호출 수 상한
+        order_handlers: 주문 1건(order_data)마다 호출할 함수 목록 (예: SMS 발송)
+        batch_handlers: 처리 주기마다 주문 목록 전체로 한 번 호출할 함수 목록 (예: CSV 저장)
+        """
+        self.logger = setup_logging()
+        self.order_manager = order_manager or OrderManager(**kwargs)
+        self.max_concurrency = max_concurrency
+        self.order_handlers = list(order_handlers or [])
+        self.batch_handlers = list(batch_handlers or [])
+        self._semaphore = None
+        self.logger.info(f"AsyncOrderManager 초기화 완료 (동시 실행 수: {max_concurrency})")
+
+    @property
+    def slack_manager(self):
+        return self.order_manager.slack_manager
+
+    @property
+    def semaphore(self):
+        # 이벤트 루프 안에서 생성해야 하므로 최초 사용 시 생성
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _run_bounded(self, func, *args):
+        """동시 실행 수 제한 하에서 블로킹 함수를 스레드로 실행"""
+        async with self.semaphore:
+            return await asyncio.to_thread(func, *args)
+
+    async def get_order_details(self, product_order_ids, last_changed_dates=None):
+        """주문 상세 정보 조회 (OrderManager가 캐시 확인 후 묶음 단위로 병렬 조회)"""
+        order_details = await self._run_bounded(
+            self.order_manager.get_order_details, product_order_ids, last_changed_dates
+        )
+        return order_details or {'data': []}
+
+    async def _run_order_handler(self, handler, order_data):
+        try:
+            await self._run_bounded(handler, order_data)
+        except Exception as e:
+            self.logger.error(f"주문 후처리 중 오류: {str(e)}", exc_info=True)
+
+    async def _run_batch_handler(self, handler, order_data_list):
+        try:
+            await self._run_bounded(handler, order_data_list)
+        except Exception as e:
+            self.logger.error(f"주문 일괄 후처리 중 오류: {str(e)}", exc_info=True)
+
+    async def process_new_orders(self):
+        """신규 주문 처리 (페이지를 받는 대로 처리하며 다음 페이지는 미리 조회), 조회된 변경 주문 수 반환"""
+        orders_seen = 0
+        change_type_polls = []
+        try:
+            # 결제 완료 외의 변경 구분은 별도 스레드에서 동시에 조회
+            change_type_polls = self.order_manager.start_change_type_polls()
+
+            # 이전 주기에 전송하지 못한 알림 재전송
+            delivered = await asyncio.to_thread(self.order_manager.notification_coalescer.flush_pending)
+            self.order_manager.mark_notified(delivered)
+
+            pages = self.order_manager.iter_new_order_pages()
+            cursor_held = False
+            while True:
+                orders = await asyncio.to_thread(next, pages, None)
+                if orders is None:
+                    break
+
+                orders_seen += len(orders)
+                await asyncio.to_thread(self.order_manager.track_lifecycle, orders)
+                failed_order_ids = await self.process_order_page(orders)
+
+                # 실패한 주문이 있으면 이후 페이지에서 커서를 앞으로 옮기지 않음
+                if not cursor_held:
+                    self.order_manager.advance_cursor(orders, failed_order_ids)
+                    cursor_held = bool(failed_order_ids)
+
+        except Exception as e:
+            self.logger.error(f"주문 처리 중 오류 발생: {str(e)}", exc_info=True)
+        finally:
+            # 오류가 나도 다음 주기가 같은 변경 구분/커서를 동시에 조회하지 않도록 완료까지 대기
+            orders_seen += await asyncio.to_thread(self.order_manager.wait_change_type_polls, change_type_polls)
+
+        return orders_seen
+
+    async def process_order_page(self, orders):
+        """주문 목록 한 페이지 처리 (알림이 완료되지 않은 상품주문번호 집합 반환)"""
+        # 처리할 주문 필터링
+        notified_order_ids = self.order_manager.notified_order_ids
+        new_orders = [
+            order for order in orders
+            if order.get('productOrderId') not in notified_order_ids
+        ]
+
+        if not new_orders:
+            return set()
+
+        self.logger.info(f"처리할 신규 주문: {len(new_orders)}건")
+
+        # 주문 상세 정보 조회
+        product_order_ids = [order.get('productOrderId') for order in new_orders]
+        last_changed_dates = {order.get('productOrderId'): order.get('lastChangedDate') for order in new_orders}
+        order_details = await self.get_order_details(product_order_ids, last_changed_dates)
+        order_data_list = order_details.get('data', [])
+        if not order_data_list:
+            self.logger.error("주문 상세 정보 조회 실패")
+            return set(product_order_ids)
+
+        # 알림 전송과 후처리를 동시에 실행 (알림은 급증 시 요약 알림으로 묶어서 병렬 전송)
+        tasks = [
+            self._run_batch_handler(self.order_manager.archive_order_details, order_data_list),
+            self._run_batch_handler(self.order_manager.notify_orders, order_data_list)
+        ]
+        tasks += [
+            self._run_order_handler(handler, order_data)
+            for handler in self.order_handlers
+            for order_data in order_data_list
+        ]
+        tasks += [
+            self._run_batch_handler(handler, order_data_list)
+            for handler in self.batch_handlers
+        ]
+        await asyncio.gather(*tasks)
+
+        # 알림이 완료되지 않은 주문은 다음 주기에 다시 조회되도록 반환
+        return {
+            product_order_id for product_order_id in product_order_ids
+            if product_order_id not in notified_order_ids
+        }
+
+    async def run_forever(self, scheduler=None):
+        """주문 모니터링 루프 (scheduler가 없으면 10초 고정 주기)"""
+        scheduler = scheduler or PollScheduler(base_interval=10, min_interval=10, max_interval=10, jitter_ratio=0)
+        config_service = get_config_service()
+        while True:
+            await asyncio.sleep(scheduler.next_delay())
+
+            # 설정 파일 변경/SIGHUP 재로드 요청 확인 (구독 함수가 토큰 재발급을 기다릴 수 있으므로 스레드에서 실행)
+            await asyncio.to_thread(config_service.poll)
+
+            try:
+                orders_seen = await self.process_new_orders()
+                scheduler.record_result(orders_seen)
+                scheduler.note_rate_limits(self.order_manager.take_response_headers())
+            except Exception as e:
+                self.logger.error(f"주문 처리 중 오류 발생: {str(e)}", exc_info=True)
@@ -1,15 +1,23 @@
 # auth.py
+import threading
 import time
 import bcrypt
 import pybase64
-import requests
 import json
 from datetime import datetime, timedelta
 from .utils import setup_logging
+from .http_client import get_http_client
+from .resilience import CircuitOpenError
+from .metrics import timed_stage
+from .token_cache import TokenCache
 from .notifications import SystemMessageTemplate
 
+# 네이버 커머스 API 기본 주소 (COMMERCE_API_BASE_URL 로 변경 가능)
+DEFAULT_COMMERCE_API_BASE_URL = "https://api.commerce.naver.com"
+
 class TokenManager:
-    def __init__(self, client_id, client_secret, token_refresh_minutes=30, slack_manager=None):
+    def __init__(self, client_id, client_secret, token_refresh_minutes=30, slack_manager=None, http_client=None,
+                 token_cache_file=None, api_base_url=DEFAULT_COMMERCE_API_BASE_URL):
         self.client_id = client_id
         self.client_secret = client_secret
         self.current_token = None
@@ -17,10 +25,65 @@ class TokenManager:
         self.token_expires_at = None
         self.token_refresh_minutes = token_refresh_minutes
         self.slack_manager = slack_manager
+        self.http_client = http_client or get_http_client()
         self.logger = setup_logging()
-        self.token_url = "https://api.commerce.naver.com/external/v1/oauth2/token"
+        self.token_url = f"{api_base_url.rstrip('/')}/external/v1/oauth2/token"
+        
+        # 동시에 여러 곳에서 갱신하지 않도록 하나의 갱신만 진행
+        self._refresh_lock = threading.Lock()
+        self._token_generation = 0
+        self._refresher_thread = None
+        self._stop_event = threading.Event()
+        
+        # 재시작 시 아직 유효한 토큰을 재사용
+        self.token_cache_file = token_cache_file
+        self.token_cache = TokenCache(token_cache_file, client_id) if token_cache_file else None
+        self._load_cached_token()
+        
         self.logger.info(f"TokenManager 초기화 완료 (갱신 주기: {token_refresh_minutes}분)")
 
+    def _load_cached_token(self):
+        """파일에 저장된 토큰이 아직 유효하면 사용"""
+        if not self.token_cache:
+            return
+        
+        token_data = self.token_cache.load()
+        if not token_data:
+            return
+        
+        token_expires_at = datetime.fromtimestamp(token_data['expires_at'])
+        if datetime.now() >= token_expires_at - timedelta(minutes=1):
+            return
+        
+        self.current_token = token_data['access_token']
+        self.expires_in = token_data['expires_in']
+        self.token_expires_at = token_expires_at
+        self.logger.info(f"저장된 토큰 사용 (만료시간: {self.token_expires_at})")
+
+    def update_credentials(self, client_id, client_secret):
+        """인증 정보 변경 (바뀐 경우 새 인증 정보로 토큰 재발급)"""
+        if client_id == self.client_id and client_secret == self.client_secret:
+            return True
+        
+        with self._refresh_lock:
+            self.client_id = client_id
+            self.client_secret = client_secret
+            if self.token_cache_file:
+                self.token_cache = TokenCache(self.token_cache_file, client_id)
+            self.logger.info("인증 정보 변경, 토큰 재발급")
+            return self._refresh_token()
+
+    def _refresh_due_at(self):
+        """갱신 주기에 따른 다음 갱신 시각"""
+        issued_at = self.token_expires_at - timedelta(seconds=self.expires_in)
+        return issued_at + timedelta(minutes=self.token_refresh_minutes)
+
+    def seconds_until_refresh(self):
+        """다음 갱신까지 남은 시간(초), 토큰이 없으면 0"""
+        if not self.current_token or not self.token_expires_at:
+            return 0
+        return (self._refresh_due_at() - datetime.now()).total_seconds()
+
     def is_token_valid(self):
         """토큰 유효성 검사"""
         if not self.current_token or not self.token_expires_at:
@@ -44,13 +107,18 @@ class TokenManager:
             minutes_since_last_refresh = (current_time - (self.token_expires_at - timedelta(seconds=self.expires_in))).total_seconds() / 60
             
             if minutes_since_last_refresh >= self.token_refresh_minutes:
+                # 백그라운드 갱신 중이고 토큰이 아직 만료되지 않았다면 기다리지 않고 현재 토큰 사용
+                if self.is_background_refresh_running() and current_time < self.token_expires_at - timedelta(minutes=1):
+                    self.logger.debug("백그라운드 토큰 갱신 대기 중, 현재 토큰 사용")
+                    return self.current_token
+                
                 self.logger.info(f"토큰 갱신 필요 (마지막 갱신으로부터 {minutes_since_last_refresh:.1f}분 경과)")
                 if self.refresh_token():
                     return self.current_token
                 return None
                 
             # 토큰이 아직 유효한 경우
-            self.logger.debug(f"토큰 유효함 (만료까지 {(self.token_expires_at - current_time).total_seconds() / 60:.1f}분 남음)")
+            self.logger.debug("토큰 유효함 (만료까지 %.1f분 남음)", (self.token_expires_at - current_time).total_seconds() / 60)
             return self.current_token
             
         except Exception as e:
@@ -58,7 +126,17 @@ class TokenManager:
             return None
 
     def refresh_token(self):
-        """토큰 갱신"""
+        """토큰 갱신 (동시에 호출되면 진행 중인 갱신 결과를 함께 사용)"""
+        generation = self._token_generation
+        with self._refresh_lock:
+            if self._token_generation != generation and self.current_token:
+                self.logger.debug("다른 요청에서 토큰 갱신 완료, 갱신된 토큰 사용")
+                return True
+            return self._refresh_token()
+
+    @timed_stage('token_refresh')
+    def _refresh_token(self):
+        """토큰 갱신 요청"""
         try:
             self.logger.info("토큰 갱신 시작")
             
@@ -76,7 +154,10 @@ class TokenManager:
                 "type": "SELF"
             }
             
-            response = requests.post(self.token_url, headers=headers, data=data)
+            # 토큰 발급 요청은 서버에 전달된 뒤 실패하면 이미 발급되었을 수 있으므로,
+            # 연결 실패처럼 전달되지 않은 경우에만 HttpClient가 재시도 (그 밖의 실패는 다음 갱신 시도에서 처리)
+            response = self.http_client.post(self.token_url, headers=headers, data=data,
+                                             endpoint='commerce.oauth_token')
             self.logger.info(f"토큰 갱신 응답 상태 코드: {response.status_code}")
             
             if response.status_code == 200:
@@ -85,6 +166,14 @@ class TokenManager:
                     self.current_token = token_data['access_token']
                     self.expires_in = token_data.get('expires_in', 10800)
                     self.token_expires_at = datetime.now() + timedelta(seconds=self.expires_in)
+                    self._token_generation += 1
+                    
+                    if self.token_cache:
+                        self.token_cache.save({
+                            'access_token': self.current_token,
+                            'expires_in': self.expires_in,
+                            'expires_at': self.token_expires_at.timestamp()
+                        })
                     
                     self.logger.info(f"토큰 갱신 성공 (만료시간: {self.token_expires_at})")
                     
@@ -113,6 +202,10 @@ class TokenManager:
             
             return False
             
+        except CircuitOpenError as e:
+            # 차단 중에는 Slack 알림 없이 다음 갱신 시도를 기다림
+            self.logger.warning(f"토큰 갱신 생략: {str(e)}")
+            return False
         except Exception as e:
             error_message = str(e)
             self.logger.error(f"토큰 갱신 중 오외 발생: {error_message}", exc_info=True)
@@ -129,6 +222,44 @@ class TokenManager:
             
             return False
 
+    def start_background_refresh(self, retry_seconds=30):
+        """만료 전에 미리 토큰을 갱신하는 백그라운드 스레드 시작"""
+        if self.is_background_refresh_running():
+            return
+        
+        self._stop_event.clear()
+        self._refresher_thread = threading.Thread(
+            target=self._background_refresh_loop,
+            args=(retry_seconds,),
+            name='token-refresher',
+            daemon=True
+        )
+        self._refresher_thread.start()
+        self.logger.info("백그라운드 토큰 갱신 시작")
+
+    def stop_background_refresh(self, timeout=5):
+        """백그라운드 토큰 갱신 종료"""
+        self._stop_event.set()
+        if self._refresher_thread:
+            self._refresher_thread.join(timeout)
+            self._refresher_thread = None
+
+    def is_background_refresh_running(self):
+        return self._refresher_thread is not None and self._refresher_thread.is_alive()
+
+    def _background_refresh_loop(self, retry_seconds):
+        while not self._stop_event.is_set():
+            wait_seconds = self.seconds_until_refresh()
+            if wait_seconds > 0:
+                if self._stop_event.wait(wait_seconds):
+                    return
+                continue
+            
+            if not self.refresh_token():
+                self.logger.warning(f"백그라운드 토큰 갱신 실패, {retry_seconds}초 후 재시도")
+                if self._stop_event.wait(retry_seconds):
+                    return
+
     def update_token(self):
         """토큰 갱신 (이전 코드와의 호환성을 위한 메서드)"""
         return self.refresh_token()
@@ -146,7 +277,7 @@ class TokenManager:
             
             secret_sign = pybase64.standard_b64encode(hashed).decode('utf-8')
             
-            self.logger.debug(f"시크릿 서명 생성: timestamp={timestamp}")
+            self.logger.debug("시크릿 서명 생성: timestamp=%s", timestamp)
             return secret_sign, timestamp
             
         except Exception as e:
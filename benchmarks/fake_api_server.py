@@ -0,0 +1,382 @@
+# fake_api_server.py
+# 부하/장시간 테스트용 가짜 API 서버 (네이버 커머스 토큰/변경 주문/상세 조회, Slack Webhook, SENS)
+# 실행: 상위 디렉토리에서 python3 -m order_management.benchmarks.fake_api_server --port 8900 --order-rate 5
+import argparse
+import bisect
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from ..cursor_store import KST, format_changed_date, parse_changed_date
+
+TOKEN_PATH = '/external/v1/oauth2/token'
+LIST_PATH = '/external/v1/pay-order/seller/product-orders/last-changed-statuses'
+QUERY_PATH = '/external/v1/pay-order/seller/product-orders/query'
+SLACK_PATH_PREFIX = '/slack/'
+SENS_PATH_PATTERN = re.compile(r'^/(sms|alimtalk)/v2/services/[^/]+/messages$')
+
+# Slack 메시지에서 주문을 식별하기 위해 상품 옵션에 넣는 표식
+ORDER_MARKER_PATTERN = re.compile(r'#(\d{16})')
+FIRST_PRODUCT_ORDER_ID = 2024000000000000
+
+
+class FakeApiState:
+    """가짜 서버 상태 (생성된 주문, 발급 토큰, 알림 수신 기록, 응답 통계)
+
+    - order_rate: 초당 생성할 주문 수
+    - latency_ms / latency_jitter_ms: 모든 응답에 더할 지연 시간
+    - error_rate / unauthorized_rate / rate_limit_rate: 500 / 401 / 429 응답 비율
+    """
+
+    def __init__(self, order_rate=1.0, page_size=300, token_ttl=10800, latency_ms=0, latency_jitter_ms=0,
+                 error_rate=0.0, unauthorized_rate=0.0, rate_limit_rate=0.0, retry_after=1,
+                 retention_seconds=86400, seed=None):
+        self.order_rate = order_rate
+        self.page_size = page_size
+        self.token_ttl = token_ttl
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.error_rate = error_rate
+        self.unauthorized_rate = unauthorized_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.retention_seconds = retention_seconds
+        self.random = random.Random(seed)
+
+        self._lock = threading.Lock()
+        self._next_id = FIRST_PRODUCT_ORDER_ID
+        self._order_times = []   # 변경 일시(epoch 초), 정렬 상태 유지
+        self._orders = []        # (상품주문번호, 변경 일시 문자열)
+        self._created_at = {}    # 상품주문번호 -> 생성 시각(epoch 초)
+        self._tokens = {}        # 토큰 -> 만료 시각(epoch 초)
+        self._notified = set()
+        self._latencies = []
+        self._window_latencies = []
+        self.generated_count = 0
+        self.duplicate_notifications = 0
+        self.responses = {}      # '경로 구분 응답 코드' -> 횟수
+
+        self._stop_event = threading.Event()
+        self._generator_thread = None
+
+    # 주문 생성
+    def add_orders(self, count):
+        now = time.time()
+        changed_date = format_changed_date(datetime.fromtimestamp(now, KST))
+        with self._lock:
+            for _ in range(count):
+                product_order_id = str(self._next_id)
+                self._next_id += 1
+                self._order_times.append(now)
+                self._orders.append((product_order_id, changed_date))
+                self._created_at[product_order_id] = now
+            self.generated_count += count
+            self._prune(now)
+
+    def _prune(self, now):
+        cutoff = bisect.bisect_left(self._order_times, now - self.retention_seconds)
+        if cutoff:
+            for product_order_id, _ in self._orders[:cutoff]:
+                self._created_at.pop(product_order_id, None)
+            del self._order_times[:cutoff]
+            del self._orders[:cutoff]
+
+    def start_generator(self, tick_seconds=0.05):
+        """order_rate에 맞춰 주문을 계속 생성하는 스레드 시작"""
+        def run():
+            carry = 0.0
+            last = time.monotonic()
+            while not self._stop_event.wait(tick_seconds):
+                now = time.monotonic()
+                carry += (now - last) * self.order_rate
+                last = now
+                count = int(carry)
+                if count:
+                    carry -= count
+                    self.add_orders(count)
+
+        self._generator_thread = threading.Thread(target=run, name='fake-order-generator', daemon=True)
+        self._generator_thread.start()
+
+    def stop_generator(self):
+        self._stop_event.set()
+        if self._generator_thread is not None:
+            self._generator_thread.join()
+
+    # 네이버 커머스 API
+    def issue_token(self):
+        token = uuid.uuid4().hex
+        with self._lock:
+            self._tokens[token] = time.time() + self.token_ttl
+        return token
+
+    def is_token_valid(self, authorization):
+        token = (authorization or '').replace('Bearer ', '', 1)
+        expires_at = self._tokens.get(token)
+        return expires_at is not None and expires_at > time.time()
+
+    def list_orders(self, last_changed_from, more_sequence=0):
+        """lastChangedFrom 이후 변경 주문 한 페이지와 연속 조회 정보"""
+        from_time = parse_changed_date(last_changed_from)
+        from_epoch = from_time.timestamp() if from_time else 0
+        with self._lock:
+            start = bisect.bisect_left(self._order_times, from_epoch) + more_sequence
+            page = self._orders[start:start + self.page_size]
+            has_more = start + self.page_size < len(self._orders)
+
+        statuses = [
+            {'productOrderId': product_order_id, 'productOrderStatus': 'PAYED', 'lastChangedDate': changed_date}
+            for product_order_id, changed_date in page
+        ]
+        more = None
+        if has_more:
+            more = {'moreFrom': last_changed_from, 'moreSequence': str(more_sequence + self.page_size)}
+        return statuses, more
+
+    @staticmethod
+    def order_detail(product_order_id):
+        index = int(product_order_id) - FIRST_PRODUCT_ORDER_ID
+        return {
+            'productOrder': {
+                'productOrderId': product_order_id,
+                'productId': str(1000 + index % 10),
+                'productName': f'부하 테스트 상품 {index % 10}',
+                'productOption': f'옵션 #{product_order_id}',
+                'quantity': 1,
+                'totalPaymentAmount': 19900,
+                'productOrderStatus': 'PAYED',
+            },
+            'order': {
+                'orderId': str(int(product_order_id) + 1000000000000000),
+                'orderDate': format_changed_date(datetime.now(KST)),
+                'ordererName': '부하테스트',
+                'ordererTel': f'010-0000-{index % 10000:04d}',
+            },
+        }
+
+    # Slack
+    def record_notification(self, body):
+        """Slack 메시지에 포함된 주문의 알림 지연 시간 기록"""
+        now = time.time()
+        with self._lock:
+            for product_order_id in ORDER_MARKER_PATTERN.findall(body):
+                created_at = self._created_at.get(product_order_id)
+                if created_at is None:
+                    continue
+                if product_order_id in self._notified:
+                    self.duplicate_notifications += 1
+                    continue
+                self._notified.add(product_order_id)
+                latency = now - created_at
+                self._latencies.append(latency)
+                self._window_latencies.append(latency)
+
+    # 통계
+    def count_response(self, route, status):
+        with self._lock:
+            key = f'{route} {status}'
+            self.responses[key] = self.responses.get(key, 0) + 1
+
+    def take_window_latencies(self):
+        """직전 호출 이후 기록된 알림 지연 시간 목록"""
+        with self._lock:
+            latencies, self._window_latencies = self._window_latencies, []
+        return latencies
+
+    def stats(self, include_latencies=False):
+        with self._lock:
+            stats = {
+                'generated': self.generated_count,
+                'notified': len(self._notified),
+                'duplicate_notifications': self.duplicate_notifications,
+                'responses': dict(self.responses),
+            }
+            if include_latencies:
+                stats['latencies'] = list(self._latencies)
+            return stats
+
+
+class _FakeApiRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    state = None
+
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length).decode('utf-8') if length else ''
+
+    def _send_json(self, route, status, data, headers=None):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        self.state.count_response(route, status)
+
+    def _inject_fault(self, route, check_token=False):
+        """지연/오류 주입, 오류 응답을 보냈으면 True"""
+        state = self.state
+        delay_ms = state.latency_ms + state.random.uniform(0, state.latency_jitter_ms)
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+
+        if state.rate_limit_rate and state.random.random() < state.rate_limit_rate:
+            self._send_json(route, 429, {'code': 'TooManyRequests'}, {'Retry-After': str(state.retry_after)})
+            return True
+        if state.error_rate and state.random.random() < state.error_rate:
+            self._send_json(route, 500, {'code': 'InternalServerError'})
+            return True
+        if check_token:
+            unauthorized = state.unauthorized_rate and state.random.random() < state.unauthorized_rate
+            if unauthorized or not state.is_token_valid(self.headers.get('Authorization')):
+                self._send_json(route, 401, {'code': 'Unauthorized'})
+                return True
+        return False
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path != LIST_PATH:
+            self._send_json('unknown', 404, {'code': 'NotFound'})
+            return
+        if self._inject_fault('list', check_token=True):
+            return
+
+        query = parse_qs(url.query)
+        last_changed_from = (query.get('lastChangedFrom') or [''])[0]
+        more_sequence = int((query.get('moreSequence') or ['0'])[0] or 0)
+        statuses, more = self.state.list_orders(last_changed_from, more_sequence)
+        data = {'lastChangeStatuses': statuses}
+        if more:
+            data['more'] = more
+        self._send_json('list', 200, {'timestamp': format_changed_date(datetime.now(KST)), 'data': data})
+
+    def do_POST(self):
+        path = urlsplit(self.path).path
+        body = self._read_body()
+
+        if path == TOKEN_PATH:
+            if self._inject_fault('token'):
+                return
+            self._send_json('token', 200, {
+                'access_token': self.state.issue_token(),
+                'expires_in': self.state.token_ttl,
+                'token_type': 'Bearer',
+            })
+        elif path == QUERY_PATH:
+            if self._inject_fault('query', check_token=True):
+                return
+            product_order_ids = json.loads(body or '{}').get('productOrderIds', [])
+            self._send_json('query', 200, {
+                'data': [self.state.order_detail(str(product_order_id)) for product_order_id in product_order_ids]
+            })
+        elif path.startswith(SLACK_PATH_PREFIX):
+            if self._inject_fault('slack'):
+                return
+            self.state.record_notification(body)
+            self._send_json('slack', 200, {'ok': True})
+        elif SENS_PATH_PATTERN.match(path):
+            route = SENS_PATH_PATTERN.match(path).group(1)
+            if self._inject_fault(route):
+                return
+            self._send_json(route, 202, {
+                'requestId': uuid.uuid4().hex,
+                'requestTime': datetime.now(KST).isoformat(timespec='seconds'),
+                'statusCode': '202',
+                'statusName': 'success',
+            })
+        else:
+            self._send_json('unknown', 404, {'code': 'NotFound'})
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeApiServer:
+    """가짜 API 서버 (백그라운드 스레드에서 실행)"""
+
+    def __init__(self, state=None, host='127.0.0.1', port=0):
+        self.state = state or FakeApiState()
+        handler = type('FakeApiRequestHandler', (_FakeApiRequestHandler,), {'state': self.state})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self, generate_orders=True):
+        self._thread = threading.Thread(target=self.server.serve_forever, name='fake-api-server', daemon=True)
+        self._thread.start()
+        if generate_orders and self.state.order_rate > 0:
+            self.state.start_generator()
+        return self
+
+    def stop(self):
+        self.state.stop_generator()
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def add_arguments(parser):
+    """가짜 서버 설정 인자 (soak.py와 공용)"""
+    parser.add_argument('--order-rate', type=float, default=1.0, help='초당 생성할 주문 수')
+    parser.add_argument('--page-size', type=int, default=300, help='변경 주문 조회 페이지 크기')
+    parser.add_argument('--token-ttl', type=int, default=10800, help='토큰 유효 시간(초)')
+    parser.add_argument('--latency-ms', type=float, default=0, help='응답 지연(ms)')
+    parser.add_argument('--latency-jitter-ms', type=float, default=0, help='추가 무작위 지연 최대값(ms)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='500 응답 비율')
+    parser.add_argument('--unauthorized-rate', type=float, default=0.0, help='401 응답 비율')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='429 응답 비율')
+    parser.add_argument('--retry-after', type=int, default=1, help='429 응답의 Retry-After(초)')
+    parser.add_argument('--seed', type=int, help='오류 주입 난수 시드')
+
+
+def state_from_args(args):
+    return FakeApiState(
+        order_rate=args.order_rate,
+        page_size=args.page_size,
+        token_ttl=args.token_ttl,
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        error_rate=args.error_rate,
+        unauthorized_rate=args.unauthorized_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='부하 테스트용 가짜 네이버 커머스/Slack/SENS 서버')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8900)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    server = FakeApiServer(state_from_args(args), args.host, args.port).start()
+    print(f"가짜 API 서버 시작: {server.url}")
+    print(f"  COMMERCE_API_BASE_URL / SMS_BASE_URL / KAKAO_BASE_URL = {server.url}")
+    print(f"  WEBHOOK_ORDER = {server.url}{SLACK_PATH_PREFIX}order, WEBHOOK_LOG = {server.url}{SLACK_PATH_PREFIX}log")
+    try:
+        while True:
+            time.sleep(10)
+            stats = server.state.stats()
+            print(f"생성 {stats['generated']}건, 알림 {stats['notified']}건, 중복 알림 {stats['duplicate_notifications']}건")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
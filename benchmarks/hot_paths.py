@@ -0,0 +1,197 @@
+# hot_paths.py
+# 주문 처리 경로의 주요 함수 실행 시간 측정
+# 실행: 상위 디렉토리에서 python3 -m order_management.benchmarks.hot_paths [--sizes 10000,100000] [--output 파일.json]
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+
+import bcrypt
+
+from ..auth import TokenManager
+from ..notifications import OrderMessageTemplate
+from ..order_check import OrderManager
+from ..order_csv import CSVManager
+from ..order_kakao import KakaoTalkManager
+from ..order_sms import SMSManager
+
+DEFAULT_CSV_SIZES = (10000, 100000, 1000000)
+
+# 서명 측정용 설정 (실제 키가 아닌 같은 길이의 값)
+BENCHMARK_CONFIG = {
+    "ACCESS_KEY": "A" * 20,
+    "SECRET_KEY": "S" * 40,
+    "SMS_BASE_URL": "https://sens.apigw.ntruss.com",
+    "SMS_API_URL": "/sms/v2/services/ncp:sms:kr:000000000000:benchmark/messages",
+    "KAKAO_SERVICE_ID": "ncp:kkobizmsg:kr:0000000:benchmark",
+}
+
+
+def make_order_detail(index):
+    """get_order_details 응답 형식의 주문 상세 정보"""
+    return {
+        'productOrder': {
+            'productOrderId': str(2024010100000000 + index),
+            'productName': '틴더 골드 1개월 프로모션 코드',
+            'productOption': '기간: 1개월',
+            'quantity': 1,
+            'totalPaymentAmount': 19900,
+            'productOrderStatus': 'PAYED',
+        },
+        'order': {
+            'orderId': str(2024010110000000 + index),
+            'orderDate': '2024-01-01T10:00:00.000+09:00',
+            'ordererName': '홍길동',
+            'ordererTel': '010-1234-5678',
+        },
+    }
+
+
+def bench(func, number, repeat=5):
+    """함수 1회 실행 시간(us)의 중앙값/최솟값"""
+    samples = [
+        elapsed / number * 1e6
+        for elapsed in timeit.Timer(func).repeat(repeat=repeat, number=number)
+    ]
+    return {
+        'median_us': statistics.median(samples),
+        'min_us': min(samples),
+        'number': number,
+        'repeat': repeat,
+    }
+
+
+def bench_csv(size, work_dir):
+    """size건 CSV 기록, 색인 로드, 주문 ID 조회 측정"""
+    filename = os.path.join(work_dir, f'order_{size}.csv')
+    order_details = [make_order_detail(i) for i in range(size)]
+
+    manager = CSVManager(filename)
+    started = time.perf_counter()
+    written = manager.write_order_to_csv(order_details)
+    write_seconds = time.perf_counter() - started
+
+    # 이미 기록된 주문을 다시 전달했을 때 (중복 확인만 수행)
+    started = time.perf_counter()
+    manager.write_order_to_csv(order_details[:10000])
+    duplicate_seconds = time.perf_counter() - started
+
+    # 재시작 시 색인 파일 로드
+    started = time.perf_counter()
+    manager = CSVManager(filename)
+    index_load_seconds = time.perf_counter() - started
+
+    # 색인 파일 없이 CSV 전체를 읽어 색인 생성
+    started = time.perf_counter()
+    manager.rebuild_index()
+    rebuild_seconds = time.perf_counter() - started
+
+    hit_id = order_details[size // 2]['productOrder']['productOrderId']
+    miss_id = '9999999999999999'
+    del order_details
+
+    return {
+        'rows': written,
+        'write_total_ms': write_seconds * 1000,
+        'write_per_row_us': write_seconds / max(written, 1) * 1e6,
+        'write_duplicates_10k_ms': duplicate_seconds * 1000,
+        'index_load_ms': index_load_seconds * 1000,
+        'rebuild_index_ms': rebuild_seconds * 1000,
+        'file_size_bytes': os.path.getsize(filename),
+        'is_order_id_in_csv_hit': bench(lambda: manager.is_order_id_in_csv(hit_id), number=100000),
+        'is_order_id_in_csv_miss': bench(lambda: manager.is_order_id_in_csv(miss_id), number=100000),
+    }
+
+
+def bench_messages():
+    combined_order = OrderManager.build_combined_order(make_order_detail(0))
+    return {
+        'create_order_message': bench(lambda: OrderMessageTemplate.create_order_message(combined_order), number=20000),
+    }
+
+
+def bench_combined_order(batch_size=300):
+    """process_new_orders의 주문/주문자 정보 결합 (상세 조회 1회 응답 크기 기준)"""
+    order_details = [make_order_detail(i) for i in range(batch_size)]
+    return {
+        'build_combined_order': bench(lambda: OrderManager.build_combined_order(order_details[0]), number=100000),
+        f'build_combined_order_x{batch_size}': bench(
+            lambda: [OrderManager.build_combined_order(order_data) for order_data in order_details], number=200
+        ),
+    }
+
+
+def bench_signatures():
+    # 네이버 커머스 API 시크릿과 같은 비용(2a, 10 rounds)의 salt
+    client_secret = bcrypt.gensalt(rounds=10, prefix=b'2a').decode('utf-8')
+    token_manager = TokenManager('benchmark_client_id', client_secret, http_client=object())
+
+    # 설정 파일 없이 서명 측정만 하도록 __init__ 대신 apply_config로 초기화
+    sms_manager = SMSManager.__new__(SMSManager)
+    sms_manager.apply_config(BENCHMARK_CONFIG)
+    kakao_manager = KakaoTalkManager.__new__(KakaoTalkManager)
+    kakao_manager.apply_config(BENCHMARK_CONFIG)
+
+    timestamp = str(int(time.time() * 1000))
+    return {
+        'get_secret_sign': bench(token_manager.get_secret_sign, number=5, repeat=3),
+        'sms_make_signature': bench(lambda: sms_manager._make_signature(timestamp), number=20000),
+        'kakao_make_signature': bench(lambda: kakao_manager._make_signature(timestamp), number=20000),
+    }
+
+
+def print_result(name, result):
+    if 'median_us' in result:
+        print(f"{name:<36} {result['median_us']:12.2f} us (min {result['min_us']:.2f} us)")
+    else:
+        print(f"{name:<36} {result}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='주문 처리 주요 함수 실행 시간 측정')
+    parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_CSV_SIZES),
+                        help='CSV 측정 행 수 (쉼표로 구분)')
+    parser.add_argument('--skip-csv', action='store_true', help='CSV 측정 생략')
+    parser.add_argument('--output', help='결과를 저장할 JSON 파일')
+    args = parser.parse_args()
+
+    results = {}
+    results.update(bench_messages())
+    results.update(bench_combined_order())
+    results.update(bench_signatures())
+    for name, result in results.items():
+        print_result(name, result)
+
+    if not args.skip_csv:
+        work_dir = tempfile.mkdtemp(prefix='order_benchmark_')
+        try:
+            for size in (int(size) for size in args.sizes.split(',') if size.strip()):
+                csv_result = bench_csv(size, work_dir)
+                results[f'csv_{size}'] = csv_result
+                print(
+                    f"csv_{size:<32} 기록 {csv_result['write_total_ms']:.1f} ms "
+                    f"({csv_result['write_per_row_us']:.2f} us/행), "
+                    f"색인 로드 {csv_result['index_load_ms']:.1f} ms, "
+                    f"조회 {csv_result['is_order_id_in_csv_hit']['median_us']:.3f} us"
+                )
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({
+                'python': sys.version,
+                'platform': platform.platform(),
+                'results': results,
+            }, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
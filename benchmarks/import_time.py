@@ -0,0 +1,78 @@
+# import_time.py
+# 패키지 import 시간 측정 (python -X importtime)
+# 실행: 상위 디렉토리에서 python3 -m order_management.benchmarks.import_time [--repeat N] [--output 파일.json]
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE_NAME = os.path.basename(PACKAGE_DIR)
+PARENT_DIR = os.path.dirname(PACKAGE_DIR)
+
+# 측정할 import 문 (이름, 코드)
+SCENARIOS = [
+    ('package', f"import {PACKAGE_NAME}"),
+    ('load_config', f"from {PACKAGE_NAME} import load_config"),
+    ('notifications_templates', f"from {PACKAGE_NAME}.notifications import OrderMessageTemplate"),
+    ('order_manager', f"from {PACKAGE_NAME} import OrderManager"),
+]
+
+
+def measure(statement):
+    """-X importtime 출력에서 전체 누적 import 시간(us)과 로드된 모듈 수 반환"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=PARENT_DIR,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    total_us = 0
+    module_count = 0
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        total_us += int(self_us)
+        module_count += 1
+    return total_us, module_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='패키지 import 시간 측정')
+    parser.add_argument('--repeat', type=int, default=5, help='시나리오별 반복 횟수')
+    parser.add_argument('--output', help='결과를 저장할 JSON 파일')
+    args = parser.parse_args()
+
+    results = {}
+    for name, statement in SCENARIOS:
+        try:
+            samples = [measure(statement) for _ in range(args.repeat)]
+        except RuntimeError as e:
+            print(f"{name:<26} 실패: {e}")
+            results[name] = {'statement': statement, 'error': str(e)}
+            continue
+
+        times_ms = [total_us / 1000 for total_us, _ in samples]
+        results[name] = {
+            'statement': statement,
+            'median_ms': statistics.median(times_ms),
+            'min_ms': min(times_ms),
+            'modules': samples[0][1],
+        }
+        print(f"{name:<26} {results[name]['median_ms']:8.2f} ms (min {results[name]['min_ms']:.2f} ms, 모듈 {samples[0][1]}개)")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'python': sys.version, 'results': results}, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
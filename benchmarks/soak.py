@@ -0,0 +1,290 @@
+# soak.py
+# 가짜 API 서버를 대상으로 주문 처리 루프를 장시간 실행하며 처리량/알림 지연/메모리 변화 측정
+# 실행: 상위 디렉토리에서 python3 -m order_management.benchmarks.soak --duration 3600 --order-rate 5 --output soak.json
+import argparse
+import json
+import math
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import bcrypt
+
+from .fake_api_server import SLACK_PATH_PREFIX, FakeApiServer, add_arguments, state_from_args
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE_NAME = os.path.basename(PACKAGE_DIR)
+PARENT_DIR = os.path.dirname(PACKAGE_DIR)
+
+
+def percentile(values, ratio):
+    """정렬된 목록의 백분위수 (nearest-rank)"""
+    if not values:
+        return None
+    index = min(len(values) - 1, max(0, math.ceil(ratio * len(values)) - 1))
+    return values[index]
+
+
+def latency_summary(latencies):
+    latencies = sorted(latencies)
+    if not latencies:
+        return {'count': 0}
+    return {
+        'count': len(latencies),
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'max_ms': latencies[-1] * 1000,
+    }
+
+
+def rss_mb(pid=None):
+    """프로세스 상주 메모리(MB), 확인할 수 없으면 None"""
+    try:
+        with open(f"/proc/{pid or 'self'}/status", 'r') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if pid is None:
+        # /proc가 없는 OS에서는 최대 상주 메모리로 대체 (macOS는 byte, Linux는 KB 단위)
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss / (1024 * 1024) if sys.platform == 'darwin' else max_rss / 1024
+    return None
+
+
+def write_config(work_dir, server_url, args):
+    """가짜 서버를 가리키는 설정 파일 작성"""
+    config = {
+        'CLIENT_ID': 'soak_client_id',
+        'CLIENT_SECRET': bcrypt.gensalt(rounds=4, prefix=b'2a').decode('utf-8'),
+        'WEBHOOK_LOG': f'{server_url}{SLACK_PATH_PREFIX}log',
+        'WEBHOOK_ORDER': f'{server_url}{SLACK_PATH_PREFIX}order',
+        'COMMERCE_API_BASE_URL': server_url,
+        'ACCESS_KEY': 'soak_access_key',
+        'SECRET_KEY': 'soak_secret_key',
+        'SMS_BASE_URL': server_url,
+        'SMS_API_URL': '/sms/v2/services/soak/messages',
+        'KAKAO_SERVICE_ID': 'soak',
+        'KAKAO_BASE_URL': server_url,
+        'CURSOR_FILE': os.path.join(work_dir, 'order_cursor.json'),
+        'DEDUP_DB_FILE': os.path.join(work_dir, 'order_dedup.db'),
+        'ORDER_ARCHIVE_FILE': os.path.join(work_dir, 'order_archive.db'),
+        'OUTBOX_FILE': os.path.join(work_dir, 'order_outbox.db'),
+        'TOKEN_CACHE_FILE': os.path.join(work_dir, 'token_cache.dat'),
+        'POLL_INTERVAL_SECONDS': args.poll_interval,
+        'POLL_MIN_INTERVAL_SECONDS': args.poll_interval,
+        'POLL_MAX_INTERVAL_SECONDS': args.poll_interval,
+    }
+    if args.extra_config:
+        with open(args.extra_config, 'r', encoding='utf-8') as f:
+            config.update(json.load(f))
+
+    config_path = os.path.join(work_dir, 'config.json')
+    with open(config_path, 'w', encoding='utf-8') as f:
+        json.dump(config, f, ensure_ascii=False, indent=2)
+    return config_path
+
+
+class InProcessRunner:
+    """현재 프로세스에서 OrderManager 조회 루프 실행 (main.py와 같은 루프)"""
+
+    def __init__(self, config_path):
+        self.config_path = config_path
+        self.pid = None
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.order_manager = None
+
+    def start(self):
+        from ..order_check import OrderManager
+        from ..scheduler import PollScheduler
+        from ..utils import load_config
+
+        config = load_config(self.config_path)
+        self.order_manager = OrderManager(config['CLIENT_ID'], config['CLIENT_SECRET'])
+        scheduler = PollScheduler.from_config(config)
+        scheduler.sleep = self._stop_event.wait
+
+        def run():
+            while not self._stop_event.is_set():
+                scheduler.wait()
+                if self._stop_event.is_set():
+                    break
+                orders_seen = self.order_manager.process_new_orders()
+                scheduler.record_result(orders_seen)
+                scheduler.note_rate_limits(self.order_manager.take_response_headers())
+
+        self._thread = threading.Thread(target=run, name='soak-order-loop', daemon=True)
+        self._thread.start()
+
+    def is_alive(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self.order_manager is not None:
+            self.order_manager.auth.stop_background_refresh()
+            if self.order_manager.outbox_dispatcher is not None:
+                self.order_manager.outbox_dispatcher.stop()
+
+
+class SubprocessRunner:
+    """main.py를 별도 프로세스로 실행 (프로그램 자체의 메모리만 측정)"""
+
+    def __init__(self, config_path, work_dir):
+        self.config_path = config_path
+        self.work_dir = work_dir
+        self.process = None
+
+    @property
+    def pid(self):
+        return self.process.pid if self.process else None
+
+    def start(self):
+        env = dict(os.environ)
+        env['ORDER_MANAGEMENT_CONFIG'] = self.config_path
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [PARENT_DIR, env.get('PYTHONPATH')]))
+        self.process = subprocess.Popen(
+            [sys.executable, '-m', f'{PACKAGE_NAME}.main'],
+            cwd=self.work_dir,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def is_alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def stop(self):
+        if self.is_alive():
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='가짜 API 서버 대상 부하/장시간 테스트')
+    parser.add_argument('--duration', type=float, default=300, help='실행 시간(초)')
+    parser.add_argument('--report-interval', type=float, default=30, help='중간 결과 출력 주기(초)')
+    parser.add_argument('--warmup', type=float, default=30, help='메모리 기준값을 잡기 전 대기 시간(초)')
+    parser.add_argument('--drain', type=float, default=30, help='주문 생성 중단 후 남은 알림을 기다릴 최대 시간(초)')
+    parser.add_argument('--poll-interval', type=float, default=1.0, help='주문 조회 주기(초)')
+    parser.add_argument('--subprocess', action='store_true', help='main.py를 별도 프로세스로 실행')
+    parser.add_argument('--extra-config', help='설정 파일에 덮어쓸 JSON 파일 (예: OUTBOX_ENABLED)')
+    parser.add_argument('--work-dir', help='작업 디렉토리 (기본: 임시 디렉토리, 종료 시 삭제)')
+    parser.add_argument('--output', help='결과를 저장할 JSON 파일')
+    add_arguments(parser)
+    args = parser.parse_args()
+    output = os.path.abspath(args.output) if args.output else None
+
+    original_cwd = os.getcwd()
+    work_dir = os.path.abspath(args.work_dir) if args.work_dir else tempfile.mkdtemp(prefix='order_soak_')
+    os.makedirs(work_dir, exist_ok=True)
+    server = FakeApiServer(state_from_args(args)).start(generate_orders=False)
+    config_path = write_config(work_dir, server.url, args)
+
+    if args.subprocess:
+        runner = SubprocessRunner(config_path, work_dir)
+    else:
+        # 로그/상대 경로 파일이 작업 디렉토리에 생기도록 이동
+        os.environ['ORDER_MANAGEMENT_CONFIG'] = config_path
+        os.chdir(work_dir)
+        runner = InProcessRunner(config_path)
+
+    print(f"가짜 API 서버: {server.url}, 작업 디렉토리: {work_dir}")
+    samples = []
+    baseline_rss = None
+    started = time.monotonic()
+    try:
+        runner.start()
+        server.state.start_generator()
+
+        last_time, last_notified = started, 0
+        while time.monotonic() - started < args.duration and runner.is_alive():
+            time.sleep(min(args.report_interval, max(0.0, args.duration - (time.monotonic() - started))))
+            now = time.monotonic()
+            stats = server.state.stats()
+            window = latency_summary(server.state.take_window_latencies())
+            memory = rss_mb(runner.pid)
+            if baseline_rss is None and now - started >= args.warmup:
+                baseline_rss = memory
+
+            sample = {
+                'elapsed_seconds': round(now - started, 1),
+                'generated': stats['generated'],
+                'notified': stats['notified'],
+                'backlog': stats['generated'] - stats['notified'],
+                'orders_per_second': (stats['notified'] - last_notified) / max(now - last_time, 1e-9),
+                'latency': window,
+                'rss_mb': memory,
+            }
+            samples.append(sample)
+            last_time, last_notified = now, stats['notified']
+            print(
+                f"[{sample['elapsed_seconds']:8.1f}s] 생성 {sample['generated']} / 알림 {sample['notified']} "
+                f"(대기 {sample['backlog']}), {sample['orders_per_second']:.1f}건/초, "
+                f"p95 {window.get('p95_ms', 0):.0f} ms, RSS {memory or 0:.1f} MB"
+            )
+
+        # 주문 생성을 멈추고 남은 알림 대기
+        server.state.stop_generator()
+        drain_started = time.monotonic()
+        while time.monotonic() - drain_started < args.drain and runner.is_alive():
+            stats = server.state.stats()
+            if stats['notified'] >= stats['generated']:
+                break
+            time.sleep(0.5)
+    except KeyboardInterrupt:
+        print("중단됨")
+    finally:
+        final_rss = rss_mb(runner.pid)
+        runner.stop()
+        stats = server.state.stats(include_latencies=True)
+        server.stop()
+
+    elapsed = time.monotonic() - started
+    summary = {
+        'duration_seconds': elapsed,
+        'generated': stats['generated'],
+        'notified': stats['notified'],
+        'missed': stats['generated'] - stats['notified'],
+        'duplicate_notifications': stats['duplicate_notifications'],
+        'orders_per_second': stats['notified'] / max(elapsed, 1e-9),
+        'latency': latency_summary(stats['latencies']),
+        'rss_baseline_mb': baseline_rss,
+        'rss_final_mb': final_rss,
+        'rss_growth_mb': final_rss - baseline_rss if final_rss is not None and baseline_rss is not None else None,
+        'server_responses': stats['responses'],
+    }
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump({
+                'python': sys.version,
+                'platform': platform.platform(),
+                'arguments': vars(args),
+                'summary': summary,
+                'samples': samples,
+            }, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {output}")
+
+    os.chdir(original_cwd)
+    if not args.work_dir:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
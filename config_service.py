@@ -0,0 +1,257 @@
+# config_service.py
+import json
+import os
+import signal
+import threading
+import time
+from .utils import setup_logging
+
+# 필수 설정 키와 타입
+REQUIRED_KEYS = {
+    'CLIENT_ID': str,
+    'CLIENT_SECRET': str,
+    'WEBHOOK_LOG': str,
+    'WEBHOOK_ORDER': str,
+}
+
+# STORES 사용 시 스토어별로 지정하는 인증 정보 키
+STORE_CREDENTIAL_KEYS = ('CLIENT_ID', 'CLIENT_SECRET')
+
+# 선택 설정 키와 타입 (있을 때만 검사)
+OPTIONAL_KEYS = {
+    'ACCESS_KEY': str,
+    'SECRET_KEY': str,
+    'SMS_BASE_URL': str,
+    'SMS_API_URL': str,
+    'KAKAO_SERVICE_ID': str,
+    'KAKAO_BASE_URL': str,
+    'COMMERCE_API_BASE_URL': str,
+    'HTTP_CONNECT_TIMEOUT': (int, float),
+    'HTTP_READ_TIMEOUT': (int, float),
+    'HTTP_POOL_CONNECTIONS': int,
+    'HTTP_POOL_MAXSIZE': int,
+    'CURSOR_OVERLAP_SECONDS': (int, float),
+    'MAX_PAGES_PER_CYCLE': int,
+    'DETAIL_CHUNK_SIZE': int,
+    'DETAIL_MAX_WORKERS': int,
+    'DEDUP_MAX_SIZE': int,
+    'DEDUP_TTL_HOURS': (int, float),
+    'POLL_INTERVAL_SECONDS': (int, float),
+    'POLL_MIN_INTERVAL_SECONDS': (int, float),
+    'POLL_MAX_INTERVAL_SECONDS': (int, float),
+    'OUTBOX_ENABLED': bool,
+    'ORDER_ARCHIVE_ENABLED': bool,
+    'TOKEN_BACKGROUND_REFRESH': bool,
+    'METRICS_PORT': int,
+    'STORES': list,
+    'POLL_MAX_WORKERS': int,
+    'METRICS_HOST': str,
+    'WORKER_PROCESSES': int,
+    'SHARD_LEASE_FILE': str,
+    'SHARD_LEASE_TTL_SECONDS': (int, float),
+    'SHARD_LEASE_RENEW_SECONDS': (int, float),
+    'SHARD_CURSOR_FILE': str,
+    'POLL_CHANGE_TYPES': list,
+    'ORDER_LIFECYCLE_ENABLED': bool,
+    'ORDER_LIFECYCLE_FILE': str,
+    'ORDER_LIFECYCLE_RETENTION_DAYS': (int, float),
+    'RETRY_MAX_ATTEMPTS': int,
+    'RETRY_BASE_DELAY_SECONDS': (int, float),
+    'RETRY_MAX_DELAY_SECONDS': (int, float),
+    'CIRCUIT_FAILURE_THRESHOLD': int,
+    'CIRCUIT_RESET_SECONDS': (int, float),
+    'DETAIL_CACHE_ENABLED': bool,
+    'DETAIL_CACHE_SIZE': int,
+    'DETAIL_CACHE_TTL_SECONDS': (int, float),
+    'DETAIL_CACHE_FILE': str,
+}
+
+
+def validate_config(config):
+    """설정 검증 후 오류 메시지 목록 반환 (문제가 없으면 빈 목록)"""
+    if not isinstance(config, dict):
+        return ["설정 파일의 최상위 값은 객체여야 합니다."]
+
+    errors = []
+    for key, expected_type in REQUIRED_KEYS.items():
+        # 여러 스토어 운영 시에는 인증 정보를 STORES에 스토어별로 지정
+        if key in STORE_CREDENTIAL_KEYS and config.get('STORES'):
+            continue
+        if key not in config:
+            errors.append(f"필수 설정 누락: {key}")
+        elif not isinstance(config[key], expected_type) or not config[key]:
+            errors.append(f"설정 값이 올바르지 않습니다: {key}")
+
+    for key, expected_type in OPTIONAL_KEYS.items():
+        if key not in config:
+            continue
+        value = config[key]
+        # bool은 int의 하위 타입이므로 숫자 설정에 true/false가 들어오지 않도록 별도 확인
+        if isinstance(value, bool) and expected_type is not bool:
+            errors.append(f"설정 타입이 올바르지 않습니다: {key}")
+        elif not isinstance(value, expected_type):
+            errors.append(f"설정 타입이 올바르지 않습니다: {key}")
+
+    if isinstance(config.get('STORES'), list):
+        errors.extend(validate_stores(config['STORES']))
+    return errors
+
+
+def validate_stores(stores):
+    """STORES(스토어별 설정 목록) 검증"""
+    errors = []
+    store_ids = set()
+    for index, store in enumerate(stores):
+        if not isinstance(store, dict):
+            errors.append(f"STORES[{index}]는 객체여야 합니다.")
+            continue
+        for key in ('STORE_ID', 'CLIENT_ID', 'CLIENT_SECRET'):
+            if not isinstance(store.get(key), str) or not store.get(key):
+                errors.append(f"STORES[{index}] 필수 설정 누락: {key}")
+        store_id = store.get('STORE_ID')
+        if store_id in store_ids:
+            errors.append(f"STORES의 STORE_ID가 중복되었습니다: {store_id}")
+        store_ids.add(store_id)
+    return errors
+
+
+class ConfigService:
+    """설정 파일을 한 번만 읽어 캐시하고, 파일이 바뀌면 다시 읽는 설정 서비스
+
+    - get(): 캐시된 설정 반환 (check_interval 초마다 파일 수정 시각을 확인하여 바뀌었으면 다시 로드)
+    - reload(): 즉시 다시 로드
+    - poll(): 조회 루프에서 주기마다 호출 (SIGHUP을 받았으면 reload(), 아니면 get())
+    - subscribe(callback): 설정이 바뀌면 callback(new_config) 호출 (get()/reload()를 호출한 스레드에서 실행)
+    잘못된 설정으로 바뀐 경우에는 기존 설정을 계속 사용합니다.
+    """
+
+    def __init__(self, config_path, check_interval=1.0):
+        self.config_path = config_path
+        self.check_interval = check_interval
+        self.logger = setup_logging()
+        self._lock = threading.RLock()
+        self._config = None
+        self._mtime = None
+        self._checked_at = 0.0
+        self._subscribers = []
+        # 신호 처리 함수에서 잠금을 잡지 않도록 Event 대신 단순 플래그 사용
+        self._reload_requested = False
+
+    def get(self):
+        """설정 반환 (로드할 수 없으면 None)"""
+        now = time.monotonic()
+        if self._config is not None and now - self._checked_at < self.check_interval:
+            return self._config
+
+        with self._lock:
+            self._checked_at = now
+            try:
+                mtime = os.stat(self.config_path).st_mtime_ns
+            except FileNotFoundError:
+                if self._config is None:
+                    self.logger.error(f"설정 파일이 존재하지 않습니다: {self.config_path}")
+                return self._config
+
+            if mtime != self._mtime:
+                self._load(mtime)
+            return self._config
+
+    def reload(self):
+        """설정 파일 즉시 다시 로드, 성공 여부 반환"""
+        with self._lock:
+            try:
+                mtime = os.stat(self.config_path).st_mtime_ns
+            except FileNotFoundError:
+                self.logger.error(f"설정 파일이 존재하지 않습니다: {self.config_path}")
+                return False
+            return self._load(mtime)
+
+    def poll(self):
+        """SIGHUP으로 요청된 재로드 또는 파일 변경 확인 후 설정 반환 (조회 루프에서 호출)"""
+        if self._reload_requested:
+            self._reload_requested = False
+            self.reload()
+        return self.get()
+
+    def _load(self, mtime):
+        self.logger.debug("설정 파일 경로: %s", self.config_path)
+        # 실패하더라도 파일이 다시 바뀔 때까지는 같은 파일을 반복해서 읽지 않음
+        self._mtime = mtime
+        try:
+            with open(self.config_path, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+        except json.JSONDecodeError as e:
+            self.logger.error(f"설정 파일 형식이 잘못되었습니다: {str(e)}")
+            return False
+        except Exception as e:
+            self.logger.error(f"설정 파일 로드 중 오류 발생: {str(e)}")
+            return False
+
+        errors = validate_config(config)
+        if errors:
+            for error in errors:
+                self.logger.error(error)
+            if self._config is not None:
+                self.logger.error("잘못된 설정이므로 기존 설정을 계속 사용합니다.")
+            return False
+
+        previous = self._config
+        self._config = config
+        self.logger.debug("설정 파일 로드 성공")
+
+        if previous is not None and previous != config:
+            self.logger.info("설정 변경 감지, 새 설정 적용")
+            for callback in list(self._subscribers):
+                try:
+                    callback(config)
+                except Exception as e:
+                    self.logger.error(f"설정 변경 적용 중 오류 발생: {str(e)}", exc_info=True)
+        return True
+
+    def subscribe(self, callback):
+        """설정 변경 시 호출할 함수 등록"""
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def _request_reload(self, signum, frame):
+        self._reload_requested = True
+
+    def install_sighup_handler(self):
+        """SIGHUP 수신 시 설정 재로드 요청 (메인 스레드에서 호출, SIGHUP이 없는 OS에서는 무시)
+
+        구독 함수가 토큰 재발급처럼 잠금을 잡고 기다릴 수 있으므로 신호 처리 함수에서는
+        요청만 표시하고, 실제 재로드는 조회 루프가 다음 poll() 호출 때 실행합니다.
+        """
+        if not hasattr(signal, 'SIGHUP'):
+            return False
+        signal.signal(signal.SIGHUP, self._request_reload)
+        self.logger.info("SIGHUP 수신 시 설정을 다시 로드합니다.")
+        return True
+
+
+_services = {}
+_services_lock = threading.Lock()
+
+
+def default_config_path():
+    """기본 설정 파일 경로 (환경 변수 ORDER_MANAGEMENT_CONFIG, 없으면 패키지 상위 디렉토리의 config.json)"""
+    if os.environ.get('ORDER_MANAGEMENT_CONFIG'):
+        return os.environ['ORDER_MANAGEMENT_CONFIG']
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(current_dir, '..', 'config.json')
+
+
+def get_config_service(config_path=None):
+    """설정 파일 경로별 공용 ConfigService 반환"""
+    config_path = os.path.realpath(config_path or default_config_path())
+    with _services_lock:
+        service = _services.get(config_path)
+        if service is None:
+            service = ConfigService(config_path)
+            _services[config_path] = service
+        return service
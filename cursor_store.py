@@ -0,0 +1,120 @@
+# cursor_store.py
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from .utils import setup_logging
+
+# 네이버 커머스 API 기준 시간대
+KST = timezone(timedelta(hours=9))
+
+
+def parse_changed_date(value):
+    """API의 변경 일시 문자열(예: 2024-01-01T12:00:00.000+09:00)을 datetime으로 변환"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f%z")
+
+
+def format_changed_date(dt):
+    """datetime을 API 변경 일시 문자열로 변환"""
+    return dt.isoformat(timespec='milliseconds')
+
+
+class CursorStore:
+    """마지막으로 처리한 변경 일시(high-water mark)를 파일에 저장"""
+
+    def __init__(self, filename='order_cursor.json'):
+        self.filename = filename
+        self.logger = setup_logging()
+        self._lock = threading.Lock()
+        self._cursors = self._load()
+
+    def _load(self):
+        try:
+            with open(self.filename, 'r', encoding='utf-8') as f:
+                cursors = json.load(f)
+                self.logger.info(f"커서 파일 로드 완료: {cursors}")
+                return cursors
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            self.logger.error(f"커서 파일 로드 중 오류 발생 (처음부터 조회): {str(e)}")
+            return {}
+
+    def _save(self):
+        # 임시 파일에 기록 후 교체하여 중간에 종료되어도 파일이 깨지지 않도록 함
+        tmp_filename = f"{self.filename}.tmp"
+        with open(tmp_filename, 'w', encoding='utf-8') as f:
+            json.dump(self._cursors, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_filename, self.filename)
+
+    def get(self, key):
+        """저장된 커서(datetime) 반환, 없으면 None"""
+        with self._lock:
+            return parse_changed_date(self._cursors.get(key))
+
+    def update(self, key, value):
+        """커서 저장 (value: datetime)"""
+        with self._lock:
+            new_value = format_changed_date(value)
+            if self._cursors.get(key) == new_value:
+                return
+            self._cursors[key] = new_value
+            try:
+                self._save()
+                self.logger.debug("커서 갱신: %s=%s", key, new_value)
+            except Exception as e:
+                self.logger.error(f"커서 저장 중 오류 발생: {str(e)}", exc_info=True)
+
+
+class SQLiteCursorStore:
+    """SQLite 기반 커서 저장소 (여러 프로세스가 같은 파일을 함께 사용할 때)
+
+    CursorStore와 같은 get/update 인터페이스이며, 키별로 한 행씩 저장하므로
+    다른 프로세스가 저장한 커서를 덮어쓰지 않습니다.
+    """
+
+    def __init__(self, filename='order_cursor.db'):
+        self.filename = filename
+        self.logger = setup_logging()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(filename, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cursors ("
+            "cursor_key TEXT PRIMARY KEY, "
+            "cursor_value TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key):
+        """저장된 커서(datetime) 반환, 없으면 None"""
+        with self._lock:
+            row = self._conn.execute("SELECT cursor_value FROM cursors WHERE cursor_key = ?", (key,)).fetchone()
+        return parse_changed_date(row[0]) if row else None
+
+    def update(self, key, value):
+        """커서 저장 (value: datetime)"""
+        new_value = format_changed_date(value)
+        try:
+            with self._lock:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT INTO cursors (cursor_key, cursor_value) VALUES (?, ?) "
+                        "ON CONFLICT(cursor_key) DO UPDATE SET cursor_value = excluded.cursor_value",
+                        (key, new_value)
+                    )
+            self.logger.debug("커서 갱신: %s=%s", key, new_value)
+        except Exception as e:
+            self.logger.error(f"커서 저장 중 오류 발생: {str(e)}", exc_info=True)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,207 @@
+# dedup_store.py
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from .utils import setup_logging
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+DEFAULT_MAX_SIZE = 100000
+DEFAULT_HOT_CACHE_SIZE = 10000
+# 정리 작업(만료/초과분 삭제)을 수행하는 추가 건수 간격
+PRUNE_INTERVAL = 1000
+
+
+class MemoryDedupStore:
+    """메모리 기반 알림 완료 목록 (TTL/최대 건수 제한)"""
+
+    def __init__(self, ttl_seconds=DEFAULT_TTL_SECONDS, max_size=DEFAULT_MAX_SIZE):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        with self._lock:
+            added_at = self._items.get(key)
+            if added_at is None:
+                return False
+            if time.time() - added_at > self.ttl_seconds:
+                del self._items[key]
+                return False
+            return True
+
+    def __len__(self):
+        return len(self._items)
+
+    def add(self, key):
+        with self._lock:
+            self._items[key] = time.time()
+            self._items.move_to_end(key)
+            self._prune()
+
+    def discard(self, key):
+        with self._lock:
+            self._items.pop(key, None)
+
+    def _prune(self):
+        # 추가 순서대로 저장되므로 앞쪽부터 만료/초과분 제거
+        expire_before = time.time() - self.ttl_seconds
+        while self._items:
+            key, added_at = next(iter(self._items.items()))
+            if added_at >= expire_before and len(self._items) <= self.max_size:
+                break
+            del self._items[key]
+
+    def close(self):
+        pass
+
+
+class SQLiteDedupStore:
+    """SQLite 기반 알림 완료 목록
+
+    최근 항목은 메모리 캐시에서 바로 확인하고, 캐시에 없는 항목만 DB를 조회합니다.
+    재시작 후에도 유지되며, TTL과 최대 건수를 넘는 항목은 주기적으로 삭제합니다.
+    """
+
+    def __init__(self, filename='order_dedup.db', ttl_seconds=DEFAULT_TTL_SECONDS,
+                 max_size=DEFAULT_MAX_SIZE, hot_cache_size=DEFAULT_HOT_CACHE_SIZE):
+        self.filename = filename
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.hot_cache_size = hot_cache_size
+        self.logger = setup_logging()
+        self._lock = threading.Lock()
+        self._conn = None
+        self._hot_cache = OrderedDict()
+        self._count = 0
+        self._adds_since_prune = 0
+
+    def _connect(self):
+        """최초 사용 시 DB 연결 및 최근 항목을 캐시에 로드"""
+        if self._conn is not None:
+            return self._conn
+
+        # 여러 작업자 프로세스가 같은 DB를 쓰므로 다른 연결이 쓰는 동안은 기다림
+        conn = sqlite3.connect(self.filename, check_same_thread=False, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS notified_orders ("
+            "order_id TEXT PRIMARY KEY, "
+            "added_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_notified_orders_added_at ON notified_orders (added_at)")
+        conn.commit()
+        self._conn = conn
+
+        self._prune()
+        rows = conn.execute(
+            "SELECT order_id, added_at FROM notified_orders ORDER BY added_at DESC LIMIT ?",
+            (self.hot_cache_size,)
+        ).fetchall()
+        for order_id, added_at in reversed(rows):
+            self._hot_cache[order_id] = added_at
+        self._count = conn.execute("SELECT COUNT(*) FROM notified_orders").fetchone()[0]
+        self.logger.info(f"알림 완료 목록 로드 완료 ({self._count}건, 캐시 {len(self._hot_cache)}건)")
+        return conn
+
+    def _cache_put(self, key, added_at):
+        self._hot_cache[key] = added_at
+        self._hot_cache.move_to_end(key)
+        while len(self._hot_cache) > self.hot_cache_size:
+            self._hot_cache.popitem(last=False)
+
+    def __contains__(self, key):
+        with self._lock:
+            conn = self._connect()
+            expire_before = time.time() - self.ttl_seconds
+
+            added_at = self._hot_cache.get(key)
+            if added_at is None:
+                row = conn.execute(
+                    "SELECT added_at FROM notified_orders WHERE order_id = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return False
+                added_at = row[0]
+                self._cache_put(key, added_at)
+
+            return added_at >= expire_before
+
+    def __len__(self):
+        with self._lock:
+            self._connect()
+            return self._count
+
+    def add(self, key):
+        with self._lock:
+            conn = self._connect()
+            added_at = time.time()
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO notified_orders (order_id, added_at) VALUES (?, ?)",
+                (key, added_at)
+            )
+            if cursor.rowcount:
+                self._count += 1
+            else:
+                conn.execute(
+                    "UPDATE notified_orders SET added_at = ? WHERE order_id = ?",
+                    (added_at, key)
+                )
+            conn.commit()
+            self._cache_put(key, added_at)
+
+            self._adds_since_prune += 1
+            if self._adds_since_prune >= PRUNE_INTERVAL:
+                self._prune()
+
+    def discard(self, key):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM notified_orders WHERE order_id = ?", (key,))
+            conn.commit()
+            self._hot_cache.pop(key, None)
+            self._count = conn.execute("SELECT COUNT(*) FROM notified_orders").fetchone()[0]
+
+    def _prune(self):
+        """만료 항목과 최대 건수를 넘는 오래된 항목 삭제"""
+        self._adds_since_prune = 0
+        try:
+            conn = self._conn
+            conn.execute(
+                "DELETE FROM notified_orders WHERE added_at < ?",
+                (time.time() - self.ttl_seconds,)
+            )
+            conn.execute(
+                "DELETE FROM notified_orders WHERE order_id IN ("
+                "SELECT order_id FROM notified_orders ORDER BY added_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_size,)
+            )
+            conn.commit()
+            self._count = conn.execute("SELECT COUNT(*) FROM notified_orders").fetchone()[0]
+        except Exception as e:
+            self.logger.error(f"알림 완료 목록 정리 중 오류 발생: {str(e)}", exc_info=True)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def create_dedup_store(config):
+    """설정에 따라 알림 완료 목록 저장소 생성"""
+    config = config or {}
+    ttl_seconds = float(config.get('DEDUP_TTL_HOURS', DEFAULT_TTL_SECONDS / 3600)) * 3600
+    max_size = int(config.get('DEDUP_MAX_SIZE', DEFAULT_MAX_SIZE))
+
+    if config.get('DEDUP_BACKEND', 'sqlite') == 'memory':
+        return MemoryDedupStore(ttl_seconds=ttl_seconds, max_size=max_size)
+
+    return SQLiteDedupStore(
+        filename=config.get('DEDUP_DB_FILE', 'order_dedup.db'),
+        ttl_seconds=ttl_seconds,
+        max_size=max_size,
+        hot_cache_size=int(config.get('DEDUP_HOT_CACHE_SIZE', DEFAULT_HOT_CACHE_SIZE))
+    )
@@ -0,0 +1,172 @@
+# detail_cache.py
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from .metrics import get_metrics
+from .utils import setup_logging
+
+DEFAULT_MAX_SIZE = 10000
+DEFAULT_TTL_SECONDS = 60 * 60
+
+
+class OrderDetailCache:
+    """주문 상세 정보 캐시 (상품주문번호, 마지막 변경 일시 기준)
+
+    변경 일시가 같으면 상세 정보도 같으므로 다시 조회하지 않고 캐시에서 반환합니다.
+    상품주문마다 가장 최근 변경 일시의 항목만 유지하며, 최대 건수(LRU)와 TTL을 넘는 항목은 삭제합니다.
+    filename을 지정하면 SQLite에도 저장하여 재시작 후 최근 항목을 다시 불러옵니다.
+    """
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, ttl_seconds=DEFAULT_TTL_SECONDS, filename=None):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.filename = filename
+        self.logger = setup_logging()
+        self._lock = threading.Lock()
+        self._items = OrderedDict()  # 상품주문번호 -> (변경 일시, 저장 시각, 상세 정보)
+        self.hits = 0
+        self.misses = 0
+
+        metrics = get_metrics()
+        self._hit_counter = metrics.counter('order_detail_cache_hits_total', '주문 상세 캐시 적중 수')
+        self._miss_counter = metrics.counter('order_detail_cache_misses_total', '주문 상세 캐시 미적중 수')
+        metrics.gauge('order_detail_cache_size', '주문 상세 캐시 항목 수').set_function(lambda: len(self._items))
+
+        self._conn = None
+        if filename:
+            self._load()
+
+    @classmethod
+    def from_config(cls, config):
+        """설정값으로 생성 (DETAIL_CACHE_SIZE, DETAIL_CACHE_TTL_SECONDS, DETAIL_CACHE_FILE)"""
+        config = config or {}
+        return cls(
+            max_size=int(config.get('DETAIL_CACHE_SIZE', DEFAULT_MAX_SIZE)),
+            ttl_seconds=float(config.get('DETAIL_CACHE_TTL_SECONDS', DEFAULT_TTL_SECONDS)),
+            filename=config.get('DETAIL_CACHE_FILE'),
+        )
+
+    def _load(self):
+        """저장된 캐시 중 만료되지 않은 최근 항목 로드"""
+        try:
+            conn = sqlite3.connect(self.filename, check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS order_details ("
+                "product_order_id TEXT PRIMARY KEY, "
+                "last_changed_date TEXT NOT NULL, "
+                "stored_at REAL NOT NULL, "
+                "payload TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_order_details_stored_at ON order_details (stored_at)")
+            with conn:
+                conn.execute("DELETE FROM order_details WHERE stored_at < ?", (time.time() - self.ttl_seconds,))
+            rows = conn.execute(
+                "SELECT product_order_id, last_changed_date, stored_at, payload FROM order_details "
+                "ORDER BY stored_at DESC LIMIT ?",
+                (self.max_size,)
+            ).fetchall()
+            for product_order_id, last_changed_date, stored_at, payload in reversed(rows):
+                self._items[product_order_id] = (last_changed_date, stored_at, json.loads(payload))
+            self._conn = conn
+            self.logger.info(f"주문 상세 캐시 로드 완료: {len(self._items)}건")
+        except Exception as e:
+            self.logger.error(f"주문 상세 캐시 로드 중 오류 발생: {str(e)}", exc_info=True)
+            self._conn = None
+
+    def __len__(self):
+        return len(self._items)
+
+    def get_many(self, keys):
+        """(상품주문번호, 변경 일시) 목록 중 캐시에 있는 상세 정보를 {상품주문번호: 상세 정보}로 반환"""
+        found = {}
+        expire_before = time.time() - self.ttl_seconds
+        with self._lock:
+            for product_order_id, last_changed_date in keys:
+                product_order_id = str(product_order_id)
+                item = self._items.get(product_order_id)
+                if item is None or not last_changed_date or item[0] != last_changed_date:
+                    continue
+                if item[1] < expire_before:
+                    del self._items[product_order_id]
+                    continue
+                self._items.move_to_end(product_order_id)
+                found[product_order_id] = item[2]
+
+            hits = len(found)
+            misses = len(keys) - hits
+            self.hits += hits
+            self.misses += misses
+        if hits:
+            self._hit_counter.inc(hits)
+        if misses:
+            self._miss_counter.inc(misses)
+        return found
+
+    def get(self, product_order_id, last_changed_date):
+        """캐시된 상세 정보, 없거나 변경 일시가 다르면 None"""
+        return self.get_many([(product_order_id, last_changed_date)]).get(str(product_order_id))
+
+    def put_many(self, entries):
+        """(상품주문번호, 변경 일시, 상세 정보) 목록 저장 (변경 일시가 없는 항목은 제외)"""
+        stored_at = time.time()
+        records = [
+            (str(product_order_id), last_changed_date, stored_at, order_data)
+            for product_order_id, last_changed_date, order_data in entries
+            if product_order_id and last_changed_date
+        ]
+        if not records:
+            return
+
+        with self._lock:
+            for product_order_id, last_changed_date, _, order_data in records:
+                self._items[product_order_id] = (last_changed_date, stored_at, order_data)
+                self._items.move_to_end(product_order_id)
+            evicted = []
+            while len(self._items) > self.max_size:
+                evicted.append(self._items.popitem(last=False)[0])
+
+            if self._conn is not None:
+                try:
+                    with self._conn:
+                        self._conn.executemany(
+                            "INSERT INTO order_details (product_order_id, last_changed_date, stored_at, payload) "
+                            "VALUES (?, ?, ?, ?) "
+                            "ON CONFLICT(product_order_id) DO UPDATE SET "
+                            "last_changed_date = excluded.last_changed_date, "
+                            "stored_at = excluded.stored_at, payload = excluded.payload",
+                            [
+                                (product_order_id, last_changed_date, stored_at,
+                                 json.dumps(order_data, ensure_ascii=False))
+                                for product_order_id, last_changed_date, stored_at, order_data in records
+                            ]
+                        )
+                        if evicted:
+                            self._conn.executemany(
+                                "DELETE FROM order_details WHERE product_order_id = ?",
+                                [(product_order_id,) for product_order_id in evicted]
+                            )
+                except Exception as e:
+                    self.logger.error(f"주문 상세 캐시 저장 중 오류 발생: {str(e)}", exc_info=True)
+
+    def put(self, product_order_id, last_changed_date, order_data):
+        self.put_many([(product_order_id, last_changed_date, order_data)])
+
+    def stats(self):
+        """적중/미적중 수와 항목 수"""
+        total = self.hits + self.misses
+        return {
+            'size': len(self._items),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / total if total else 0.0,
+        }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,165 @@
+# http_client.py
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+from .utils import setup_logging
+from .metrics import record_http_request
+from .resilience import IDEMPOTENT_METHODS, ResilienceManager
+
+# 기본 HTTP 설정 (config.json 에서 덮어쓸 수 있음)
+DEFAULT_CONNECT_TIMEOUT = 3.05
+DEFAULT_READ_TIMEOUT = 10
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 20
+
+
+def _is_server_failure(response):
+    """재시도/차단 대상 응답 (서버 오류)"""
+    return response.status_code >= 500
+
+
+def _is_unsent_error(error):
+    """서버에 요청이 전달되지 않은 오류 (연결 시간 초과, 연결 거부, 이름 확인 실패)"""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(error, requests.exceptions.ConnectionError) and error.args:
+        return isinstance(getattr(error.args[0], 'reason', None), NewConnectionError)
+    return False
+
+
+def parse_retry_after(value, now=None):
+    """Retry-After 헤더 값(초 또는 HTTP 날짜)을 대기 시간(초)으로 변환, 해석할 수 없으면 None"""
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if retry_at is None:
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    now = now or datetime.now(timezone.utc)
+    return max(0.0, (retry_at - now).total_seconds())
+
+
+def _retry_after_seconds(response):
+    return parse_retry_after(response.headers.get('Retry-After'))
+
+
+class HttpClient:
+    """keep-alive 커넥션 풀과 타임아웃을 공유하는 HTTP 클라이언트
+
+    엔드포인트별 차단기와 재시도(지수 백오프 + jitter)를 적용합니다 (resilience.py).
+    """
+
+    def __init__(self, connect_timeout=DEFAULT_CONNECT_TIMEOUT, read_timeout=DEFAULT_READ_TIMEOUT,
+                 pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 resilience=None):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.resilience = resilience or ResilienceManager()
+        self.logger = setup_logging()
+
+        # 호스트별 커넥션 풀 (pool_connections 개의 호스트, 호스트당 pool_maxsize 개의 커넥션)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.logger.info(
+            f"HttpClient 초기화 완료 (timeout: {connect_timeout}/{read_timeout}초, "
+            f"pool: {pool_connections}x{pool_maxsize})"
+        )
+
+    @classmethod
+    def from_config(cls, config):
+        """설정값으로 HttpClient 생성"""
+        config = config or {}
+        return cls(
+            connect_timeout=float(config.get("HTTP_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT)),
+            read_timeout=float(config.get("HTTP_READ_TIMEOUT", DEFAULT_READ_TIMEOUT)),
+            pool_connections=int(config.get("HTTP_POOL_CONNECTIONS", DEFAULT_POOL_CONNECTIONS)),
+            pool_maxsize=int(config.get("HTTP_POOL_MAXSIZE", DEFAULT_POOL_MAXSIZE)),
+            resilience=ResilienceManager.from_config(config),
+        )
+
+    @property
+    def timeout(self):
+        return (self.connect_timeout, self.read_timeout)
+
+    def request(self, method, url, endpoint=None, idempotent=None, **kwargs):
+        """HTTP 요청 전송 (타임아웃 미지정 시 기본값 적용)
+
+        endpoint: 지표/차단기에 사용할 API 이름 (없으면 호스트명)
+        idempotent: 다시 보내도 결과가 같은 요청인지 (None이면 메서드로 판단, 예: 조회용 POST는 True)
+        5xx 응답과 네트워크 오류는 재시도하며, 멱등이 아닌 요청은 연결 실패일 때만 재시도합니다.
+        차단 중인 엔드포인트는 요청을 보내지 않고 CircuitOpenError를 발생시킵니다.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        endpoint = endpoint or urlsplit(url).hostname
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        return self.resilience.call(
+            endpoint,
+            lambda: self._send(method, url, endpoint, **kwargs),
+            idempotent=idempotent,
+            is_failure=_is_server_failure,
+            is_safe_error=_is_unsent_error,
+            retry_after_of=_retry_after_seconds,
+        )
+
+    def _send(self, method, url, endpoint, **kwargs):
+        started = time.perf_counter()
+        status = "error"
+        try:
+            response = self.session.request(method, url, **kwargs)
+            status = str(response.status_code)
+            return response
+        finally:
+            record_http_request(endpoint, method, status, time.perf_counter() - started)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        """커넥션 풀 정리"""
+        self.session.close()
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_http_client(config=None):
+    """프로세스 공용 HttpClient 반환 (최초 호출 시 생성)"""
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                if config is None:
+                    from .utils import load_config
+                    config = load_config()
+                _default_client = HttpClient.from_config(config)
+    return _default_client
+
+
+def set_http_client(client):
+    """프로세스 공용 HttpClient 교체 (테스트/부하 테스트용)"""
+    global _default_client
+    with _default_client_lock:
+        _default_client = client
@@ -0,0 +1,124 @@
+# kakao_templates.py
+import json
+from string import Formatter
+from .utils import setup_logging
+
+# 기본 알림톡 템플릿 (KAKAO_TEMPLATES_FILE 이 없을 때 사용)
+DEFAULT_TEMPLATES = [
+    {
+        "templateCode": "TindercodeReviewNoEmoji",
+        "content": (
+            "안녕하세요, {고객명}님!\n\n"
+            "네이버에서 유일하게 틴더 공식 발급 한국 코드를 유통하는 저희 미니멀 스튜디오를 믿고 구매해주셔서 감사합니다.\n\n"
+            "▶ 프로모션 코드\n{쿠폰코드}\n\n"
+            "▶ 사용 방법:\n"
+            "1. www.tinder.com에 로그인합니다.\n"
+            "(*전화번호 및 이메일 로그인)\n"
+            "2. www.tinder.com/vip/codehere 페이지에서 코드를 등록합니다.\n"
+            "(프로모션코드 등록으로 가셔도 됩니다)\n\n"
+            "코드 등록 시 오류가 발생하면, 스크린샷과 함께 문의해주시면 확인 즉시 해결해드리겠습니다.\n\n"
+            "구매해주셔서 감사합니다!다음에 또 필요하면 연락주세요, 부쩍 추워진 요즘 건강유의하시고 좋은하루보내세요!\n\n"
+            "실례가안된다면, 번거로우실수도 있지만 리뷰 부탁드리겠습니다.\n"
+            "저희 스마트스토어에 큰 힘이됩니다!\n\n"
+            "감사합니다."
+        ),
+        "buttons": [
+            {
+                "type": "WL",
+                "name": "틴더 바로가기",
+                "linkMobile": "https://tinder.com/",
+                "linkPc": "https://tinder.com/"
+            },
+            {
+                "type": "WL",
+                "name": "미니멀 스튜디오 바로가기",
+                "linkMobile": "https://m.smartstore.naver.com/minimalstudio",
+                "linkPc": "https://smartstore.naver.com/minimalstudio"
+            }
+        ]
+    }
+]
+
+
+class KakaoTemplate:
+    """알림톡 템플릿 (등록 시 치환 변수를 미리 분석해두고 발송 시에는 이어 붙이기만 함)"""
+
+    def __init__(self, template_code, content, buttons=None):
+        if not template_code:
+            raise ValueError("templateCode는 필수입니다.")
+        if not content:
+            raise ValueError(f"템플릿 내용이 비어 있습니다: {template_code}")
+
+        self.template_code = template_code
+        self.buttons = list(buttons or [])
+        self._segments = []
+        for literal, field_name, format_spec, conversion in Formatter().parse(content):
+            if field_name is not None and (not field_name.isidentifier() or format_spec or conversion):
+                raise ValueError(f"지원하지 않는 치환 변수입니다: {{{field_name}}} ({template_code})")
+            self._segments.append((literal, field_name))
+        self.fields = frozenset(field for _, field in self._segments if field)
+
+        for button in self.buttons:
+            if not button.get('type') or not button.get('name'):
+                raise ValueError(f"버튼에 type/name이 없습니다: {template_code}")
+
+    def render(self, template_args):
+        """치환 변수를 채운 메시지 내용 반환"""
+        missing = self.fields.difference(template_args)
+        if missing:
+            raise ValueError(f"템플릿 변수 누락 ({self.template_code}): {', '.join(sorted(missing))}")
+
+        parts = []
+        for literal, field_name in self._segments:
+            parts.append(literal)
+            if field_name:
+                parts.append(str(template_args[field_name]))
+        return ''.join(parts)
+
+
+class KakaoTemplateRegistry:
+    """templateCode별 알림톡 템플릿 저장소 (시작 시 한 번 로드/검증)"""
+
+    def __init__(self, templates=None):
+        self.logger = setup_logging()
+        self._templates = {}
+        for template in templates or []:
+            self.register(template)
+
+    @classmethod
+    def from_config(cls, config):
+        """설정의 KAKAO_TEMPLATES_FILE(JSON 목록)을 로드, 없으면 기본 템플릿 사용"""
+        filename = (config or {}).get('KAKAO_TEMPLATES_FILE')
+        if not filename:
+            return cls(DEFAULT_TEMPLATES)
+
+        with open(filename, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def register(self, template):
+        """템플릿 등록 (dict 또는 KakaoTemplate)"""
+        if isinstance(template, dict):
+            template = KakaoTemplate(template.get('templateCode'), template.get('content'), template.get('buttons'))
+        self._templates[template.template_code] = template
+        self.logger.debug("알림톡 템플릿 등록: %s", template.template_code)
+        return template
+
+    def get(self, template_code):
+        template = self._templates.get(template_code)
+        if template is None:
+            raise KeyError(f"등록되지 않은 알림톡 템플릿입니다: {template_code}")
+        return template
+
+    def __contains__(self, template_code):
+        return template_code in self._templates
+
+    def render_message(self, template_code, to_number, template_args):
+        """알림톡 messages 항목 생성"""
+        template = self.get(template_code)
+        message = {
+            "to": to_number,
+            "content": template.render(template_args)
+        }
+        if template.buttons:
+            message["buttons"] = template.buttons
+        return message
@@ -1,24 +1,39 @@
-import os
-import json
-import time
-from datetime import datetime
 from order_management import OrderManager
 from order_management.notifications import SystemMessageTemplate
 from order_management.utils import load_config, setup_logging
+from order_management.config_service import default_config_path, get_config_service
+from order_management.http_client import get_http_client
+from order_management.metrics import start_metrics_server
+from order_management.scheduler import PollScheduler
+from order_management.multi_store import MultiStoreManager
 
 def main():
-    logger = setup_logging()
+    # 로그 출력은 별도 스레드에서 처리하여 주문 조회 루프가 디스크 I/O를 기다리지 않도록 함
+    logger = setup_logging(use_queue=True)
     logger.info("프로그램 시작")
     
+    order_manager = None
     try:
         # 설정 로드
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        config_path = os.path.join(current_dir, '..', 'config.json')
+        config_path = default_config_path()
         
         config = load_config(config_path)
         if not config:
             logger.error(f"설정 파일을 찾을 수 없습니다: {config_path}")
             return
+        
+        # SIGHUP 수신 시 설정 다시 로드 (kill -HUP <pid>, 재로드는 조회 루프에서 실행)
+        config_service = get_config_service(config_path)
+        config_service.install_sighup_handler()
+        
+        # 지표 수집 엔드포인트 (METRICS_PORT 설정 시 http://127.0.0.1:<port>/metrics)
+        if config.get('METRICS_PORT'):
+            start_metrics_server(config['METRICS_PORT'], config.get('METRICS_HOST', '127.0.0.1'))
+
+        # STORES가 있으면 여러 스토어를 한 프로세스에서 조회
+        if config.get('STORES'):
+            run_multi_store(config, logger)
+            return
 
         # OrderManager 초기화 (30분 주기로 토큰 갱신)
         order_manager = OrderManager(
@@ -32,19 +47,43 @@ def main():
         order_manager.slack_manager.send_order_notification(startup_message)
         logger.info("시작 알림 전송 완료")
 
-        # 주문 모니터링 루프
+        # 주문 모니터링 루프 (주문 유입량에 따라 조회 주기 조정)
+        scheduler = PollScheduler.from_config(config)
         while True:
+            scheduler.wait()
+            
+            # 설정 파일 변경/SIGHUP 재로드 요청 확인 (신호 처리 함수가 아닌 조회 루프에서 적용)
+            config_service.poll()
+            
             try:
-                order_manager.process_new_orders()
+                orders_seen = order_manager.process_new_orders()
+                scheduler.record_result(orders_seen)
+                scheduler.note_rate_limits(order_manager.take_response_headers())
             except Exception as e:
                 logger.error(f"주문 처리 중 오류 발생: {str(e)}", exc_info=True)
 
-            time.sleep(10)
-
     except KeyboardInterrupt:
         logger.info("프로그램 종료")
     except Exception as e:
         logger.error(f"예상치 못한 오류 발생: {str(e)}", exc_info=True)
+    finally:
+        if order_manager is not None:
+            order_manager.close()
+        get_http_client().close()
+
+def run_multi_store(config, logger):
+    """STORES 목록의 스토어를 공용 스케줄러/커넥션 풀/알림 작업자로 조회"""
+    multi_store_manager = MultiStoreManager(config, token_refresh_minutes=30)
+    
+    # 시작 알림 전송
+    startup_message = SystemMessageTemplate.create_startup_message()
+    multi_store_manager.slack_manager.send_order_notification(startup_message)
+    logger.info("시작 알림 전송 완료")
+    
+    try:
+        multi_store_manager.run_forever()
+    finally:
+        multi_store_manager.stop()
 
 if __name__ == "__main__":
     main()
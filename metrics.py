@@ -0,0 +1,268 @@
+# metrics.py
+import bisect
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from .utils import get_dropped_log_count, setup_logging
+
+# 지연 시간 히스토그램 기본 구간 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _escape_label_value(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(label_key):
+    if not label_key:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape_label_value(value)}"' for name, value in label_key) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """누적 카운터 (라벨별)"""
+
+    type_name = 'counter'
+
+    def __init__(self, name, documentation=''):
+        self.name = name
+        self.documentation = documentation
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(_label_key(labels), 0)
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, key, value) for key, value in self._values.items()]
+
+
+class Gauge:
+    """현재 값 게이지 (직접 설정하거나 조회 시 함수를 호출하여 계산)"""
+
+    type_name = 'gauge'
+
+    def __init__(self, name, documentation=''):
+        self.name = name
+        self.documentation = documentation
+        self._lock = threading.Lock()
+        self._values = {}
+        self._functions = {}
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+    def set_function(self, func, **labels):
+        """조회 시점에 func()의 반환값을 사용"""
+        with self._lock:
+            self._functions[_label_key(labels)] = func
+
+    def value(self, **labels):
+        key = _label_key(labels)
+        func = self._functions.get(key)
+        if func is not None:
+            return func()
+        return self._values.get(key, 0)
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+            functions = dict(self._functions)
+
+        for key, func in functions.items():
+            try:
+                value = func()
+            except Exception:
+                continue
+            if value is not None:
+                values[key] = value
+        return [(self.name, key, value) for key, value in values.items()]
+
+
+class Histogram:
+    """지연 시간 히스토그램 (라벨별 구간 누적 개수, 합계, 개수)"""
+
+    type_name = 'histogram'
+
+    def __init__(self, name, documentation='', buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def observe(self, value, **labels):
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """with 블록 실행 시간 기록"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels):
+        entry = self._values.get(_label_key(labels))
+        return entry[2] if entry else 0
+
+    def samples(self):
+        with self._lock:
+            values = {key: (list(entry[0]), entry[1], entry[2]) for key, entry in self._values.items()}
+
+        samples = []
+        for key, (bucket_counts, total, count) in values.items():
+            cumulative = 0
+            for upper, bucket_count in zip(self.buckets + (float('inf'),), bucket_counts):
+                cumulative += bucket_count
+                samples.append((f'{self.name}_bucket', key + (('le', _format_value(upper)),), cumulative))
+            samples.append((f'{self.name}_sum', key, total))
+            samples.append((f'{self.name}_count', key, count))
+        return samples
+
+
+class MetricsRegistry:
+    """지표 저장소 (같은 이름으로 다시 요청하면 기존 지표 반환)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def _get_or_create(self, metric_class, name, documentation, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_class(name, documentation, **kwargs)
+            elif not isinstance(metric, metric_class):
+                raise ValueError(f"다른 종류로 등록된 지표입니다: {name}")
+            return metric
+
+    def counter(self, name, documentation=''):
+        return self._get_or_create(Counter, name, documentation)
+
+    def gauge(self, name, documentation=''):
+        return self._get_or_create(Gauge, name, documentation)
+
+    def histogram(self, name, documentation='', buckets=DEFAULT_BUCKETS):
+        return self._get_or_create(Histogram, name, documentation, buckets=buckets)
+
+    def render(self):
+        """Prometheus 텍스트 형식으로 출력"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        lines = []
+        for metric in metrics:
+            if metric.documentation:
+                lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.type_name}')
+            for name, label_key, value in metric.samples():
+                lines.append(f'{name}{_format_labels(label_key)} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+_registry = MetricsRegistry()
+_registry.gauge('log_records_dropped', '로그 큐가 가득 차서 버린 로그 수 (INFO 이하)').set_function(get_dropped_log_count)
+
+
+def get_metrics():
+    """프로세스 공용 지표 저장소 반환"""
+    return _registry
+
+
+@contextmanager
+def track_stage(stage):
+    """처리 단계 실행 시간/횟수 기록 (예외 발생 시 오류 횟수도 기록)"""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        _registry.counter('order_stage_errors_total', '처리 단계별 예외 발생 횟수').inc(stage=stage)
+        raise
+    finally:
+        _registry.histogram('order_stage_duration_seconds', '처리 단계별 실행 시간(초)').observe(
+            time.perf_counter() - started, stage=stage
+        )
+
+
+def timed_stage(stage):
+    """track_stage를 적용하는 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with track_stage(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_http_request(endpoint, method, status, duration):
+    """외부 API 호출 결과 기록 (status: 응답 코드 또는 'error')"""
+    _registry.histogram('http_client_request_duration_seconds', '외부 API 호출 시간(초)').observe(
+        duration, endpoint=endpoint, method=method
+    )
+    _registry.counter('http_client_requests_total', '외부 API 호출 횟수').inc(
+        endpoint=endpoint, method=method, status=status
+    )
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    registry = _registry
+
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+
+        body = self.registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # 수집 요청은 로그에 남기지 않음
+        pass
+
+
+def start_metrics_server(port, host='127.0.0.1', registry=None):
+    """/metrics 엔드포인트를 제공하는 HTTP 서버를 백그라운드 스레드에서 시작"""
+    logger = setup_logging()
+    handler = type('MetricsRequestHandler', (_MetricsRequestHandler,), {'registry': registry or _registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True)
+    thread.start()
+    logger.info(f"지표 수집 엔드포인트 시작: http://{host}:{server.server_address[1]}/metrics")
+    return server
@@ -0,0 +1,245 @@
+# multi_store.py
+import heapq
+import itertools
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .utils import load_config, setup_logging
+from .config_service import get_config_service
+from .http_client import get_http_client
+from .dedup_store import create_dedup_store
+from .cursor_store import CursorStore
+from .order_archive import OrderArchive
+from .order_lifecycle import OrderLifecycle
+from .detail_cache import OrderDetailCache
+from .outbox import STATUS_DEAD, Outbox, OutboxDispatcher
+from .notifications import SlackManager
+from .order_check import OrderManager
+from .scheduler import PollScheduler
+
+
+class SharedStoreResources:
+    """여러 스토어가 함께 쓰는 자원
+
+    HTTP 커넥션 풀, 상세 조회 작업자, 알림 완료 목록, 커서 파일, 주문 보관소, 주문 상태 기록,
+    상세 정보 캐시, 알림 대기열을 스토어마다 만들지 않고 하나씩만 사용합니다.
+    """
+
+    def __init__(self, config, http_client=None, cursor_store=None):
+        self.http_client = http_client or get_http_client(config)
+        self.dedup_store = create_dedup_store(config)
+        self.cursor_store = cursor_store or CursorStore(config.get('CURSOR_FILE', 'order_cursor.json'))
+        self.detail_executor = ThreadPoolExecutor(
+            max_workers=int(config.get('DETAIL_MAX_WORKERS', 4)),
+            thread_name_prefix='order-detail'
+        )
+
+        self.order_archive = None
+        if config.get('ORDER_ARCHIVE_ENABLED', True):
+            self.order_archive = OrderArchive(config.get('ORDER_ARCHIVE_FILE', 'order_archive.db'))
+
+        self.order_lifecycle = None
+        if config.get('ORDER_LIFECYCLE_ENABLED', True):
+            self.order_lifecycle = OrderLifecycle.from_config(config)
+
+        self.detail_cache = None
+        if config.get('DETAIL_CACHE_ENABLED', True):
+            self.detail_cache = OrderDetailCache.from_config(config)
+
+        self.outbox = None
+        self.outbox_dispatcher = None
+        if config.get('OUTBOX_ENABLED', False):
+            self.outbox = Outbox(config.get('OUTBOX_FILE', 'order_outbox.db'))
+            self.outbox_dispatcher = OutboxDispatcher(
+                self.outbox,
+                max_attempts=int(config.get('OUTBOX_MAX_ATTEMPTS', 20))
+            )
+
+
+class MultiStoreManager:
+    """여러 판매자 계정(스토어)을 한 프로세스에서 조회
+
+    config.json의 STORES 목록(STORE_ID, CLIENT_ID, CLIENT_SECRET, 그 밖에 스토어별로 덮어쓸 설정)으로
+    스토어별 OrderManager(토큰, 커서)를 만들고, 조회는 하나의 스케줄러가 POLL_MAX_WORKERS 개의
+    작업자에 나누어 실행합니다. 토큰 갱신도 하나의 스레드가 모든 스토어를 담당합니다.
+    ownership(owns(store_id), start(), stop())을 전달하면 소유한 스토어만 조회합니다 (supervisor.py 작업자).
+    """
+
+    def __init__(self, config=None, token_refresh_minutes=30, http_client=None, ownership=None, shared=None):
+        self.logger = setup_logging()
+        config = config or load_config()
+        if not config or not config.get('STORES'):
+            raise ValueError("설정에 STORES 목록이 없습니다.")
+
+        self.shared = shared or SharedStoreResources(config, http_client)
+        self.ownership = ownership
+        self.slack_manager = SlackManager(
+            config['WEBHOOK_LOG'],
+            config['WEBHOOK_ORDER'],
+            http_client=self.shared.http_client
+        )
+        self.poll_workers = int(config.get('POLL_MAX_WORKERS', 4))
+        self.token_retry_seconds = 30
+
+        self.managers = {}
+        self.schedulers = {}
+        for store_config in config['STORES']:
+            store_id = store_config['STORE_ID']
+            self.managers[store_id] = OrderManager(
+                client_id=store_config['CLIENT_ID'],
+                client_secret=store_config['CLIENT_SECRET'],
+                token_refresh_minutes=token_refresh_minutes,
+                http_client=self.shared.http_client,
+                store_id=store_id,
+                store_config=store_config,
+                shared=self.shared
+            )
+            self.schedulers[store_id] = PollScheduler.from_config({**config, **store_config})
+            if ownership is not None:
+                self.managers[store_id].poll_guard = lambda store_id=store_id: ownership.owns(store_id)
+
+        if self.shared.outbox_dispatcher is not None:
+            self._register_outbox_handlers(config)
+
+        self._stop_event = threading.Event()
+        self._completed = queue.Queue()
+        self._token_thread = None
+        self.logger.info(f"여러 스토어 조회 준비 완료: {', '.join(self.managers)} (조회 작업자 {self.poll_workers}개)")
+
+    def _register_outbox_handlers(self, config):
+        dispatcher = self.shared.outbox_dispatcher
+        # Slack 전송 제한(Retry-After)은 스토어별 Webhook마다 다르므로 deliver_order_notifications에서 확인
+        dispatcher.register_handler(
+            'slack_order',
+            self.deliver_order_notifications,
+            batch_size=int(config.get('OUTBOX_BATCH_SIZE', 100))
+        )
+
+    def deliver_order_notifications(self, combined_orders):
+        """공용 대기열의 주문 알림을 스토어별 Webhook으로 전송, 주문별 결과 목록 반환
+
+        Slack 전송 제한 중인 스토어의 알림만 실패로 두어 나중에 다시 보내고,
+        설정에 없는 스토어의 알림은 재시도하지 않도록 STATUS_DEAD를 반환합니다.
+        """
+        by_store = {}
+        for index, order in enumerate(combined_orders):
+            by_store.setdefault(order.get('storeId'), []).append(index)
+
+        results = [False] * len(combined_orders)
+        for store_id, indexes in by_store.items():
+            manager = self.managers.get(store_id)
+            if manager is None:
+                self.logger.error(f"설정에 없는 스토어의 주문 알림은 전송하지 않습니다: {store_id} ({len(indexes)}건)")
+                for index in indexes:
+                    results[index] = STATUS_DEAD
+                continue
+            retry_after = manager.slack_manager.get_retry_after(manager.slack_manager.order_webhook_url)
+            if retry_after > 0:
+                self.logger.info(f"Slack 전송 제한 중 ({store_id}), 주문 알림 {len(indexes)}건은 나중에 다시 전송")
+                continue
+            store_results = manager.deliver_order_notifications([combined_orders[index] for index in indexes])
+            for index, success in zip(indexes, store_results):
+                results[index] = success
+        return results
+
+    def owns(self, store_id):
+        return self.ownership is None or self.ownership.owns(store_id)
+
+    def start(self):
+        """토큰 갱신 스레드와 알림 전송 작업자 시작"""
+        self._stop_event.clear()
+        if self.ownership is not None:
+            self.ownership.start()
+        self._token_thread = threading.Thread(target=self._token_refresh_loop, name='token-refresher', daemon=True)
+        self._token_thread.start()
+        if self.shared.outbox_dispatcher is not None:
+            self.shared.outbox_dispatcher.start()
+
+    def stop(self):
+        """조회/토큰 갱신/알림 전송 종료 후 스토어별 OrderManager 정리"""
+        self._stop_event.set()
+        self._completed.put(None)
+        if self._token_thread is not None:
+            self._token_thread.join(5)
+            self._token_thread = None
+        if self.shared.outbox_dispatcher is not None:
+            self.shared.outbox_dispatcher.stop()
+        if self.ownership is not None:
+            self.ownership.stop()
+        for manager in self.managers.values():
+            manager.close()
+
+    def _token_refresh_loop(self):
+        """모든 스토어의 토큰을 갱신 시각 순서대로 갱신"""
+        retry_at = {}
+        while not self._stop_event.is_set():
+            now = time.monotonic()
+            wait_seconds = None
+            for store_id, manager in self.managers.items():
+                if not self.owns(store_id):
+                    continue
+                due_in = max(manager.auth.seconds_until_refresh(), retry_at.get(store_id, 0) - now)
+                if due_in <= 0:
+                    if manager.auth.refresh_token():
+                        retry_at.pop(store_id, None)
+                        due_in = manager.auth.seconds_until_refresh()
+                    else:
+                        self.logger.warning(f"토큰 갱신 실패 ({store_id}), {self.token_retry_seconds}초 후 재시도")
+                        retry_at[store_id] = time.monotonic() + self.token_retry_seconds
+                        due_in = self.token_retry_seconds
+                wait_seconds = due_in if wait_seconds is None else min(wait_seconds, due_in)
+
+            # 소유한 스토어가 바뀔 수 있으므로 최대 60초마다 다시 확인
+            self._stop_event.wait(min(60.0, max(1.0, wait_seconds or 60.0)))
+
+    def _poll_store(self, store_id):
+        manager = self.managers[store_id]
+        orders_seen = 0
+        if not self.owns(store_id):
+            # 다른 작업자가 담당하는 스토어는 조회하지 않음 (조회 주기는 유지)
+            self._completed.put((store_id, None))
+            return
+        try:
+            orders_seen = manager.process_new_orders()
+        except Exception as e:
+            self.logger.error(f"주문 처리 중 오류 발생 ({store_id}): {str(e)}", exc_info=True)
+        finally:
+            self._completed.put((store_id, orders_seen))
+
+    def run_forever(self):
+        """스토어별 조회 주기에 맞춰 작업자에 조회를 나누어 실행 (stop() 호출 시 종료)
+
+        한 스토어는 동시에 두 번 조회하지 않으며, 조회가 끝난 뒤 그 스토어의 스케줄러가
+        정한 시각에 다시 조회합니다.
+        """
+        self.start()
+        sequence = itertools.count()
+        due = [(time.monotonic() + scheduler.next_delay(), next(sequence), store_id)
+               for store_id, scheduler in self.schedulers.items()]
+        heapq.heapify(due)
+
+        config_service = get_config_service()
+        with ThreadPoolExecutor(max_workers=self.poll_workers, thread_name_prefix='store-poll') as executor:
+            while not self._stop_event.is_set():
+                # 설정 파일 변경/SIGHUP 재로드 요청 확인 (바뀌었으면 스토어별 설정 적용)
+                config_service.poll()
+                now = time.monotonic()
+                while due and due[0][0] <= now:
+                    _, _, store_id = heapq.heappop(due)
+                    executor.submit(self._poll_store, store_id)
+
+                timeout = max(0.0, due[0][0] - now) if due else None
+                try:
+                    completed = self._completed.get(timeout=timeout)
+                except queue.Empty:
+                    continue
+                if completed is None:
+                    break
+
+                store_id, orders_seen = completed
+                scheduler = self.schedulers[store_id]
+                if orders_seen is not None:
+                    scheduler.record_result(orders_seen)
+                    scheduler.note_rate_limits(self.managers[store_id].take_response_headers())
+                heapq.heappush(due, (time.monotonic() + scheduler.next_delay(), next(sequence), store_id))
@@ -1,4 +1,22 @@
-from .slack_manager import SlackManager
-from .message_templates import OrderMessageTemplate, SystemMessageTemplate
+# 하위 모듈은 실제로 사용할 때 로드합니다 (PEP 562).
+import importlib
 
-__all__ = ['SlackManager', 'OrderMessageTemplate', 'SystemMessageTemplate'] 
\ No newline at end of file
+_LAZY_ATTRIBUTES = {
+    'SlackManager': '.slack_manager',
+    'OrderMessageTemplate': '.message_templates',
+    'SystemMessageTemplate': '.message_templates',
+    'OrderNotificationCoalescer': '.notification_coalescer',
+}
+
+__all__ = ['SlackManager', 'OrderMessageTemplate', 'SystemMessageTemplate', 'OrderNotificationCoalescer']
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
@@ -35,6 +35,60 @@ class OrderMessageTemplate:
                 "text": "🚨 주문 알림 생성 중 오류가 발생했습니다."
             }
 
+    @staticmethod
+    def create_order_digest_message(orders, part=None, total_parts=None):
+        """여러 주문을 묶은 요약 알림 메시지 생성 (Block Kit)"""
+        try:
+            title = f"🛒 신규 주문 {len(orders)}건"
+            if total_parts and total_parts > 1:
+                title += f" ({part}/{total_parts})"
+            
+            blocks = [
+                {
+                    "type": "header",
+                    "text": {
+                        "type": "plain_text",
+                        "text": title,
+                        "emoji": True
+                    }
+                }
+            ]
+            
+            for order in orders:
+                orderer = order.get('orderer', {})
+                blocks.append({
+                    "type": "section",
+                    "text": {
+                        "type": "mrkdwn",
+                        "text": (
+                            f"*{order.get('productName', 'N/A')}*\n"
+                            f"옵션: {order.get('productOption', 'N/A')}\n"
+                            f"주문자: {orderer.get('name', 'N/A')} ({orderer.get('tel', 'N/A')})"
+                        )
+                    }
+                })
+            
+            blocks.append({
+                "type": "context",
+                "elements": [
+                    {
+                        "type": "mrkdwn",
+                        "text": f"알림 시각: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+                    }
+                ]
+            })
+            
+            return {
+                "text": title,
+                "blocks": blocks
+            }
+            
+        except Exception as e:
+            logging.error(f"주문 요약 메시지 생성 중 오류: {str(e)}")
+            return {
+                "text": "🚨 주문 알림 생성 중 오류가 발생했습니다."
+            }
+
 class SystemMessageTemplate:
     @staticmethod
     def create_startup_message():
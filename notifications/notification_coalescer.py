@@ -0,0 +1,150 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from .message_templates import OrderMessageTemplate
+from ..utils import setup_logging
+
+# Slack 메시지당 최대 블록 수(50)에서 헤더/푸터를 제외한 주문 수
+MAX_DIGEST_SIZE = 48
+
+
+class OrderNotificationCoalescer:
+    """주문 알림 묶음 전송기
+
+    window_seconds 동안 들어온 주문이 digest_threshold 건을 넘으면 주문을 digest_size 건씩
+    묶은 요약 메시지로 전송하고, 그렇지 않으면 주문별로 전송합니다.
+    Slack이 429(Retry-After)를 응답하면 남은 주문을 보관했다가 전송 가능 시각 이후에 다시 보냅니다.
+    """
+
+    def __init__(self, slack_manager, digest_threshold=5, window_seconds=60, digest_size=20, max_parallel_sends=4):
+        self.slack_manager = slack_manager
+        self.digest_threshold = digest_threshold
+        self.window_seconds = window_seconds
+        self.digest_size = max(1, min(digest_size, MAX_DIGEST_SIZE))
+        self.max_parallel_sends = max(1, max_parallel_sends)
+        self.logger = setup_logging()
+        self._arrivals = deque()
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, slack_manager, config):
+        """설정값으로 생성"""
+        config = config or {}
+        return cls(
+            slack_manager,
+            digest_threshold=int(config.get('SLACK_DIGEST_THRESHOLD', 5)),
+            window_seconds=float(config.get('SLACK_DIGEST_WINDOW_SECONDS', 60)),
+            digest_size=int(config.get('SLACK_DIGEST_SIZE', 20)),
+            max_parallel_sends=int(config.get('SLACK_MAX_PARALLEL_SENDS', 4)),
+        )
+
+    @property
+    def pending_count(self):
+        return len(self._pending)
+
+    def _record_arrivals(self, count):
+        """최근 window_seconds 동안 들어온 주문 수 반환"""
+        now = time.monotonic()
+        self._arrivals.extend([now] * count)
+        while self._arrivals and now - self._arrivals[0] > self.window_seconds:
+            self._arrivals.popleft()
+        return len(self._arrivals)
+
+    def _build_batches(self, orders, use_digest):
+        """(메시지, 주문 목록) 묶음 생성"""
+        if not use_digest:
+            return [
+                (OrderMessageTemplate.create_order_message(order), [order])
+                for order in orders
+            ]
+
+        chunks = [orders[i:i + self.digest_size] for i in range(0, len(orders), self.digest_size)]
+        return [
+            (OrderMessageTemplate.create_order_digest_message(chunk, part, len(chunks)), chunk)
+            for part, chunk in enumerate(chunks, start=1)
+        ]
+
+    def _send_batch(self, batch, can_send=None):
+        """묶음 하나 전송 (성공 True, 실패 False, can_send가 False를 반환하여 보내지 않았으면 None)"""
+        message, orders = batch
+        # 전송 도중 스토어 담당이 바뀌었으면 새 담당 작업자가 보내도록 중단
+        if can_send is not None and not can_send():
+            return None
+        # 앞선 전송이 429를 받았다면 더 보내지 않고 보류
+        if self.slack_manager.get_retry_after(self.slack_manager.order_webhook_url) > 0:
+            return False
+        return self.slack_manager.send_order_notification(message)
+
+    def send_orders(self, orders, keep_pending=True, can_send=None):
+        """주문 알림 전송 후 전송이 완료된 상품주문번호 목록 반환
+
+        orders: OrderManager.build_combined_order 형식의 주문 목록
+        전송하지 못한 주문은 보관했다가 다음 호출(또는 flush_pending) 때 함께 다시 보냅니다.
+        keep_pending=False 이면 보관하지 않습니다 (호출한 쪽에서 재전송을 관리하는 경우).
+        can_send: 묶음마다 전송 직전에 확인하는 함수, False이면 남은 묶음은 보내지도 보관하지도 않습니다.
+        """
+        # 보낼 주문은 잠금 안에서 꺼내고, Webhook 전송(429 대기 포함)은 잠금 밖에서 진행
+        with self._lock:
+            new_count = 0
+            for order in orders:
+                product_order_id = order.get('productOrderId')
+                if product_order_id not in self._pending:
+                    new_count += 1
+                self._pending[product_order_id] = order
+
+            recent_count = self._record_arrivals(new_count)
+            to_send = list(self._pending.values())
+            if not to_send:
+                return []
+
+            retry_after = self.slack_manager.get_retry_after(self.slack_manager.order_webhook_url)
+            if retry_after > 0:
+                self.logger.info(f"Slack 전송 제한으로 {len(to_send)}건 보류 ({retry_after:.1f}초 후 재전송)")
+                if not keep_pending:
+                    self._pending.clear()
+                return []
+
+            # 전송 중인 주문은 다른 호출이 함께 보내지 않도록 보류 목록에서 뺌
+            self._pending.clear()
+
+        use_digest = recent_count > self.digest_threshold and len(to_send) > 1
+        if use_digest:
+            self.logger.info(f"주문 급증 ({self.window_seconds:.0f}초 내 {recent_count}건), 요약 알림으로 전송")
+
+        batches = self._build_batches(to_send, use_digest)
+        if len(batches) == 1 or self.max_parallel_sends == 1:
+            results = [self._send_batch(batch, can_send) for batch in batches]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_parallel_sends, len(batches))) as executor:
+                results = list(executor.map(lambda batch: self._send_batch(batch, can_send), batches))
+
+        delivered = []
+        failed = []
+        skipped = 0
+        for (message, batch_orders), success in zip(batches, results):
+            if success is None:
+                skipped += len(batch_orders)
+            elif success:
+                delivered.extend(order.get('productOrderId') for order in batch_orders)
+            else:
+                failed.extend(batch_orders)
+
+        if skipped:
+            self.logger.warning(f"전송 권한이 없어 주문 알림 {skipped}건을 보내지 않았습니다")
+
+        if failed:
+            self.logger.warning(f"주문 알림 {len(failed)}건 전송 보류 (다음 주기에 재전송)")
+            if keep_pending:
+                with self._lock:
+                    for order in failed:
+                        # 전송 중에 같은 주문이 다시 들어왔으면 새 내용을 유지
+                        self._pending.setdefault(order.get('productOrderId'), order)
+        return delivered
+
+    def flush_pending(self, can_send=None):
+        """보류된 주문 알림 재전송 (전송 가능 시각 이전이면 건너뜀)"""
+        if not self._pending:
+            return []
+        return self.send_orders([], can_send=can_send)
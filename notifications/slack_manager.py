@@ -1,29 +1,74 @@
-import requests
+import hashlib
+import threading
+import time
 from ..utils import setup_logging
+from ..http_client import get_http_client, parse_retry_after
+from ..resilience import CircuitOpenError
+from ..metrics import timed_stage
+
+# Retry-After가 없거나 해석할 수 없는 429 응답의 기본 보류 시간(초)
+DEFAULT_RETRY_AFTER_SECONDS = 1.0
+
+
+def webhook_endpoint(webhook_url):
+    """Webhook별 차단기/지표 이름 (URL에 비밀 값이 있으므로 해시 일부만 사용)"""
+    return f"slack.webhook.{hashlib.sha256(webhook_url.encode('utf-8')).hexdigest()[:12]}"
+
 
 class SlackManager:
-    def __init__(self, log_webhook_url, order_webhook_url):
+    def __init__(self, log_webhook_url, order_webhook_url, http_client=None):
         self.log_webhook_url = log_webhook_url
         self.order_webhook_url = order_webhook_url
+        self.http_client = http_client or get_http_client()
         self.logger = setup_logging()
+        # Webhook별 전송 재개 가능 시각 (429 Retry-After)
+        self._retry_after_until = {}
+        self._lock = threading.Lock()
+
+    def get_retry_after(self, webhook_url):
+        """Retry-After로 전송이 보류된 남은 시간(초) 반환"""
+        with self._lock:
+            until = self._retry_after_until.get(webhook_url)
+        if until is None:
+            return 0
+        return max(0.0, until - time.monotonic())
 
+    @timed_stage('slack_send')
     def send_message(self, webhook_url, message):
         """Slack 메시지 전송"""
         try:
-            response = requests.post(
+            retry_after = self.get_retry_after(webhook_url)
+            if retry_after > 0:
+                self.logger.warning(f"Slack 전송 제한 중 ({retry_after:.1f}초 후 재시도 가능)")
+                return False
+            
+            response = self.http_client.post(
                 webhook_url,
                 json=message,
-                headers={'Content-Type': 'application/json'}
+                headers={'Content-Type': 'application/json'},
+                # 한 스토어의 Webhook 오류로 다른 스토어의 알림까지 차단되지 않도록 Webhook마다 차단기를 따로 사용
+                endpoint=webhook_endpoint(webhook_url)
             )
             
             if response.status_code == 200:
                 self.logger.info("Slack 메시지 전송 성공")
                 return True
+            elif response.status_code == 429:
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                if retry_after is None:
+                    retry_after = DEFAULT_RETRY_AFTER_SECONDS
+                with self._lock:
+                    self._retry_after_until[webhook_url] = time.monotonic() + retry_after
+                self.logger.warning(f"Slack 전송 한도 초과 (429), {retry_after}초 후 재시도")
+                return False
             else:
                 self.logger.error(f"Slack 메시지 전송 실패: {response.status_code}")
                 self.logger.error(f"응답: {response.text}")
                 return False
                 
+        except CircuitOpenError as e:
+            self.logger.warning(f"Slack 메시지 전송 생략: {str(e)}")
+            return False
         except Exception as e:
             self.logger.error(f"Slack 메시지 전송 중 오류: {str(e)}", exc_info=True)
             return False
@@ -34,4 +79,36 @@ class SlackManager:
 
     def send_log_message(self, message):
         """로그 메시지 전송"""
-        return self.send_message(self.log_webhook_url, message) 
\ No newline at end of file
+        return self.send_message(self.log_webhook_url, message)
+
+    def send_startup_message(self):
+        """프로그램 시작 알림 전송"""
+        message = {
+            "blocks": [
+                {
+                    "type": "header",
+                    "text": {
+                        "type": "plain_text",
+                        "text": "🚀 주문 관리 프로그램 시작",
+                        "emoji": True
+                    }
+                },
+                {
+                    "type": "section",
+                    "text": {
+                        "type": "mrkdwn",
+                        "text": "주문 모니터링이 시작되었습니다.\n주문이 들어오면 알림을 보내드리겠습니다."
+                    }
+                },
+                {
+                    "type": "context",
+                    "elements": [
+                        {
+                            "type": "mrkdwn",
+                            "text": "✅ 시스템이 정상적으로 실행 중입니다."
+                        }
+                    ]
+                }
+            ]
+        }
+        return self.send_order_notification(message)
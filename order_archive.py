@@ -0,0 +1,191 @@
+# order_archive.py
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from .cursor_store import format_changed_date
+from .utils import setup_logging
+
+
+def _to_db_date(value):
+    """조회 조건의 일시를 저장 형식(API 일시 문자열)으로 변환"""
+    if isinstance(value, datetime):
+        return format_changed_date(value)
+    return value
+
+
+class OrderArchive:
+    """SQLite 기반 주문 보관소
+
+    get_order_details 응답의 주문을 상품주문번호 기준으로 저장/갱신하며,
+    주문일자, 상품, 주문자 전화번호로 조회할 수 있습니다. CSV는 export_csv로 내보냅니다.
+    """
+
+    def __init__(self, filename='order_archive.db'):
+        self.filename = filename
+        self.logger = setup_logging()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(filename, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._create_schema()
+        self.logger.info(f"주문 보관소 초기화 완료: {filename}")
+
+    def _create_schema(self):
+        with self._lock:
+            conn = self._conn
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS orders ("
+                "product_order_id TEXT PRIMARY KEY, "
+                "order_id TEXT, "
+                "order_date TEXT, "
+                "orderer_name TEXT, "
+                "orderer_tel TEXT, "
+                "product_id TEXT, "
+                "product_name TEXT, "
+                "product_option TEXT, "
+                "quantity INTEGER, "
+                "total_payment_amount INTEGER, "
+                "product_order_status TEXT, "
+                "payload TEXT NOT NULL, "
+                "updated_at TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_orders_order_date ON orders (order_date)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_orders_orderer_tel ON orders (orderer_tel)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_orders_product_id ON orders (product_id, order_date)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_orders_product_name ON orders (product_name, order_date)")
+            conn.commit()
+
+    @staticmethod
+    def _to_record(order_data, updated_at):
+        product_order = order_data.get('productOrder') or {}
+        order_info = order_data.get('order') or {}
+        product_order_id = product_order.get('productOrderId')
+        if not product_order_id:
+            return None
+
+        return (
+            str(product_order_id),
+            order_info.get('orderId'),
+            order_info.get('orderDate'),
+            order_info.get('ordererName'),
+            order_info.get('ordererTel'),
+            product_order.get('productId'),
+            product_order.get('productName'),
+            product_order.get('productOption'),
+            product_order.get('quantity'),
+            product_order.get('totalPaymentAmount'),
+            product_order.get('productOrderStatus'),
+            json.dumps(order_data, ensure_ascii=False),
+            updated_at,
+        )
+
+    def upsert_order_details(self, order_details):
+        """주문 상세 정보 일괄 저장 (get_order_details 응답 또는 data 목록), 저장 건수 반환"""
+        if isinstance(order_details, dict):
+            order_details = order_details.get('data', [])
+
+        updated_at = datetime.now().isoformat(timespec='seconds')
+        records = [self._to_record(order_data, updated_at) for order_data in order_details or []]
+        records = [record for record in records if record]
+        if not records:
+            return 0
+
+        try:
+            with self._lock:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT INTO orders ("
+                        "product_order_id, order_id, order_date, orderer_name, orderer_tel, "
+                        "product_id, product_name, product_option, quantity, total_payment_amount, "
+                        "product_order_status, payload, updated_at"
+                        ") VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                        "ON CONFLICT(product_order_id) DO UPDATE SET "
+                        "order_id = excluded.order_id, "
+                        "order_date = excluded.order_date, "
+                        "orderer_name = excluded.orderer_name, "
+                        "orderer_tel = excluded.orderer_tel, "
+                        "product_id = excluded.product_id, "
+                        "product_name = excluded.product_name, "
+                        "product_option = excluded.product_option, "
+                        "quantity = excluded.quantity, "
+                        "total_payment_amount = excluded.total_payment_amount, "
+                        "product_order_status = excluded.product_order_status, "
+                        "payload = excluded.payload, "
+                        "updated_at = excluded.updated_at",
+                        records
+                    )
+            self.logger.debug("주문 보관소 저장: %d건", len(records))
+            return len(records)
+        except Exception as e:
+            self.logger.error(f"주문 보관소 저장 중 오류 발생: {str(e)}", exc_info=True)
+            return 0
+
+    def _query(self, where, params, limit=None):
+        sql = f"SELECT * FROM orders WHERE {where} ORDER BY order_date"
+        if limit:
+            sql += " LIMIT ?"
+            params = (*params, limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def get(self, product_order_id):
+        """상품주문번호로 주문 조회"""
+        rows = self._query("product_order_id = ?", (str(product_order_id),))
+        return rows[0] if rows else None
+
+    def find_by_date_range(self, start, end, limit=None):
+        """주문일자 범위 조회 (start 이상, end 미만)"""
+        return self._query("order_date >= ? AND order_date < ?", (_to_db_date(start), _to_db_date(end)), limit)
+
+    def find_by_product(self, product_id=None, product_name=None, start=None, end=None, limit=None):
+        """상품 ID 또는 상품명으로 주문 조회 (주문일자 범위 선택)"""
+        if product_id is None and product_name is None:
+            raise ValueError("product_id 또는 product_name 중 하나는 필수입니다.")
+
+        conditions, params = [], []
+        if product_id is not None:
+            conditions.append("product_id = ?")
+            params.append(str(product_id))
+        if product_name is not None:
+            conditions.append("product_name = ?")
+            params.append(product_name)
+        if start is not None:
+            conditions.append("order_date >= ?")
+            params.append(_to_db_date(start))
+        if end is not None:
+            conditions.append("order_date < ?")
+            params.append(_to_db_date(end))
+        return self._query(" AND ".join(conditions), tuple(params), limit)
+
+    def find_by_orderer_tel(self, orderer_tel, limit=None):
+        """주문자 전화번호로 주문 조회"""
+        return self._query("orderer_tel = ?", (orderer_tel,), limit)
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM orders").fetchone()[0]
+
+    def export_csv(self, filename='order.csv', start=None, end=None):
+        """보관된 주문을 CSV로 내보내기 (이미 CSV에 있는 주문은 제외), 기록 건수 반환"""
+        from .order_csv import CSVManager
+
+        conditions, params = ["1 = 1"], []
+        if start is not None:
+            conditions.append("order_date >= ?")
+            params.append(_to_db_date(start))
+        if end is not None:
+            conditions.append("order_date < ?")
+            params.append(_to_db_date(end))
+        rows = self._query(" AND ".join(conditions), tuple(params))
+
+        order_details = [json.loads(row['payload']) for row in rows]
+        written = CSVManager(filename).write_order_to_csv(order_details)
+        self.logger.info(f"주문 CSV 내보내기 완료: {written}건 ({filename})")
+        return written
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
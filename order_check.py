@@ -1,13 +1,40 @@
-import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import json
-from .notifications import SlackManager, OrderMessageTemplate
+import logging
+import threading
+from .notifications import SlackManager, OrderMessageTemplate, OrderNotificationCoalescer
 from .utils import load_config, setup_logging
-from .auth import TokenManager
+from .config_service import get_config_service
+from .auth import TokenManager, DEFAULT_COMMERCE_API_BASE_URL
+from .http_client import get_http_client
+from .resilience import CircuitOpenError
+from .dedup_store import create_dedup_store
+from .order_archive import OrderArchive
+from .order_lifecycle import OrderLifecycle
+from .detail_cache import OrderDetailCache
+from .outbox import Outbox, OutboxDispatcher
+from .metrics import get_metrics, timed_stage
+from .cursor_store import CursorStore, KST, format_changed_date, parse_changed_date
+
+# 커서가 없을 때(최초 실행) 조회할 기간
+INITIAL_LOOKBACK_MINUTES = 30
+# 변경 일시 조회 API가 한 번에 조회하는 최대 기간
+MAX_QUERY_WINDOW = timedelta(hours=24)
+# 알림을 보내는 변경 구분 (항상 조회)
+NOTIFY_CHANGE_TYPE = 'PAYED'
+# 단건 조회(orders/single) 응답은 일괄 조회 항목과 형식이 다르므로 다른 캐시 키로 저장
+SINGLE_DETAIL_CACHE_PREFIX = 'single:'
 
 class OrderManager:
-    def __init__(self, client_id=None, client_secret=None, token_refresh_minutes=30):
-        """초기화 메서드"""
+    def __init__(self, client_id=None, client_secret=None, token_refresh_minutes=30, http_client=None,
+                 store_id=None, store_config=None, shared=None):
+        """초기화 메서드
+
+        여러 스토어를 한 프로세스에서 운영할 때(multi_store.py)는 store_id/store_config로 스토어별 설정을,
+        shared로 함께 쓰는 자원(알림 완료 목록, 커서, 보관소, 주문 상태 기록, 상세 정보 캐시, 상세 조회 작업자,
+        알림 대기열)을 전달합니다.
+        """
         # logger를 가장 먼저 초기화
         self.logger = setup_logging()
         
@@ -21,6 +48,11 @@ class OrderManager:
                 self.logger.error("설정을 불러올 수 없습니다.")
                 raise ValueError("설정 로드 실패")
             
+            # 스토어별 설정은 공통 설정을 덮어씀
+            self.store_id = store_id
+            if store_config:
+                config = {**config, **store_config}
+            
             # 필수 설정 검증
             required_configs = ['WEBHOOK_LOG', 'WEBHOOK_ORDER']
             for key in required_configs:
@@ -28,78 +60,410 @@ class OrderManager:
                     self.logger.error(f"필수 설정 누락: {key}")
                     raise ValueError(f"설정에서 {key}를 찾을 수 없습니다.")
             
+            # 공용 HTTP 클라이언트 (커넥션 풀/타임아웃)
+            self.http_client = http_client or get_http_client(config)
+            
             # Slack 초기화
-            self.slack_manager = SlackManager(config["WEBHOOK_LOG"], config["WEBHOOK_ORDER"])
+            self.slack_manager = SlackManager(
+                config["WEBHOOK_LOG"],
+                config["WEBHOOK_ORDER"],
+                http_client=self.http_client
+            )
+            # 주문 급증 시 요약 알림으로 묶어서 전송
+            self.notification_coalescer = OrderNotificationCoalescer.from_config(self.slack_manager, config)
             
             # API 엔드포인트 설정
-            self.query_url = "https://api.commerce.naver.com/external/v1/pay-order/seller/product-orders/query"
-            self.list_url = 'https://api.commerce.naver.com/external/v1/pay-order/seller/product-orders/last-changed-statuses'
+            self.api_base_url = config.get('COMMERCE_API_BASE_URL', DEFAULT_COMMERCE_API_BASE_URL).rstrip('/')
+            self.query_url = f"{self.api_base_url}/external/v1/pay-order/seller/product-orders/query"
+            self.list_url = f"{self.api_base_url}/external/v1/pay-order/seller/product-orders/last-changed-statuses"
             
-            # 기타 초기화
-            self.notified_order_ids = set()
+            if shared is not None:
+                # 여러 스토어가 함께 쓰는 자원 (알림 대기열 작업자는 MultiStoreManager가 관리)
+                self.notified_order_ids = shared.dedup_store
+                self.outbox = shared.outbox
+                self.outbox_dispatcher = shared.outbox_dispatcher
+                self.order_archive = shared.order_archive
+                self.order_lifecycle = shared.order_lifecycle
+                self.detail_cache = shared.detail_cache
+                self.cursor_store = shared.cursor_store
+            else:
+                # 알림 완료 주문 목록 (재시작 후에도 유지)
+                self.notified_order_ids = create_dedup_store(config)
+                
+                # 알림 발송 대기열 (사용 시 알림은 별도 작업자가 전송)
+                self.outbox = None
+                self.outbox_dispatcher = None
+                if config.get('OUTBOX_ENABLED', False):
+                    self.start_outbox(config)
+                
+                # 주문 보관소 (SQLite)
+                self.order_archive = None
+                if config.get('ORDER_ARCHIVE_ENABLED', True):
+                    self.order_archive = OrderArchive(config.get('ORDER_ARCHIVE_FILE', 'order_archive.db'))
+                
+                # 주문 상태 기록 (상태 전이 이벤트)
+                self.order_lifecycle = None
+                if config.get('ORDER_LIFECYCLE_ENABLED', True):
+                    self.order_lifecycle = OrderLifecycle.from_config(config)
+                
+                # 주문 상세 정보 캐시 (변경 일시가 같은 주문은 다시 조회하지 않음)
+                self.detail_cache = None
+                if config.get('DETAIL_CACHE_ENABLED', True):
+                    self.detail_cache = OrderDetailCache.from_config(config)
+                
+                # 마지막 처리 시점 커서 (재시작 시 이어서 조회)
+                self.cursor_store = CursorStore(config.get('CURSOR_FILE', 'order_cursor.json'))
+            
+            # 조회할 변경 구분 (결제 완료 외의 구분은 주문 상태 기록에만 사용)
+            self.change_types = [NOTIFY_CHANGE_TYPE] + [
+                change_type for change_type in config.get('POLL_CHANGE_TYPES', [])
+                if change_type != NOTIFY_CHANGE_TYPE
+            ]
+            self.change_type_executor = None
+            if len(self.change_types) > 1:
+                self.change_type_executor = ThreadPoolExecutor(
+                    max_workers=len(self.change_types) - 1,
+                    thread_name_prefix='order-change-type'
+                )
             
-            # TokenManager 초기화
+            # 스토어/변경 구분별 커서 키 (한 파일에 스토어별로 저장)
+            self.cursor_key = self.get_cursor_key(NOTIFY_CHANGE_TYPE)
+            self.cursor_overlap = timedelta(seconds=int(config.get('CURSOR_OVERLAP_SECONDS', 60)))
+            self.last_poll_windows = {}
+            # 변경 구분별 마지막 목록 조회 응답 헤더 (미리 조회/변경 구분 조회 스레드에서 기록)
+            self._response_headers = {}
+            self._response_headers_lock = threading.Lock()
+            # 조회/알림을 계속해도 되는지 확인하는 함수 (스토어 임대를 잃으면 중단, sharding.py)
+            self.poll_guard = None
+            self.max_pages_per_cycle = int(config.get('MAX_PAGES_PER_CYCLE', 10))
+            
+            # 상세 정보 조회 설정 (요청당 상품주문번호 수, 병렬 조회 수)
+            self.detail_chunk_size = int(config.get('DETAIL_CHUNK_SIZE', 300))
+            if shared is not None:
+                self.detail_executor = shared.detail_executor
+            else:
+                self.detail_executor = ThreadPoolExecutor(
+                    max_workers=int(config.get('DETAIL_MAX_WORKERS', 4)),
+                    thread_name_prefix='order-detail'
+                )
+            
+            # TokenManager 초기화 (토큰 캐시 파일은 스토어마다 따로 사용)
+            if store_id:
+                token_cache_file = (store_config or {}).get('TOKEN_CACHE_FILE', f'token_cache_{store_id}.dat')
+            else:
+                token_cache_file = config.get('TOKEN_CACHE_FILE', 'token_cache.dat')
             self.auth = TokenManager(
                 client_id=client_id,
                 client_secret=client_secret,
                 token_refresh_minutes=token_refresh_minutes,
-                slack_manager=self.slack_manager
+                slack_manager=self.slack_manager,
+                http_client=self.http_client,
+                token_cache_file=token_cache_file,
+                api_base_url=self.api_base_url
             )
+            # 여러 스토어 운영 시에는 MultiStoreManager의 갱신 스레드 하나가 모든 토큰을 갱신
+            if shared is None and config.get('TOKEN_BACKGROUND_REFRESH', True):
+                self.auth.start_background_refresh()
             
-            self.logger.info(f"OrderManager 초기화 완료 (토큰 갱신 주기: {token_refresh_minutes}분)")
+            # 설정 파일이 바뀌면 Webhook/인증 정보를 다시 적용
+            get_config_service().subscribe(self.apply_config)
+            
+            self.register_metrics()
+            
+            store_label = f"스토어: {store_id}, " if store_id else ""
+            self.logger.info(f"OrderManager 초기화 완료 ({store_label}토큰 갱신 주기: {token_refresh_minutes}분)")
             
         except Exception as e:
             self.logger.error(f"OrderManager 초기화 중 오류 발생: {str(e)}", exc_info=True)
             raise
 
-    def get_new_order_list(self, retry_count=0):
-        """신규 주문 목록 조회"""
+    def apply_config(self, config):
+        """변경된 설정 적용 (조회 루프를 멈추지 않고 Webhook/인증 정보 교체)"""
+        if self.store_id:
+            store_config = next(
+                (store for store in config.get('STORES', []) if store.get('STORE_ID') == self.store_id),
+                None
+            )
+            if store_config is None:
+                self.logger.warning(f"설정에서 스토어를 찾을 수 없어 기존 설정 유지: {self.store_id}")
+                return
+            config = {**config, **store_config}
+        
+        self.slack_manager.log_webhook_url = config['WEBHOOK_LOG']
+        self.slack_manager.order_webhook_url = config['WEBHOOK_ORDER']
+        self.auth.update_credentials(config['CLIENT_ID'], config['CLIENT_SECRET'])
+        self.logger.info("OrderManager 설정 갱신 완료")
+
+    def close(self):
+        """설정 변경 구독 해제 및 백그라운드 토큰 갱신 종료 (공용 자원은 닫지 않음)"""
+        get_config_service().unsubscribe(self.apply_config)
+        self.auth.stop_background_refresh()
+        if self.change_type_executor is not None:
+            self.change_type_executor.shutdown(wait=False)
+
+    def register_metrics(self):
+        """알림 완료 목록 크기, 알림 대기열 길이, 조회 지연 게이지 등록"""
+        metrics = get_metrics()
+        labels = {'store': self.store_id} if self.store_id else {}
+        metrics.gauge('order_dedup_size', '알림 완료 주문 목록 크기').set_function(
+            lambda: len(self.notified_order_ids), **labels
+        )
+        metrics.gauge('outbox_depth', '전송 대기 중인 알림 수').set_function(
+            lambda: self.outbox.depth() if self.outbox is not None else 0, **labels
+        )
+        metrics.gauge('outbox_dead', '최대 시도 횟수를 넘어 전송을 중단한 알림 수').set_function(
+            lambda: self.outbox.dead_count() if self.outbox is not None else 0, **labels
+        )
+        metrics.gauge('order_poll_lag_seconds', '마지막 처리 주문 변경 일시로부터 경과 시간(초)').set_function(
+            self.get_poll_lag, **labels
+        )
+
+    def has_poll_permission(self):
+        """이 스토어를 계속 조회/알림해도 되는지 여부 (poll_guard가 없으면 항상 True)"""
+        return self.poll_guard is None or self.poll_guard()
+
+    def get_cursor_key(self, change_type):
+        return f"{self.store_id}:{change_type}" if self.store_id else change_type
+
+    def get_poll_lag(self):
+        """커서(마지막 처리 시점)가 현재 시각보다 뒤처진 시간(초), 커서가 없으면 None"""
+        cursor = self.cursor_store.get(self.cursor_key)
+        if cursor is None:
+            return None
+        return max(0.0, (datetime.now(KST) - cursor).total_seconds())
+
+    def start_outbox(self, config):
+        """알림 발송 대기열과 전송 작업자 시작"""
+        self.outbox = Outbox(config.get('OUTBOX_FILE', 'order_outbox.db'))
+        self.outbox_dispatcher = OutboxDispatcher(
+            self.outbox,
+            max_attempts=int(config.get('OUTBOX_MAX_ATTEMPTS', 20))
+        )
+        self.outbox_dispatcher.register_handler(
+            'slack_order',
+            self.deliver_order_notifications,
+            batch_size=int(config.get('OUTBOX_BATCH_SIZE', 100)),
+            retry_after=lambda: self.slack_manager.get_retry_after(self.slack_manager.order_webhook_url)
+        )
+        self.outbox_dispatcher.start()
+
+    def deliver_order_notifications(self, combined_orders):
+        """대기열의 주문 알림 전송 (전송 작업자에서 호출), 주문별 성공 여부 목록 반환"""
+        delivered = set(self.notification_coalescer.send_orders(combined_orders, keep_pending=False))
+        return [order.get('productOrderId') in delivered for order in combined_orders]
+
+    def get_new_order_list(self):
+        """신규 주문 목록 조회 (연속 조회 페이지를 모두 합쳐서 반환)"""
+        orders = []
+        for page_orders in self.iter_new_order_pages():
+            orders.extend(page_orders)
+        return orders
+
+    def iter_new_order_pages(self, change_type=NOTIFY_CHANGE_TYPE):
+        """변경 주문 목록을 페이지 단위로 반환 (기본: 결제 완료)
+
+        현재 페이지를 처리하는 동안 다음 페이지를 미리 조회하며,
+        한 주기에 최대 max_pages_per_cycle 페이지까지만 조회합니다.
+        """
+        self.last_poll_windows[change_type] = None
+        current_time = datetime.now(KST)
+        from_time = self.get_poll_start(current_time, change_type)
+        
+        params = {
+            "lastChangedFrom": format_changed_date(from_time),
+            "lastChangedType": change_type
+        }
+        
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(self.get_order_list_page, params)
+            for page_number in range(1, self.max_pages_per_cycle + 1):
+                page = future.result()
+                if page is None:
+                    return
+                
+                orders, more = page
+                if more and page_number < self.max_pages_per_cycle:
+                    params = {
+                        **params,
+                        "lastChangedFrom": more.get('moreFrom'),
+                        "moreSequence": more.get('moreSequence')
+                    }
+                    future = executor.submit(self.get_order_list_page, params)
+                elif more:
+                    self.logger.warning(f"주기당 최대 조회 페이지 수({self.max_pages_per_cycle}) 도달, 나머지는 다음 주기에 조회")
+                else:
+                    # 조회 구간의 마지막 페이지
+                    self.last_poll_windows[change_type] = (from_time, current_time)
+                
+                yield orders
+                
+                if not more:
+                    return
+
+    @timed_stage('order_list_page')
+    def get_order_list_page(self, params):
+        """변경 주문 목록 한 페이지 조회 (성공 시 (주문 목록, 연속 조회 정보), 실패 시 None)
+
+        네트워크 오류/5xx 재시도는 HttpClient가 처리하고, 여기서는 401 응답 시 토큰을 한 번 재발급하여 다시 요청합니다.
+        """
         try:
-            current_time = datetime.now()
-            from_time = current_time - timedelta(minutes=30)
-            
-            headers = {
-                "Authorization": f"Bearer {self.auth.get_valid_token()}",
-                "Content-Type": "application/json"
-            }
-            
-            params = {
-                "lastChangedFrom": from_time.strftime("%Y-%m-%dT%H:%M:%S.%f+09:00"),
-                "lastChangedType": "PAYED"
-            }
-            
-            self.logger.debug(f"주문 조회 파라미터: {params}")
-            
-            response = requests.get(self.list_url, headers=headers, params=params)
+            self.logger.debug("주문 조회 파라미터: %s", params)
             
+            response = self.request_order_list_page(params)
             if response.status_code == 401:
-                if retry_count < 3:
-                    self.logger.info(f"토큰 갱신 시도 {retry_count + 1}/3")
-                    if self.auth.refresh_token():
-                        return self.get_new_order_list(retry_count + 1)
-                self.logger.error("토큰 갱신 실패")
-                return []
+                self.logger.info("토큰 갱신 후 주문 목록 다시 조회")
+                if not self.auth.refresh_token():
+                    self.logger.error("토큰 갱신 실패")
+                    return None
+                response = self.request_order_list_page(params)
                 
             if response.status_code == 200:
-                res_data = response.json()
-                orders = res_data.get('data', {}).get('lastChangeStatuses', [])
-                return orders
+                data = response.json().get('data') or {}
+                orders = data.get('lastChangeStatuses', [])
+                more = data.get('more')
+                if more and not more.get('moreSequence'):
+                    more = None
+                return orders, more
                 
             self.logger.error(f"API 오류 응답: {response.text}")
-            return []
+            return None
             
+        except CircuitOpenError as e:
+            self.logger.warning(f"주문 목록 조회 생략: {str(e)}")
+            return None
         except Exception as e:
             self.logger.error(f"주문 목록 조회 중 오류 발생: {str(e)}", exc_info=True)
-            return []
+            return None
+
+    def request_order_list_page(self, params):
+        """변경 주문 목록 API 요청 (응답 헤더는 조회 주기 조정에 사용)"""
+        headers = {
+            "Authorization": f"Bearer {self.auth.get_valid_token()}",
+            "Content-Type": "application/json"
+        }
+        response = self.http_client.get(self.list_url, headers=headers, params=params,
+                                        endpoint='commerce.last_changed_statuses')
+        with self._response_headers_lock:
+            self._response_headers[params.get('lastChangedType', NOTIFY_CHANGE_TYPE)] = response.headers
+        return response
+
+    def take_response_headers(self):
+        """마지막 조회 이후 받은 변경 구분별 목록 조회 응답 헤더 목록 반환 후 비움 (조회 주기 조정에 사용)"""
+        with self._response_headers_lock:
+            headers_list = list(self._response_headers.values())
+            self._response_headers.clear()
+        return headers_list
 
-    def get_order_details(self, product_order_ids):
-        """주문 상세 정보 조회"""
+    def get_poll_start(self, current_time, change_type=NOTIFY_CHANGE_TYPE):
+        """조회 시작 시각 계산 (저장된 커서 - 겹침 구간, 커서가 없으면 최근 30분)"""
+        cursor = self.cursor_store.get(self.get_cursor_key(change_type))
+        if cursor is None:
+            return current_time - timedelta(minutes=INITIAL_LOOKBACK_MINUTES)
+        return min(cursor - self.cursor_overlap, current_time)
+
+    def advance_cursor(self, orders, failed_order_ids=(), change_type=NOTIFY_CHANGE_TYPE):
+        """처리 결과에 따라 커서 갱신
+
+        실패한 주문이 있으면 가장 이른 실패 주문 시점에 커서를 두어 다음 주기에 다시 조회하고,
+        모두 처리되었으면 가장 최근 변경 일시까지 커서를 이동합니다.
+        """
+        cursor_key = self.get_cursor_key(change_type)
+        failed_dates = [
+            parse_changed_date(order.get('lastChangedDate'))
+            for order in orders
+            if order.get('productOrderId') in failed_order_ids
+        ]
+        failed_dates = [date for date in failed_dates if date]
+        if failed_dates:
+            self.cursor_store.update(cursor_key, min(failed_dates))
+            return
+        
+        changed_dates = [parse_changed_date(order.get('lastChangedDate')) for order in orders]
+        changed_dates = [date for date in changed_dates if date]
+        if changed_dates:
+            self.cursor_store.update(cursor_key, max(changed_dates))
+            return
+        
+        # 조회 구간에 변경 내역이 없으면 조회한 구간 끝까지 이동
+        poll_window = self.last_poll_windows.get(change_type)
+        if poll_window is None:
+            return
+        from_time, request_time = poll_window
+        self.cursor_store.update(cursor_key, min(from_time + MAX_QUERY_WINDOW, request_time))
+
+    @timed_stage('order_details')
+    def get_order_details(self, product_order_ids, last_changed_dates=None):
+        """주문 상세 정보 조회
+
+        last_changed_dates({상품주문번호: 마지막 변경 일시})를 전달하면 변경 일시가 같은 주문은
+        상세 정보 캐시에서 가져오고 나머지만 조회합니다.
+        상품주문번호를 detail_chunk_size 단위로 나누어 병렬로 조회한 후 결과를 병합합니다.
+        묶음별 재시도는 HttpClient(resilience.py)가 처리하므로 여기서는 다시 조회하지 않습니다.
+        """
         try:
             if not product_order_ids:
                 return []
+            
+            merged = []
+            use_cache = self.detail_cache is not None and last_changed_dates
+            if use_cache:
+                cached = self.detail_cache.get_many(
+                    [(product_order_id, last_changed_dates.get(product_order_id)) for product_order_id in product_order_ids]
+                )
+                if cached:
+                    merged.extend(cached.values())
+                    product_order_ids = [
+                        product_order_id for product_order_id in product_order_ids
+                        if str(product_order_id) not in cached
+                    ]
+                    self.logger.info("주문 상세 정보 캐시 사용: %d건", len(cached))
+                if not product_order_ids:
+                    return {"data": merged}
                 
-            self.logger.info(f"주문 상세 정보 조회: {product_order_ids}")
+            self.logger.info("주문 상세 정보 조회: %d건", len(product_order_ids))
+            
+            chunks = [
+                product_order_ids[i:i + self.detail_chunk_size]
+                for i in range(0, len(product_order_ids), self.detail_chunk_size)
+            ]
+            
+            if len(chunks) == 1:
+                results = [self.query_order_details(chunks[0])]
+            else:
+                results = list(self.detail_executor.map(self.query_order_details, chunks))
+            
+            failed_count = 0
+            for chunk, result in zip(chunks, results):
+                if result is None:
+                    failed_count += len(chunk)
+                else:
+                    merged.extend(result)
+                    if use_cache:
+                        self.cache_order_details(result, last_changed_dates)
+            
+            if failed_count:
+                self.logger.error(f"상세 정보 조회 실패: {failed_count}건")
+                if not merged:
+                    return []
             
+            return {"data": merged}
+            
+        except Exception as e:
+            self.logger.error(f"주문 상세 정보 조회 중 오류: {str(e)}", exc_info=True)
+            return []
+
+    def cache_order_details(self, order_data_list, last_changed_dates):
+        """조회한 상세 정보를 변경 일시와 함께 캐시에 저장"""
+        entries = []
+        for order_data in order_data_list:
+            product_order_id = (order_data.get('productOrder') or {}).get('productOrderId')
+            if product_order_id:
+                entries.append((product_order_id, last_changed_dates.get(product_order_id), order_data))
+        self.detail_cache.put_many(entries)
+
+    def query_order_details(self, product_order_ids):
+        """상품주문번호 한 묶음의 상세 정보 조회 (성공 시 data 목록, 실패 시 None)"""
+        try:
             headers = {
                 "Authorization": f"Bearer {self.auth.get_valid_token()}",
                 "Content-Type": "application/json"
@@ -107,22 +471,33 @@ class OrderManager:
             
             payload = {"productOrderIds": product_order_ids}
             
-            response = requests.post(self.query_url, headers=headers, json=payload)
-            self.logger.debug(f"상세 정보 조회 응답 코드: {response.status_code}")
+            # 조회용 POST이므로 실패 시 다시 보내도 안전
+            response = self.http_client.post(self.query_url, headers=headers, json=payload,
+                                             endpoint='commerce.product_orders_query', idempotent=True)
+            self.logger.debug("상세 정보 조회 응답 코드: %s", response.status_code)
             
             if response.status_code == 200:
-                return response.json()
+                return response.json().get('data', [])
             
             self.logger.error(f"상세 정보 조회 실패: {response.text}")
-            return []
+            return None
             
+        except CircuitOpenError as e:
+            self.logger.warning(f"상세 정보 조회 생략: {str(e)}")
+            return None
         except Exception as e:
             self.logger.error(f"주문 상세 정보 조회 중 오류: {str(e)}", exc_info=True)
-            return []
+            return None
 
-    def get_order_detail(self, product_order_id):
-        """주문 상세 정보 조회"""
+    def get_order_detail(self, product_order_id, last_changed_date=None):
+        """주문 상세 정보 조회 (last_changed_date를 전달하면 변경 일시가 같은 캐시 항목 사용)"""
         try:
+            cache_key = f"{SINGLE_DETAIL_CACHE_PREFIX}{product_order_id}"
+            if self.detail_cache is not None and last_changed_date:
+                cached = self.detail_cache.get(cache_key, last_changed_date)
+                if cached is not None:
+                    return cached
+            
             token = self.auth.get_valid_token()
             if not token:
                 self.logger.error("유효한 토큰이 없습니다.")
@@ -133,14 +508,18 @@ class OrderManager:
                 "content-type": "application/json"
             }
 
-            url = f"https://api.commerce.naver.com/external/v1/pay-order/seller/orders/single/{product_order_id}"
-            response = requests.get(url, headers=headers)
+            url = f"{self.api_base_url}/external/v1/pay-order/seller/orders/single/{product_order_id}"
+            response = self.http_client.get(url, headers=headers, endpoint='commerce.order_single')
             
-            self.logger.info(f"주문 상세 조회 응답 코드: {response.status_code}")
+            self.logger.info("주문 상세 조회 응답 코드: %s", response.status_code)
             
             if response.status_code == 200:
                 order_detail = response.json()
-                self.logger.debug(f"주문 상세 정보: {json.dumps(order_detail, ensure_ascii=False, indent=2)}")
+                # DEBUG 로그가 꺼져 있으면 큰 응답을 직렬화하지 않음
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug("주문 상세 정보: %s", json.dumps(order_detail, ensure_ascii=False, indent=2))
+                if self.detail_cache is not None and last_changed_date:
+                    self.detail_cache.put(cache_key, last_changed_date, order_detail)
                 return order_detail
             else:
                 self.logger.error(f"주문 상세 조회 실패: {response.text}")
@@ -150,63 +529,204 @@ class OrderManager:
             self.logger.error(f"주문 상세 조회 중 오류: {str(e)}")
             return None
 
+    @timed_stage('poll_cycle')
     def process_new_orders(self):
-        """신규 주문 처리"""
+        """신규 주문 처리 (이번 주기에 조회된 변경 주문 수 반환)"""
+        orders_seen = 0
+        change_type_polls = []
         try:
-            orders = self.get_new_order_list()
-            if not orders:
-                return
+            # 결제 완료 외의 변경 구분은 별도 스레드에서 동시에 조회
+            change_type_polls = self.start_change_type_polls()
             
-            # 처리할 주문 필터링
-            new_orders = [
-                order for order in orders 
-                if order.get('productOrderId') not in self.notified_order_ids
-            ]
+            # 이전 주기에 전송하지 못한 알림 재전송
+            if self.has_poll_permission():
+                self.mark_notified(self.notification_coalescer.flush_pending(can_send=self.has_poll_permission))
             
-            if not new_orders:
-                return
+            cursor_held = False
+            for orders in self.iter_new_order_pages():
+                if not self.has_poll_permission():
+                    self.logger.warning("조회 권한이 없어 주문 처리를 중단합니다.")
+                    break
+                orders_seen += len(orders)
+                get_metrics().counter('orders_seen_total', '조회된 변경 주문 수').inc(len(orders))
+                self.track_lifecycle(orders)
+                failed_order_ids = self.process_order_page(orders)
+                
+                # 처리 도중 권한을 잃었으면 새 담당 작업자가 같은 커서에서 이어서 조회하도록 커서를 건드리지 않음
+                if not self.has_poll_permission():
+                    self.logger.warning("조회 권한이 없어 주문 처리를 중단합니다.")
+                    break
+                
+                # 실패한 주문이 있으면 이후 페이지에서 커서를 앞으로 옮기지 않음
+                if not cursor_held:
+                    self.advance_cursor(orders, failed_order_ids)
+                    cursor_held = bool(failed_order_ids)
+                    
+        except Exception as e:
+            self.logger.error(f"주문 처리 중 오류 발생: {str(e)}", exc_info=True)
+        finally:
+            # 오류가 나도 다음 주기가 같은 변경 구분/커서를 동시에 조회하지 않도록 완료까지 대기
+            orders_seen += self.wait_change_type_polls(change_type_polls)
+        
+        return orders_seen
+
+    def start_change_type_polls(self):
+        """결제 완료 외의 변경 구분 조회 시작 (wait_change_type_polls로 결과 대기)"""
+        if self.change_type_executor is None:
+            return []
+        return [
+            self.change_type_executor.submit(self.poll_change_type, change_type)
+            for change_type in self.change_types[1:]
+        ]
+
+    def wait_change_type_polls(self, futures):
+        """변경 구분 조회 완료 대기 후 조회된 변경 주문 수 합계 반환"""
+        orders_seen = 0
+        for future in futures:
+            try:
+                orders_seen += future.result()
+            except Exception as e:
+                self.logger.error(f"변경 주문 조회 대기 중 오류 발생: {str(e)}", exc_info=True)
+        return orders_seen
+
+    def poll_change_type(self, change_type):
+        """변경 구분 하나를 조회하여 주문 상태 기록에 반영 (조회된 변경 주문 수 반환)"""
+        orders_seen = 0
+        try:
+            for orders in self.iter_new_order_pages(change_type):
+                if not self.has_poll_permission():
+                    break
+                orders_seen += len(orders)
+                get_metrics().counter('orders_seen_total', '조회된 변경 주문 수').inc(len(orders))
+                self.track_lifecycle(orders)
+                self.advance_cursor(orders, change_type=change_type)
+        except Exception as e:
+            self.logger.error(f"변경 주문 조회 중 오류 발생 ({change_type}): {str(e)}", exc_info=True)
+        return orders_seen
+
+    def track_lifecycle(self, orders):
+        """변경 주문 목록을 주문 상태 기록에 반영 (상태 전이 이벤트 목록 반환)"""
+        if self.order_lifecycle is None or not orders:
+            return []
+        return self.order_lifecycle.apply_changes(orders, store_id=self.store_id)
+
+    @timed_stage('process_page')
+    def process_order_page(self, orders):
+        """주문 목록 한 페이지 처리 (알림이 완료되지 않은 상품주문번호 집합 반환)"""
+        # 처리할 주문 필터링
+        new_orders = [
+            order for order in orders 
+            if order.get('productOrderId') not in self.notified_order_ids
+        ]
+        
+        if not new_orders:
+            return set()
+        
+        self.logger.info("처리할 신규 주문: %d건", len(new_orders))
+        
+        # 주문 상세 정보 조회 (변경 일시가 같은 주문은 캐시 사용)
+        product_order_ids = [order.get('productOrderId') for order in new_orders]
+        last_changed_dates = {order.get('productOrderId'): order.get('lastChangedDate') for order in new_orders}
+        order_details = self.get_order_details(product_order_ids, last_changed_dates)
+        if not order_details:
+            self.logger.error("주문 상세 정보 조회 실패")
+            return set(product_order_ids)
+        
+        self.archive_order_details(order_details.get('data', []))
+        
+        # 상세 조회 중 스토어 담당이 바뀌었으면 새 담당 작업자가 알림을 보내도록 알림 생략
+        if not self.has_poll_permission():
+            self.logger.warning("조회 권한이 없어 주문 알림을 보내지 않습니다: %d건", len(product_order_ids))
+            return set(product_order_ids)
+        
+        # 주문 알림 전송
+        self.notify_orders(order_details.get('data', []))
+        
+        # 알림이 완료되지 않은 주문은 다음 주기에 다시 조회되도록 반환
+        return {
+            product_order_id for product_order_id in product_order_ids
+            if product_order_id not in self.notified_order_ids
+        }
+
+    @timed_stage('archive')
+    def archive_order_details(self, order_data_list):
+        """주문 상세 정보를 보관소에 저장"""
+        if self.order_archive is not None and order_data_list:
+            self.order_archive.upsert_order_details(order_data_list)
+
+    @staticmethod
+    def build_combined_order(order_data):
+        """주문 정보와 주문자 정보 결합"""
+        product_order = order_data.get('productOrder', {})
+        if not product_order:
+            return None
+        
+        order_info = order_data.get('order', {})
+        return {
+            **product_order,
+            'orderer': {
+                'name': order_info.get('ordererName'),
+                'tel': order_info.get('ordererTel'),
+                'orderDate': order_info.get('orderDate')
+            }
+        }
+
+    def mark_notified(self, product_order_ids):
+        """알림 완료 목록에 추가"""
+        for product_order_id in product_order_ids:
+            self.notified_order_ids.add(product_order_id)
+
+    @timed_stage('notify')
+    def notify_orders(self, order_data_list):
+        """주문 알림 전송 (급증 시 요약 알림), 전송 완료된 상품주문번호 목록 반환"""
+        try:
+            combined_orders = [self.build_combined_order(order_data) for order_data in order_data_list]
+            combined_orders = [order for order in combined_orders if order]
+            if not combined_orders:
+                return []
             
-            self.logger.info(f"처리할 신규 주문: {len(new_orders)}건")
+            if self.outbox is not None:
+                # 대기열에 저장되면 알림 완료로 보고 전송은 작업자에게 맡김
+                if self.store_id:
+                    # 공용 대기열에서 스토어별 Webhook으로 전송할 수 있도록 표시
+                    combined_orders = [{**order, 'storeId': self.store_id} for order in combined_orders]
+                items = [(order.get('productOrderId'), order) for order in combined_orders]
+                self.outbox.enqueue_many('slack_order', items)
+                self.outbox_dispatcher.wake()
+                delivered = [product_order_id for product_order_id, _ in items]
+                self.mark_notified(delivered)
+                self.logger.info(f"주문 알림 대기열 추가: {len(delivered)}건")
+                return delivered
             
-            # 주문 상세 정보 조회
-            product_order_ids = [order.get('productOrderId') for order in new_orders]
-            order_details = self.get_order_details(product_order_ids)
-            if not order_details:
-                self.logger.error("주문 상세 정보 조회 실패")
-                return
+            # 전송이 길어지는 동안 스토어 담당이 바뀔 수 있으므로 묶음마다 소유권을 다시 확인
+            delivered = self.notification_coalescer.send_orders(combined_orders, can_send=self.has_poll_permission)
+            self.mark_notified(delivered)
+            self.logger.info("주문 알림 전송 완료: %d/%d건", len(delivered), len(combined_orders))
+            return delivered
+            
+        except Exception as e:
+            self.logger.error(f"주문 알림 전송 중 오류: {str(e)}", exc_info=True)
+            return []
+
+    def notify_order(self, order_data):
+        """단일 주문 Slack 알림 전송 (성공 시 알림 완료 목록에 추가)"""
+        try:
+            combined_order = self.build_combined_order(order_data)
+            if not combined_order:
+                return False
+            
+            product_order_id = combined_order.get('productOrderId')
+            
+            # Slack 메시지 전송
+            message = OrderMessageTemplate.create_order_message(combined_order)
+            if self.slack_manager.send_order_notification(message):
+                self.logger.info("주문 알림 전송 성공: %s", product_order_id)
+                self.notified_order_ids.add(product_order_id)
+                return True
+            
+            self.logger.error(f"주문 알림 전송 실패: {product_order_id}")
+            return False
             
-            # 주문별 알림 전송
-            for order_data in order_details.get('data', []):
-                try:
-                    product_order = order_data.get('productOrder', {})
-                    order_info = order_data.get('order', {})
-                    
-                    if not product_order:
-                        continue
-                    
-                    product_order_id = product_order.get('productOrderId')
-                    
-                    # 주문 정보와 주문자 정보 결합
-                    combined_order = {
-                        **product_order,
-                        'orderer': {
-                            'name': order_info.get('ordererName'),
-                            'tel': order_info.get('ordererTel'),
-                            'orderDate': order_info.get('orderDate')
-                        }
-                    }
-                    
-                    # Slack 메시지 전송
-                    message = OrderMessageTemplate.create_order_message(combined_order)
-                    if self.slack_manager.send_order_notification(message):
-                        self.logger.info(f"주문 알림 전송 성공: {product_order_id}")
-                        self.notified_order_ids.add(product_order_id)
-                    else:
-                        self.logger.error(f"주문 알림 전송 실패: {product_order_id}")
-                        
-                except Exception as e:
-                    self.logger.error(f"주문 처리 중 오류: {str(e)}")
-                    continue
-                    
         except Exception as e:
-            self.logger.error(f"주문 처리 중 오류 발생: {str(e)}", exc_info=True)
\ No newline at end of file
+            self.logger.error(f"주문 처리 중 오류: {str(e)}")
+            return False
@@ -1,64 +1,115 @@
 import csv
+import os
+import threading
 from datetime import datetime
+from .utils import setup_logging
+
+CSV_FIELDNAMES = ['주문ID', '주문일자', '주문자 이름', '주문자 전화번호', '상품명', '상품 옵션']
 
 class CSVManager:
     def __init__(self, filename='order.csv'):
         self.filename = filename
+        self.index_filename = f"{filename}.idx"
+        self.logger = setup_logging()
+        self._lock = threading.Lock()
+        # 주문 ID 색인 (시작 시 한 번만 구성)
+        self.order_ids = self._load_index()
     
-    def is_order_id_in_csv(self, order_id):
-        # 주어진 주문 ID가 이미 CSV 파일에 있는지 확인합니다.
+    def _load_index(self):
+        # 색인 파일이 CSV 파일보다 최신이면 색인 파일을, 아니면 CSV 파일을 읽어 색인을 구성합니다.
+        if not os.path.exists(self.filename):
+            # CSV 파일이 삭제되었으면 남아 있는 색인 파일도 삭제 (이전 주문 ID로 새 주문을 건너뛰지 않도록)
+            if os.path.exists(self.index_filename):
+                try:
+                    os.remove(self.index_filename)
+                    self.logger.info(f"CSV 파일이 없어 이전 색인 파일 삭제: {self.index_filename}")
+                except OSError as e:
+                    self.logger.error(f"이전 색인 파일 삭제 중 오류 발생: {str(e)}", exc_info=True)
+            return set()
+
+        if os.path.exists(self.index_filename) and \
+                os.path.getmtime(self.index_filename) >= os.path.getmtime(self.filename):
+            with open(self.index_filename, 'r', encoding='utf-8') as index_file:
+                return {line.rstrip('\n') for line in index_file if line.strip()}
+        
+        return self.rebuild_index()
+    
+    def rebuild_index(self):
+        # CSV 파일 전체를 읽어 색인 파일을 다시 만듭니다.
+        order_ids = set()
         try:
             with open(self.filename, 'r', encoding='utf-8') as csvfile:
                 reader = csv.reader(csvfile)
+                next(reader, None)  # 헤더 제외
                 for row in reader:
-                    if row and row[0] == order_id:
-                        return True
+                    if row:
+                        order_ids.add(row[0])
         except FileNotFoundError:
-            return False  # 파일이 없는 경우 False 반환
+            return order_ids
+        
+        tmp_filename = f"{self.index_filename}.tmp"
+        with open(tmp_filename, 'w', encoding='utf-8') as index_file:
+            index_file.writelines(f"{order_id}\n" for order_id in order_ids)
+        os.replace(tmp_filename, self.index_filename)
+        
+        self.logger.info(f"CSV 주문 색인 생성 완료: {len(order_ids)}건")
+        self.order_ids = order_ids
+        return order_ids
+    
+    def is_order_id_in_csv(self, order_id):
+        # 주어진 주문 ID가 이미 CSV 파일에 있는지 확인합니다.
+        return str(order_id) in self.order_ids
 
-        return False
+    @staticmethod
+    def _build_row(order_id, order_detail):
+        # 주문 정보 추출
+        order_date = order_detail['order']['orderDate']
+        
+        # 주문일자를 datetime 객체로 변환
+        datetime_obj = datetime.strptime(order_date, "%Y-%m-%dT%H:%M:%S.%f%z")
+        formatted_order_date = datetime_obj.strftime("%Y-%m-%d %H:%M:%S")
+        
+        return {
+            '주문ID': order_id,
+            '주문일자': formatted_order_date,
+            '주문자 이름': order_detail['order']['ordererName'],
+            '주문자 전화번호': order_detail['order']['ordererTel'],
+            '상품명': order_detail['productOrder']['productName'],
+            '상품 옵션': order_detail['productOrder']['productOption']
+        }
 
     def write_order_to_csv(self, order_details):
-
-        for order_detail in order_details:
-            order_id = str(order_detail['productOrder']['productOrderId'])
+        # 새로운 주문만 모아 파일을 한 번 열어서 기록하고, 기록한 건수를 반환합니다.
+        with self._lock:
+            rows = []
+            new_order_ids = {}  # 기록 순서를 유지하는 배치 내 중복 확인용
+            for order_detail in order_details:
+                order_id = str(order_detail['productOrder']['productOrderId'])
+                
+                # 주문 ID가 이미 CSV에 있다면, 기록하지 않습니다.
+                if order_id in self.order_ids or order_id in new_order_ids:
+                    continue
+                
+                rows.append(self._build_row(order_id, order_detail))
+                new_order_ids[order_id] = None
             
-            # 주문 ID가 이미 CSV에 있다면, 기록하지 않습니다.
-            if self.is_order_id_in_csv(order_id):
-                return
-
-            # 파일 존재 여부 체크 및 없을 경우 새 파일 생성
-            try:
-                with open(self.filename, 'r', encoding='utf-8') as csvfile:
-                    pass
-            except FileNotFoundError:
-                with open(self.filename, 'w', newline='', encoding='utf-8') as csvfile:
-                    writer = csv.writer(csvfile)
-                    writer.writerow(['주문ID', '주문일자', '주문자 이름', '주문자 전화번호', '상품명', '상품 옵션'])
-
+            if not rows:
+                return 0
+            
+            # 파일이 없거나 비어 있으면 헤더부터 기록
+            write_header = not os.path.exists(self.filename) or os.path.getsize(self.filename) == 0
             with open(self.filename, 'a', newline='', encoding='utf-8') as csvfile:
-                fieldnames = ['주문ID', '주문일자', '주문자 이름', '주문자 전화번호', '상품명', '상품 옵션']
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-
-                # 주문 정보 추출
-                order_date = order_detail['order']['orderDate']
-                orderer_name = order_detail['order']['ordererName']
-                orderer_tel = order_detail['order']['ordererTel']
-                product_name = order_detail['productOrder']['productName']
-                product_option = order_detail['productOrder']['productOption']
-
-                # 주문일자를 datetime 객체로 변환
-                datetime_obj = datetime.strptime(order_date, "%Y-%m-%dT%H:%M:%S.%f%z")
-                formatted_order_date = datetime_obj.strftime("%Y-%m-%d %H:%M:%S")
-                # CSV 파일에 기록
-                writer.writerow({
-                    '주문ID': order_id,
-                    '주문일자': formatted_order_date,
-                    '주문자 이름': orderer_name,
-                    '주문자 전화번호': orderer_tel,
-                    '상품명': product_name,
-                    '상품 옵션': product_option
-            })
+                writer = csv.DictWriter(csvfile, fieldnames=CSV_FIELDNAMES)
+                if write_header:
+                    writer.writeheader()
+                writer.writerows(rows)
+            
+            # CSV 기록 후 색인 파일에 추가 (색인 파일이 항상 CSV보다 최신이 되도록)
+            with open(self.index_filename, 'a', encoding='utf-8') as index_file:
+                index_file.writelines(f"{order_id}\n" for order_id in new_order_ids)
+            
+            self.order_ids.update(new_order_ids)
+            return len(rows)
 
 # ##############################################################################
 # # 사용 예시
@@ -1,34 +1,62 @@
-# 
-import requests
+# order_kakao.py
 import hashlib
 import hmac
 import base64
 import json
 import time
-from .utils import load_config
+from concurrent.futures import ThreadPoolExecutor
+from .utils import load_config, setup_logging
+from .config_service import get_config_service
+from .http_client import get_http_client
+from .resilience import CircuitOpenError
+from .rate_limit import RateLimiter
+from .kakao_templates import KakaoTemplateRegistry
+
+# 알림톡 요청 1건당 최대 메시지 수
+MAX_MESSAGES_PER_REQUEST = 100
 
 class KakaoTalkManager:
-    def __init__(self):
+    def __init__(self, http_client=None, template_registry=None):
         config = load_config()
+        self.http_client = http_client or get_http_client(config)
+        self.logger = setup_logging()
+        self.apply_config(config)
+
+        # 템플릿은 시작 시 한 번만 로드/검증
+        self.templates = template_registry or KakaoTemplateRegistry.from_config(config)
+
+        # 설정 파일이 바뀌면 인증 정보를 다시 적용
+        get_config_service().subscribe(self.apply_config)
+
+    def apply_config(self, config):
         self.access_key = config["ACCESS_KEY"]
         self.secret_key = config["SECRET_KEY"]
         self.service_id = config["KAKAO_SERVICE_ID"]
-        self.api_url = f"https://sens.apigw.ntruss.com/alimtalk/v2/services/{self.service_id}/messages"
+        self.plus_friend_id = config.get("KAKAO_PLUS_FRIEND_ID", "@minimalstudio")
+        base_url = config.get("KAKAO_BASE_URL", "https://sens.apigw.ntruss.com").rstrip('/')
+        self.api_url = f"{base_url}/alimtalk/v2/services/{self.service_id}/messages"
+        self.bulk_max_workers = int(config.get("KAKAO_BULK_MAX_WORKERS", 4))
+        self.bulk_rate_per_second = float(config.get("KAKAO_BULK_RATE_PER_SECOND", 10))
+
+        # 서명에 쓰이는 고정 값은 한 번만 계산
+        self._signature_prefix = f"POST /alimtalk/v2/services/{self.service_id}/messages\n"
+        self._secret_key_bytes = bytes(self.secret_key, 'UTF-8')
+
+    def close(self):
+        """설정 변경 구독 해제"""
+        get_config_service().unsubscribe(self.apply_config)
 
     def _make_signature(self, timestamp):
-        method = "POST"
-        uri = f"/alimtalk/v2/services/{self.service_id}/messages"
-        message = method + " " + uri + "\n" + timestamp + "\n" + self.access_key
+        message = self._signature_prefix + timestamp + "\n" + self.access_key
         message = bytes(message, 'UTF-8')
-        secret_key_bytes = bytes(self.secret_key, 'UTF-8')
-        
-        signature = base64.b64encode(hmac.new(secret_key_bytes, message, digestmod=hashlib.sha256).digest())
+
+        signature = base64.b64encode(hmac.new(self._secret_key_bytes, message, digestmod=hashlib.sha256).digest())
         return signature.decode('UTF-8')
 
     def _get_headers(self):
         timestamp = str(int(time.time() * 1000))
         signature = self._make_signature(timestamp)
-        
+
         return {
             "Content-Type": "application/json; charset=utf-8",
             "x-ncp-apigw-timestamp": timestamp,
@@ -39,57 +67,100 @@ class KakaoTalkManager:
 
     def send_kakao_talk(self, to_number, template_code, template_args):
         headers = self._get_headers()
-        content = (
-            f"안녕하세요, {template_args['고객명']}님!\n\n"
-            "네이버에서 유일하게 틴더 공식 발급 한국 코드를 유통하는 저희 미니멀 스튜디오를 믿고 구매해주셔서 감사합니다.\n\n"
-            f"▶ 프로모션 코드\n{template_args['쿠폰코드']}\n\n"
-            "▶ 사용 방법:\n"
-            "1. www.tinder.com에 로그인합니다.\n"
-            "(*전화번호 및 이메일 로그인)\n"
-            "2. www.tinder.com/vip/codehere 페이지에서 코드를 등록합니다.\n"
-            "(프로모션코드 등록으로 가셔도 됩니다)\n\n"
-            "코드 등록 시 오류가 발생하면, 스크린샷과 함께 문의해주시면 확인 즉시 해결해드리겠습니다.\n\n"
-            "구매해주셔서 감사합니다!다음에 또 필요하면 연락주세요, 부쩍 추워진 요즘 건강유의하시고 좋은하루보내세요!\n\n"
-            "실례가안된다면, 번거로우실수도 있지만 리뷰 부탁드리겠습니다.\n"
-            "저희 스마트스토어에 큰 힘이됩니다!\n\n"
-            "감사합니다."
-        )
-
         data = {
-            "plusFriendId": "@minimalstudio",
+            "plusFriendId": self.plus_friend_id,
             "templateCode": template_code,
             "messages": [
-                {
-                    "to": to_number,
-                    "content": content,
-                    "buttons": [
-                        {
-                            "type": "WL",
-                            "name": "틴더 바로가기",
-                            "linkMobile": "https://tinder.com/",
-                            "linkPc": "https://tinder.com/"
-                        },
-                        {
-                            "type": "WL",
-                            "name": "미니멀 스튜디오 바로가기",
-                            "linkMobile": "https://m.smartstore.naver.com/minimalstudio",
-                            "linkPc": "https://smartstore.naver.com/minimalstudio"
-                        }
-                    ]
-                }
+                self.templates.render_message(template_code, to_number, template_args)
             ]
         }
 
-        response = requests.post(self.api_url, headers=headers, data=json.dumps(data))
+        response = self.http_client.post(self.api_url, headers=headers, data=json.dumps(data), endpoint='sens.alimtalk')
         return response.json()
 
-# 사용 예시
-kakao_manager = KakaoTalkManager()
-template_args = {
-    "고객명": "윤혁",
-    "쿠폰코드": "12345678"
-}
+    def send_many(self, template_code, recipients, max_workers=None, rate_per_second=None):
+        """같은 템플릿의 알림톡을 여러 수신자에게 일괄 발송
+
+        recipients: (전화번호, 템플릿 변수 dict) 목록
+        요청당 최대 100건씩 묶어 max_workers개 스레드로 동시에 보내되, 초당 rate_per_second 요청을 넘지 않습니다.
+        수신자별 결과 목록 [{"to", "success", "requestId", "statusCode", "error"}]을 수신자 순서대로 반환합니다.
+        """
+        messages = [
+            self.templates.render_message(template_code, to_number, template_args)
+            for to_number, template_args in recipients
+        ]
+
+        if not messages:
+            return []
+
+        chunks = [
+            messages[i:i + MAX_MESSAGES_PER_REQUEST]
+            for i in range(0, len(messages), MAX_MESSAGES_PER_REQUEST)
+        ]
+        rate_limiter = RateLimiter(rate_per_second or self.bulk_rate_per_second)
+
+        def send_chunk(chunk):
+            rate_limiter.acquire()
+            return self._send_chunk(template_code, chunk)
+
+        max_workers = min(max_workers or self.bulk_max_workers, len(chunks))
+        if max_workers <= 1:
+            chunk_results = [send_chunk(chunk) for chunk in chunks]
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                chunk_results = list(executor.map(send_chunk, chunks))
+
+        results = [result for chunk_result in chunk_results for result in chunk_result]
+        success_count = sum(1 for result in results if result["success"])
+        self.logger.info(f"알림톡 일괄 발송 완료: {success_count}/{len(results)}건 ({len(chunks)}회 요청)")
+        return results
+
+    def _send_chunk(self, template_code, messages):
+        """메시지 묶음 하나를 한 번의 요청으로 발송하고 수신자별 결과 반환"""
+        data = {
+            "plusFriendId": self.plus_friend_id,
+            "templateCode": template_code,
+            "messages": messages
+        }
+
+        body, response = {}, None
+        try:
+            response = self.http_client.post(self.api_url, headers=self._get_headers(), data=json.dumps(data), endpoint='sens.alimtalk')
+        except CircuitOpenError as e:
+            self.logger.warning(f"알림톡 일괄 발송 생략: {str(e)}")
+            success, error = False, str(e)
+        except Exception as e:
+            self.logger.error(f"알림톡 일괄 발송 중 오류: {str(e)}", exc_info=True)
+            success, error = False, str(e)
+        else:
+            # 프록시의 HTML 오류 페이지처럼 JSON이 아닌 응답이어도 응답 코드는 결과에 남김
+            try:
+                body = response.json() if response.text else {}
+            except ValueError:
+                self.logger.warning(f"알림톡 발송 응답을 해석할 수 없습니다 (응답 코드 {response.status_code})")
+            if not isinstance(body, dict):
+                body = {}
+            success = response.status_code == 202
+            error = None if success else body.get("errorMessage") or body.get("error") or response.text
+
+        return [
+            {
+                "to": message["to"],
+                "success": success,
+                "requestId": body.get("requestId"),
+                "statusCode": body.get("statusCode") or (response.status_code if response is not None else None),
+                "error": error
+            }
+            for message in messages
+        ]
 
-phone_number = "01053698401"
-response = kakao_manager.send_kakao_talk(phone_number, "TindercodeReviewNoEmoji", template_args)
-print(response)
\ No newline at end of file
+# # 사용 예시
+# kakao_manager = KakaoTalkManager()
+# template_args = {
+#     "고객명": "윤혁",
+#     "쿠폰코드": "12345678"
+# }
+#
+# phone_number = "01053698401"
+# response = kakao_manager.send_kakao_talk(phone_number, "TindercodeReviewNoEmoji", template_args)
+# print(response)
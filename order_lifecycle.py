@@ -0,0 +1,286 @@
+# order_lifecycle.py
+import sqlite3
+import threading
+import time
+from .cursor_store import parse_changed_date
+from .metrics import get_metrics
+from .utils import setup_logging
+
+# 주문 상태 (DB에는 목록의 위치를 정수 코드로 저장)
+STATES = (
+    'UNKNOWN',
+    'PAYMENT_WAITING',
+    'PAYED',
+    'DELIVERING',
+    'DELIVERED',
+    'PURCHASE_DECIDED',
+    'CANCEL_REQUESTED',
+    'CANCELED',
+    'RETURN_REQUESTED',
+    'RETURNED',
+    'EXCHANGE_REQUESTED',
+    'EXCHANGED',
+)
+STATE_CODES = {state: code for code, state in enumerate(STATES)}
+
+# 상품주문 상태(productOrderStatus) -> 주문 상태
+STATUS_STATES = {
+    'PAYMENT_WAITING': 'PAYMENT_WAITING',
+    'PAYED': 'PAYED',
+    'DELIVERING': 'DELIVERING',
+    'DELIVERED': 'DELIVERED',
+    'PURCHASE_DECIDED': 'PURCHASE_DECIDED',
+    'EXCHANGED': 'EXCHANGED',
+    'CANCELED': 'CANCELED',
+    'RETURNED': 'RETURNED',
+    'CANCELED_BY_NOPAYMENT': 'CANCELED',
+}
+# 처리 중인 클레임이 있어도 우선하는 완료 상태
+FINAL_STATES = {'PURCHASE_DECIDED', 'EXCHANGED', 'CANCELED', 'RETURNED'}
+
+# 처리 중인 클레임 유형(claimType) -> 주문 상태
+CLAIM_STATES = {
+    'CANCEL': 'CANCEL_REQUESTED',
+    'ADMIN_CANCEL': 'CANCEL_REQUESTED',
+    'RETURN': 'RETURN_REQUESTED',
+    'EXCHANGE': 'EXCHANGE_REQUESTED',
+}
+
+# 상품주문 상태가 없는 응답에서 변경 구분(lastChangedType) -> 주문 상태
+CHANGED_TYPE_STATES = {
+    'PAY_WAITING': 'PAYMENT_WAITING',
+    'PAYED': 'PAYED',
+    'DISPATCHED': 'DELIVERING',
+    'PURCHASE_DECIDED': 'PURCHASE_DECIDED',
+}
+
+# 정상적인 상태 전이 (그 밖의 전이도 API 응답을 따르되 경고 로그를 남김)
+ALLOWED_TRANSITIONS = {
+    'UNKNOWN': set(STATES),
+    'PAYMENT_WAITING': {'PAYED', 'CANCELED'},
+    'PAYED': {'DELIVERING', 'DELIVERED', 'CANCEL_REQUESTED', 'CANCELED', 'PURCHASE_DECIDED'},
+    'DELIVERING': {'DELIVERED', 'RETURN_REQUESTED', 'EXCHANGE_REQUESTED', 'PURCHASE_DECIDED', 'CANCELED'},
+    'DELIVERED': {'PURCHASE_DECIDED', 'RETURN_REQUESTED', 'EXCHANGE_REQUESTED', 'RETURNED', 'EXCHANGED'},
+    'CANCEL_REQUESTED': {'CANCELED', 'PAYED', 'DELIVERING'},
+    'RETURN_REQUESTED': {'RETURNED', 'DELIVERING', 'DELIVERED', 'PURCHASE_DECIDED'},
+    'EXCHANGE_REQUESTED': {'EXCHANGED', 'DELIVERING', 'DELIVERED', 'PURCHASE_DECIDED'},
+    'EXCHANGED': {'PURCHASE_DECIDED', 'RETURN_REQUESTED', 'EXCHANGE_REQUESTED'},
+    'PURCHASE_DECIDED': set(),
+    'CANCELED': set(),
+    'RETURNED': set(),
+}
+
+# 더 이상 바뀌지 않는 상태 (보관 기간이 지나면 기록 삭제)
+TERMINAL_STATES = {state for state, next_states in ALLOWED_TRANSITIONS.items() if not next_states}
+
+# SQLite 한 쿼리의 최대 파라미터 수보다 작게 나누어 조회
+LOOKUP_CHUNK_SIZE = 500
+
+# 종료 상태 주문 기록 보관 기간과 정리 주기 (초)
+DEFAULT_RETENTION_SECONDS = 30 * 24 * 60 * 60
+PRUNE_INTERVAL_SECONDS = 60 * 60
+
+
+def _claim_closed(claim_status):
+    """클레임이 완료/거부/철회되었는지 여부 (수거 완료 COLLECT_DONE은 처리 중)"""
+    if claim_status.endswith(('_REJECT', '_WITHDRAW')):
+        return True
+    return claim_status.endswith('_DONE') and claim_status != 'COLLECT_DONE'
+
+
+def derive_state(change):
+    """변경 주문 목록(lastChangeStatuses) 항목의 주문 상태, 알 수 없으면 None"""
+    status_state = STATUS_STATES.get(change.get('productOrderStatus'))
+    if status_state in FINAL_STATES:
+        return status_state
+
+    claim_state = CLAIM_STATES.get(change.get('claimType'))
+    claim_status = change.get('claimStatus') or ''
+    if claim_state and claim_status and not _claim_closed(claim_status):
+        return claim_state
+
+    return status_state or CHANGED_TYPE_STATES.get(change.get('lastChangedType'))
+
+
+def _changed_at_ms(change):
+    changed_at = parse_changed_date(change.get('lastChangedDate'))
+    return int(changed_at.timestamp() * 1000) if changed_at else 0
+
+
+class OrderLifecycle:
+    """상품주문별 상태 기록과 상태 전이 이벤트
+
+    여러 변경 구분(결제, 발송, 취소/반품/교환 요청, 구매 확정)의 조회 결과를 받아
+    상품주문별 현재 상태를 (상태 코드, 변경 일시 ms) 한 행으로 SQLite에 저장하고,
+    상태가 바뀐 주문은 이벤트로 구독자에게 전달합니다.
+    이미 저장된 변경 일시보다 이전 변경(겹침 구간의 재조회, 늦게 도착한 다른 구분의 결과)은 무시합니다.
+    구매 확정/취소/반품 완료처럼 더 이상 바뀌지 않는 주문은 변경 후 retention_seconds 초가 지나면 삭제합니다.
+    """
+
+    def __init__(self, filename='order_lifecycle.db', retention_seconds=DEFAULT_RETENTION_SECONDS):
+        self.filename = filename
+        self.retention_seconds = retention_seconds
+        self.logger = setup_logging()
+        self._last_prune_at = None
+        self._lock = threading.Lock()
+        self._handlers = []
+        self._conn = sqlite3.connect(filename, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS order_states ("
+            "product_order_id TEXT PRIMARY KEY, "
+            "state INTEGER NOT NULL, "
+            "changed_at INTEGER NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self._conn.commit()
+
+    @classmethod
+    def from_config(cls, config):
+        """설정값으로 생성 (ORDER_LIFECYCLE_FILE, ORDER_LIFECYCLE_RETENTION_DAYS)"""
+        config = config or {}
+        return cls(
+            config.get('ORDER_LIFECYCLE_FILE', 'order_lifecycle.db'),
+            retention_seconds=float(config.get('ORDER_LIFECYCLE_RETENTION_DAYS', 30)) * 24 * 60 * 60,
+        )
+
+    def subscribe(self, handler):
+        """상태 전이 이벤트 구독 (handler(events), events는 이벤트 dict 목록)"""
+        self._handlers.append(handler)
+
+    def _load_states(self, product_order_ids):
+        states = {}
+        for i in range(0, len(product_order_ids), LOOKUP_CHUNK_SIZE):
+            chunk = product_order_ids[i:i + LOOKUP_CHUNK_SIZE]
+            rows = self._conn.execute(
+                f"SELECT product_order_id, state, changed_at FROM order_states "
+                f"WHERE product_order_id IN ({','.join('?' * len(chunk))})",
+                chunk
+            ).fetchall()
+            for product_order_id, state, changed_at in rows:
+                states[product_order_id] = (state, changed_at)
+        return states
+
+    def apply_changes(self, changes, store_id=None):
+        """변경 주문 목록을 반영하고 상태 전이 이벤트 목록 반환"""
+        candidates = []
+        for change in changes or []:
+            state = derive_state(change)
+            product_order_id = change.get('productOrderId')
+            if state is None or not product_order_id:
+                continue
+            candidates.append((_changed_at_ms(change), str(product_order_id), STATE_CODES[state], change))
+        if not candidates:
+            return []
+
+        # 한 번에 받은 같은 주문의 여러 변경은 변경 일시 순서대로 반영
+        candidates.sort(key=lambda candidate: candidate[0])
+        events = []
+        try:
+            with self._lock:
+                current = self._load_states(list({candidate[1] for candidate in candidates}))
+                updates = {}
+                for changed_at, product_order_id, state, change in candidates:
+                    previous_state, previous_changed_at = current.get(product_order_id, (0, -1))
+                    if changed_at < previous_changed_at:
+                        continue
+                    current[product_order_id] = (state, changed_at)
+                    updates[product_order_id] = (product_order_id, state, changed_at)
+                    if state != previous_state:
+                        events.append(self._make_event(change, previous_state, state, store_id))
+
+                if updates:
+                    with self._conn:
+                        self._conn.executemany(
+                            "INSERT INTO order_states (product_order_id, state, changed_at) VALUES (?, ?, ?) "
+                            "ON CONFLICT(product_order_id) DO UPDATE SET "
+                            "state = excluded.state, changed_at = excluded.changed_at",
+                            list(updates.values())
+                        )
+        except Exception as e:
+            self.logger.error(f"주문 상태 저장 중 오류 발생: {str(e)}", exc_info=True)
+            return []
+
+        self.prune_if_due()
+        if events:
+            self._emit(events)
+        return events
+
+    def prune(self, now=None):
+        """보관 기간이 지난 종료 상태 주문 기록 삭제, 삭제 건수 반환"""
+        now = time.time() if now is None else now
+        expire_before_ms = int((now - self.retention_seconds) * 1000)
+        codes = [STATE_CODES[state] for state in TERMINAL_STATES]
+        with self._lock:
+            with self._conn:
+                cursor = self._conn.execute(
+                    f"DELETE FROM order_states WHERE state IN ({','.join('?' * len(codes))}) AND changed_at < ?",
+                    [*codes, expire_before_ms]
+                )
+        return cursor.rowcount
+
+    def prune_if_due(self):
+        """마지막 정리 후 PRUNE_INTERVAL_SECONDS가 지났으면 prune() 실행"""
+        now = time.monotonic()
+        if self._last_prune_at is not None and now - self._last_prune_at < PRUNE_INTERVAL_SECONDS:
+            return 0
+        self._last_prune_at = now
+        try:
+            pruned = self.prune()
+        except Exception as e:
+            self.logger.error(f"주문 상태 기록 정리 중 오류 발생: {str(e)}", exc_info=True)
+            return 0
+        if pruned:
+            self.logger.info(f"종료된 주문 상태 기록 {pruned}건 정리")
+        return pruned
+
+    def _make_event(self, change, previous_state, state, store_id):
+        from_state, to_state = STATES[previous_state], STATES[state]
+        if to_state not in ALLOWED_TRANSITIONS[from_state]:
+            self.logger.warning(
+                "예상하지 못한 주문 상태 전이: %s %s -> %s", change.get('productOrderId'), from_state, to_state
+            )
+        event = {
+            'productOrderId': str(change.get('productOrderId')),
+            'orderId': change.get('orderId'),
+            'fromState': from_state,
+            'toState': to_state,
+            'lastChangedType': change.get('lastChangedType'),
+            'lastChangedDate': change.get('lastChangedDate'),
+        }
+        if store_id:
+            event['storeId'] = store_id
+        return event
+
+    def _emit(self, events):
+        counter = get_metrics().counter('order_lifecycle_transitions_total', '주문 상태 전이 수')
+        for event in events:
+            counter.inc(from_state=event['fromState'], to_state=event['toState'])
+            self.logger.debug(
+                "주문 상태 변경: %s %s -> %s", event['productOrderId'], event['fromState'], event['toState']
+            )
+
+        for handler in list(self._handlers):
+            try:
+                handler(events)
+            except Exception as e:
+                self.logger.error(f"주문 상태 이벤트 처리 중 오류 발생: {str(e)}", exc_info=True)
+
+    def get_state(self, product_order_id):
+        """상품주문의 현재 상태 이름, 기록이 없으면 None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT state FROM order_states WHERE product_order_id = ?", (str(product_order_id),)
+            ).fetchone()
+        return STATES[row[0]] if row else None
+
+    def count_by_state(self):
+        """상태별 주문 수"""
+        with self._lock:
+            rows = self._conn.execute("SELECT state, COUNT(*) FROM order_states GROUP BY state").fetchall()
+        return {STATES[state]: count for state, count in rows}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
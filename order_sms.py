@@ -1,27 +1,50 @@
 # order_sms.py
-import requests
 import hashlib
 import hmac
 import base64
 import json
 import time
-from .utils import load_config
+from concurrent.futures import ThreadPoolExecutor
+from .utils import load_config, setup_logging
+from .config_service import get_config_service
+from .http_client import get_http_client
+from .resilience import CircuitOpenError
+from .rate_limit import RateLimiter
+
+# SENS 요청 1건당 최대 수신자 수
+MAX_RECIPIENTS_PER_REQUEST = 100
 
 class SMSManager:
-    def __init__(self):
+    def __init__(self, http_client=None):
         config = load_config()
+        self.http_client = http_client or get_http_client(config)
+        self.logger = setup_logging()
+        self.apply_config(config)
+        
+        # 설정 파일이 바뀌면 인증 정보/발송 설정을 다시 적용
+        get_config_service().subscribe(self.apply_config)
+
+    def apply_config(self, config):
         self.access_key = config["ACCESS_KEY"]
         self.secret_key = config["SECRET_KEY"]
         self.api_url = config["SMS_BASE_URL"].rstrip('/') + '/' + config["SMS_API_URL"].lstrip('/')
+        self.bulk_max_workers = int(config.get("SMS_BULK_MAX_WORKERS", 4))
+        self.bulk_rate_per_second = float(config.get("SMS_BULK_RATE_PER_SECOND", 10))
+        
+        # 서명에 쓰이는 고정 값은 한 번만 계산
+        uri = "/" + "/".join(self.api_url.split('/')[3:])  # API URL에서 호스트를 제외한 URI 부분을 추출합니다.
+        self._signature_prefix = "POST " + uri + "\n"
+        self._secret_key_bytes = bytes(self.secret_key, 'UTF-8')
+
+    def close(self):
+        """설정 변경 구독 해제"""
+        get_config_service().unsubscribe(self.apply_config)
 
     def _make_signature(self, timestamp):
-        method = "POST"
-        uri = "/" + "/".join(self.api_url.split('/')[3:])  # API URL에서 호스트를 제외한 URI 부분을 추출합니다.
-        message = method + " " + uri + "\n" + timestamp + "\n" + self.access_key
+        message = self._signature_prefix + timestamp + "\n" + self.access_key
         message = bytes(message, 'UTF-8')
-        secret_key_bytes = bytes(self.secret_key, 'UTF-8')
         
-        signature = base64.b64encode(hmac.new(secret_key_bytes, message, digestmod=hashlib.sha256).digest())
+        signature = base64.b64encode(hmac.new(self._secret_key_bytes, message, digestmod=hashlib.sha256).digest())
         return signature.decode('UTF-8')
 
     def _get_headers(self):
@@ -51,9 +74,90 @@ class SMSManager:
             ]
         }
 
-        response = requests.post(self.api_url, headers=headers, data=json.dumps(data))
+        response = self.http_client.post(self.api_url, headers=headers, data=json.dumps(data), endpoint='sens.sms')
         return response.json()
 
+    def send_bulk(self, from_number, recipients, content=None, message_type="SMS", max_workers=None, rate_per_second=None):
+        """여러 수신자에게 SMS 일괄 발송
+
+        recipients: 전화번호 문자열 또는 {"to": ..., "content": ...} 목록 (content가 없으면 공통 content 사용)
+        요청당 최대 100명씩 묶어 max_workers개 스레드로 동시에 보내되, 초당 rate_per_second 요청을 넘지 않습니다.
+        수신자별 결과 목록 [{"to", "success", "requestId", "statusCode", "error"}]을 수신자 순서대로 반환합니다.
+        """
+        messages = []
+        for recipient in recipients:
+            message = {"to": recipient} if isinstance(recipient, str) else dict(recipient)
+            if content is None and not message.get("content"):
+                raise ValueError(f"발송 내용이 없습니다: {message.get('to')}")
+            messages.append(message)
+        
+        if not messages:
+            return []
+        
+        chunks = [
+            messages[i:i + MAX_RECIPIENTS_PER_REQUEST]
+            for i in range(0, len(messages), MAX_RECIPIENTS_PER_REQUEST)
+        ]
+        rate_limiter = RateLimiter(rate_per_second or self.bulk_rate_per_second)
+        
+        def send_chunk(chunk):
+            rate_limiter.acquire()
+            return self._send_chunk(from_number, chunk, content, message_type)
+        
+        max_workers = min(max_workers or self.bulk_max_workers, len(chunks))
+        if max_workers <= 1:
+            chunk_results = [send_chunk(chunk) for chunk in chunks]
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                chunk_results = list(executor.map(send_chunk, chunks))
+        
+        results = [result for chunk_result in chunk_results for result in chunk_result]
+        success_count = sum(1 for result in results if result["success"])
+        self.logger.info(f"SMS 일괄 발송 완료: {success_count}/{len(results)}건 ({len(chunks)}회 요청)")
+        return results
+
+    def _send_chunk(self, from_number, messages, content, message_type):
+        """수신자 묶음 하나를 한 번의 요청으로 발송하고 수신자별 결과 반환"""
+        data = {
+            "type": message_type,
+            "contentType": "COMM",
+            "countryCode": "82",
+            "from": from_number,
+            "content": content if content is not None else messages[0]["content"],
+            "messages": messages
+        }
+        
+        body, response = {}, None
+        try:
+            response = self.http_client.post(self.api_url, headers=self._get_headers(), data=json.dumps(data), endpoint='sens.sms')
+        except CircuitOpenError as e:
+            self.logger.warning(f"SMS 일괄 발송 생략: {str(e)}")
+            success, error = False, str(e)
+        except Exception as e:
+            self.logger.error(f"SMS 일괄 발송 중 오류: {str(e)}", exc_info=True)
+            success, error = False, str(e)
+        else:
+            # 프록시의 HTML 오류 페이지처럼 JSON이 아닌 응답이어도 응답 코드는 결과에 남김
+            try:
+                body = response.json() if response.text else {}
+            except ValueError:
+                self.logger.warning(f"SMS 발송 응답을 해석할 수 없습니다 (응답 코드 {response.status_code})")
+            if not isinstance(body, dict):
+                body = {}
+            success = response.status_code == 202
+            error = None if success else body.get("errorMessage") or body.get("error") or response.text
+        
+        return [
+            {
+                "to": message["to"],
+                "success": success,
+                "requestId": body.get("requestId"),
+                "statusCode": body.get("statusCode") or (response.status_code if response is not None else None),
+                "error": error
+            }
+            for message in messages
+        ]
+
 # # SMSManager 클래스 인스턴스를 생성합니다.
 # sms_client = SMSManager()
 # from_number = "01053698401"  # 보내는 번호
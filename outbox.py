@@ -0,0 +1,363 @@
+# outbox.py
+import json
+import random
+import sqlite3
+import threading
+import time
+from .utils import setup_logging
+
+STATUS_PENDING = 'pending'
+STATUS_IN_FLIGHT = 'in_flight'
+STATUS_DONE = 'done'
+STATUS_DEAD = 'dead'
+
+# 전송 완료 항목 보관 기간
+DONE_RETENTION_SECONDS = 7 * 24 * 60 * 60
+# 전송 완료 항목 정리 주기
+PURGE_INTERVAL_SECONDS = 60 * 60
+
+
+class Outbox:
+    """SQLite 기반 알림 발송 대기열
+
+    주문 조회 쪽에서 알림을 추가하고, OutboxDispatcher가 채널별로 꺼내 전송합니다.
+    (channel, dedup_key)가 같은 항목은 한 번만 추가되며, 비정상 종료 시 전송 중이던 항목은
+    다음 시작 때 다시 대기 상태가 됩니다.
+    """
+
+    def __init__(self, filename='order_outbox.db'):
+        self.filename = filename
+        self.logger = setup_logging()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(filename, check_same_thread=False)
+        self._create_schema()
+        self._recover_in_flight()
+
+    def _create_schema(self):
+        with self._lock:
+            conn = self._conn
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS outbox ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "channel TEXT NOT NULL, "
+                "dedup_key TEXT, "
+                "payload TEXT NOT NULL, "
+                "status TEXT NOT NULL, "
+                "attempts INTEGER NOT NULL DEFAULT 0, "
+                "next_attempt_at REAL NOT NULL, "
+                "created_at REAL NOT NULL, "
+                "updated_at REAL NOT NULL, "
+                "last_error TEXT, "
+                "UNIQUE (channel, dedup_key))"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (channel, status, next_attempt_at)"
+            )
+            conn.commit()
+
+    def _recover_in_flight(self):
+        """이전 실행에서 전송 중이던 항목을 대기 상태로 되돌림"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE outbox SET status = ? WHERE status = ?",
+                (STATUS_PENDING, STATUS_IN_FLIGHT)
+            )
+            self._conn.commit()
+        if cursor.rowcount:
+            self.logger.info(f"전송 중이던 알림 {cursor.rowcount}건 복구")
+
+    def enqueue(self, channel, payload, dedup_key=None):
+        """알림 추가 (이미 있는 dedup_key면 False)"""
+        return self.enqueue_many(channel, [(dedup_key, payload)]) == 1
+
+    def enqueue_many(self, channel, items):
+        """알림 일괄 추가, 새로 추가된 건수 반환
+
+        items: (dedup_key, payload) 목록
+        """
+        now = time.time()
+        records = [
+            (channel, None if dedup_key is None else str(dedup_key),
+             json.dumps(payload, ensure_ascii=False), STATUS_PENDING, now, now, now)
+            for dedup_key, payload in items
+        ]
+        if not records:
+            return 0
+
+        with self._lock:
+            before = self._conn.total_changes
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO outbox "
+                    "(channel, dedup_key, payload, status, next_attempt_at, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    records
+                )
+            return self._conn.total_changes - before
+
+    def claim(self, channel, limit=1):
+        """전송할 차례가 된 항목을 전송 중 상태로 바꾸고 [(id, payload)] 반환"""
+        now = time.time()
+        with self._lock:
+            with self._conn:
+                rows = self._conn.execute(
+                    "SELECT id, payload FROM outbox "
+                    "WHERE channel = ? AND status = ? AND next_attempt_at <= ? "
+                    "ORDER BY next_attempt_at, id LIMIT ?",
+                    (channel, STATUS_PENDING, now, limit)
+                ).fetchall()
+                if rows:
+                    self._conn.executemany(
+                        "UPDATE outbox SET status = ?, updated_at = ? WHERE id = ?",
+                        [(STATUS_IN_FLIGHT, now, row[0]) for row in rows]
+                    )
+        return [(row[0], json.loads(row[1])) for row in rows]
+
+    def complete(self, ids):
+        """전송 완료 처리"""
+        if not ids:
+            return
+        now = time.time()
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "UPDATE outbox SET status = ?, updated_at = ?, last_error = NULL WHERE id = ?",
+                    [(STATUS_DONE, now, outbox_id) for outbox_id in ids]
+                )
+
+    def fail(self, ids, delay_seconds, error=None, max_attempts=None):
+        """전송 실패 처리 (delay_seconds 후 재시도, 최대 시도 횟수 초과 시 dead), dead가 된 건수 반환"""
+        if not ids:
+            return 0
+        now = time.time()
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "UPDATE outbox SET attempts = attempts + 1, status = CASE "
+                    "WHEN ? IS NOT NULL AND attempts + 1 >= ? THEN ? ELSE ? END, "
+                    "next_attempt_at = ?, updated_at = ?, last_error = ? WHERE id = ?",
+                    [
+                        (max_attempts, max_attempts, STATUS_DEAD, STATUS_PENDING,
+                         now + delay_seconds, now, error, outbox_id)
+                        for outbox_id in ids
+                    ]
+                )
+                if max_attempts is None:
+                    return 0
+                return self._count_status(ids, STATUS_DEAD)
+
+    def mark_dead(self, ids, error=None):
+        """재시도해도 전송할 수 없는 항목을 바로 dead 처리"""
+        if not ids:
+            return
+        now = time.time()
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "UPDATE outbox SET attempts = attempts + 1, status = ?, updated_at = ?, last_error = ? "
+                    "WHERE id = ?",
+                    [(STATUS_DEAD, now, error, outbox_id) for outbox_id in ids]
+                )
+
+    def _count_status(self, ids, status):
+        return sum(
+            self._conn.execute(
+                f"SELECT COUNT(*) FROM outbox WHERE status = ? AND id IN ({','.join('?' * len(chunk))})",
+                [status, *chunk]
+            ).fetchone()[0]
+            for chunk in (ids[i:i + 500] for i in range(0, len(ids), 500))
+        )
+
+    def attempts_of(self, outbox_id):
+        with self._lock:
+            row = self._conn.execute("SELECT attempts FROM outbox WHERE id = ?", (outbox_id,)).fetchone()
+        return row[0] if row else 0
+
+    def depth(self, channel=None):
+        """전송 대기(전송 중 포함) 건수"""
+        sql = "SELECT COUNT(*) FROM outbox WHERE status IN (?, ?)"
+        params = [STATUS_PENDING, STATUS_IN_FLIGHT]
+        if channel is not None:
+            sql += " AND channel = ?"
+            params.append(channel)
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()[0]
+
+    def dead_count(self, channel=None):
+        """최대 시도 횟수를 넘어 전송을 중단한(dead) 건수"""
+        sql = "SELECT COUNT(*) FROM outbox WHERE status = ?"
+        params = [STATUS_DEAD]
+        if channel is not None:
+            sql += " AND channel = ?"
+            params.append(channel)
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()[0]
+
+    def purge_done(self, older_than_seconds=DONE_RETENTION_SECONDS):
+        """오래된 전송 완료 항목 삭제"""
+        with self._lock:
+            with self._conn:
+                cursor = self._conn.execute(
+                    "DELETE FROM outbox WHERE status = ? AND updated_at < ?",
+                    (STATUS_DONE, time.time() - older_than_seconds)
+                )
+        return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class OutboxDispatcher:
+    """채널별 전송 작업자가 Outbox를 비우며 알림을 전송
+
+    실패한 항목은 채널별 지수 백오프(지터 포함) 후 다시 전송하며,
+    retry_after 함수가 등록된 채널은 그 시간(예: Slack Retry-After)이 지날 때까지 기다립니다.
+    최대 시도 횟수를 넘은 항목은 dead로 바꾸고 오류 로그를 남기며,
+    purge_interval 초마다 done_retention 초가 지난 전송 완료 항목을 삭제합니다.
+    """
+
+    def __init__(self, outbox, poll_interval=1.0, base_backoff=2.0, max_backoff=300.0, max_attempts=20,
+                 purge_interval=PURGE_INTERVAL_SECONDS, done_retention=DONE_RETENTION_SECONDS):
+        self.outbox = outbox
+        self.poll_interval = poll_interval
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.max_attempts = max_attempts
+        self.purge_interval = purge_interval
+        self.done_retention = done_retention
+        self.logger = setup_logging()
+        self._purge_lock = threading.Lock()
+        self._last_purge_at = None
+        self._channels = {}
+        self._threads = []
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+
+    def register_handler(self, channel, handler, batch_size=1, workers=1, retry_after=None):
+        """채널 전송 함수 등록
+
+        handler: batch_size == 1 이면 handler(payload) -> bool,
+                 batch_size > 1 이면 handler([payload, ...]) -> [bool, ...]
+                 재시도해도 전송할 수 없는 항목은 True/False 대신 STATUS_DEAD를 반환하면 바로 dead 처리
+        retry_after: 채널 전송을 보류해야 하는 남은 시간(초)을 반환하는 함수 (선택)
+        """
+        self._channels[channel] = {
+            'handler': handler,
+            'batch_size': batch_size,
+            'workers': workers,
+            'retry_after': retry_after,
+        }
+
+    def start(self):
+        """전송 작업자 시작"""
+        self._stop_event.clear()
+        for channel, options in self._channels.items():
+            for index in range(options['workers']):
+                thread = threading.Thread(
+                    target=self._worker_loop,
+                    args=(channel,),
+                    name=f"outbox-{channel}-{index}",
+                    daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+        self.logger.info(f"알림 전송 작업자 시작 (채널: {', '.join(self._channels)})")
+
+    def stop(self, timeout=5):
+        """전송 작업자 종료"""
+        self._stop_event.set()
+        self._wake_event.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def wake(self):
+        """새 알림이 추가되었음을 작업자에게 알림"""
+        self._wake_event.set()
+
+    def _backoff_seconds(self, attempts):
+        delay = min(self.max_backoff, self.base_backoff * (2 ** attempts))
+        return delay * random.uniform(0.5, 1.0)
+
+    def purge_if_due(self):
+        """마지막 정리 후 purge_interval 초가 지났으면 오래된 전송 완료 항목 삭제 (삭제 건수 반환)"""
+        now = time.monotonic()
+        with self._purge_lock:
+            if self._last_purge_at is not None and now - self._last_purge_at < self.purge_interval:
+                return 0
+            self._last_purge_at = now
+        try:
+            purged = self.outbox.purge_done(self.done_retention)
+        except Exception as e:
+            self.logger.error(f"전송 완료 알림 정리 중 오류 발생: {str(e)}", exc_info=True)
+            return 0
+        if purged:
+            self.logger.info(f"전송 완료 알림 {purged}건 정리")
+        return purged
+
+    def _worker_loop(self, channel):
+        while not self._stop_event.is_set():
+            self.purge_if_due()
+            try:
+                processed = self.dispatch_once(channel)
+            except Exception as e:
+                self.logger.error(f"알림 전송 작업 중 오류 ({channel}): {str(e)}", exc_info=True)
+                processed = 0
+
+            if not processed:
+                self._wake_event.wait(self.poll_interval)
+                self._wake_event.clear()
+
+    def dispatch_once(self, channel):
+        """채널의 전송 차례가 된 항목을 한 번 처리하고 처리 건수 반환"""
+        options = self._channels[channel]
+        retry_after = options['retry_after']
+        if retry_after and retry_after() > 0:
+            return 0
+
+        items = self.outbox.claim(channel, options['batch_size'])
+        if not items:
+            return 0
+
+        ids = [outbox_id for outbox_id, _ in items]
+        payloads = [payload for _, payload in items]
+        try:
+            if options['batch_size'] == 1:
+                results = [options['handler'](payloads[0])]
+            else:
+                results = list(options['handler'](payloads))
+            error = None
+        except Exception as e:
+            self.logger.error(f"알림 전송 중 오류 ({channel}): {str(e)}", exc_info=True)
+            results = [False] * len(items)
+            error = str(e)
+
+        rejected = [outbox_id for outbox_id, result in zip(ids, results) if result == STATUS_DEAD]
+        succeeded = [outbox_id for outbox_id, result in zip(ids, results) if result and result != STATUS_DEAD]
+        failed = [outbox_id for outbox_id, result in zip(ids, results) if not result]
+        self.outbox.complete(succeeded)
+
+        if rejected:
+            self.outbox.mark_dead(rejected, error="전송할 수 없는 알림")
+            self.logger.error(
+                f"알림 {len(rejected)}건 전송 불가 ({channel}), 재시도하지 않습니다 "
+                f"(누적 {self.outbox.dead_count(channel)}건)"
+            )
+
+        if failed:
+            delay = self._backoff_seconds(self.outbox.attempts_of(failed[0]))
+            if retry_after:
+                delay = max(delay, retry_after())
+            dead = self.outbox.fail(failed, delay, error=error or "전송 실패", max_attempts=self.max_attempts)
+            if dead:
+                self.logger.error(
+                    f"알림 {dead}건 최종 전송 실패 ({channel}, {self.max_attempts}회 시도), "
+                    f"전송을 중단합니다 (누적 {self.outbox.dead_count(channel)}건)"
+                )
+            if len(failed) > dead:
+                self.logger.warning(f"알림 {len(failed) - dead}건 전송 실패 ({channel}), {delay:.1f}초 후 재시도")
+
+        return len(items)
@@ -0,0 +1,32 @@
+# rate_limit.py
+import threading
+import time
+
+
+class RateLimiter:
+    """토큰 버킷 방식의 초당 요청 수 제한 (여러 스레드에서 공유 가능)"""
+
+    def __init__(self, rate_per_second, burst=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate_per_second = rate_per_second
+        self.burst = burst if burst is not None else max(1, int(rate_per_second))
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = float(self.burst)
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """요청 1건을 보낼 수 있을 때까지 대기"""
+        if not self.rate_per_second:
+            return
+
+        while True:
+            with self._lock:
+                now = self.clock()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate_per_second)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_seconds = (1 - self._tokens) / self.rate_per_second
+            self.sleep(wait_seconds)
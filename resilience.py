@@ -0,0 +1,227 @@
+# resilience.py
+import random
+import threading
+import time
+from .metrics import get_metrics
+from .utils import setup_logging
+
+# 기본 재시도 설정 (config.json 에서 덮어쓸 수 있음)
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BASE_DELAY = 0.5
+DEFAULT_MAX_DELAY = 10.0
+# 기본 차단기 설정: 연속 실패 횟수, 차단 유지 시간(초)
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 30.0
+
+# 반복해도 결과가 같은 HTTP 메서드 (요청이 전달된 뒤 실패해도 재시도 가능)
+IDEMPOTENT_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'))
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+# 지표에 기록하는 차단기 상태 값
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """차단기가 열려 있어 요청을 보내지 않음"""
+
+    def __init__(self, endpoint, retry_after):
+        super().__init__(f"{endpoint} 차단 중 ({retry_after:.1f}초 후 재시도 가능)")
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
+class RetryPolicy:
+    """지수 백오프 + full jitter 재시도 정책"""
+
+    def __init__(self, max_attempts=DEFAULT_MAX_ATTEMPTS, base_delay=DEFAULT_BASE_DELAY,
+                 max_delay=DEFAULT_MAX_DELAY, random_func=random.random):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.random_func = random_func
+
+    def delay(self, attempt, retry_after=None):
+        """attempt번째(1부터) 실패 후 대기 시간 (Retry-After가 있으면 그 이상, 최대 max_delay)"""
+        delay = self.random_func() * min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        if retry_after:
+            delay = max(delay, retry_after)
+        return min(delay, self.max_delay)
+
+
+class CircuitBreaker:
+    """엔드포인트별 차단기
+
+    연속 failure_threshold 회 실패하면 열림(open) 상태가 되어 reset_timeout 초 동안 요청을
+    보내지 않고 바로 실패합니다. 이후 요청 1건만 시험(half_open)하여 성공하면 닫히고,
+    실패하면 다시 reset_timeout 초 동안 차단합니다.
+    """
+
+    def __init__(self, name, failure_threshold=DEFAULT_FAILURE_THRESHOLD, reset_timeout=DEFAULT_RESET_TIMEOUT,
+                 clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.logger = setup_logging()
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._state == OPEN and self.clock() - self._opened_at >= self.reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def retry_after(self):
+        """요청을 다시 보낼 수 있을 때까지 남은 시간(초), 닫혀 있으면 0"""
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (self.clock() - self._opened_at))
+
+    def before_request(self):
+        """요청 전 호출 (차단 중이면 CircuitOpenError)"""
+        with self._lock:
+            if self._state == CLOSED:
+                return
+            if self._state == OPEN:
+                remaining = self.reset_timeout - (self.clock() - self._opened_at)
+                if remaining > 0:
+                    raise CircuitOpenError(self.name, remaining)
+                self._state = HALF_OPEN
+                self._trial_in_flight = False
+            # 시험 요청은 한 번에 1건만 허용
+            if self._trial_in_flight:
+                raise CircuitOpenError(self.name, 0.0)
+            self._trial_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            previous = self._state
+            self._state = CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+        if previous != CLOSED:
+            self.logger.info(f"차단 해제: {self.name}")
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                opened = self._state != OPEN
+                self._state = OPEN
+                self._opened_at = self.clock()
+            else:
+                opened = False
+        if opened:
+            self.logger.warning(f"연속 실패로 차단: {self.name} ({self.reset_timeout}초)")
+
+    def snapshot(self):
+        return {
+            'state': self.state,
+            'consecutive_failures': self._failures,
+            'retry_after_seconds': self.retry_after(),
+        }
+
+
+class ResilienceManager:
+    """엔드포인트별 차단기와 재시도 정책 관리 (HttpClient가 사용)"""
+
+    def __init__(self, retry_policy=None, failure_threshold=DEFAULT_FAILURE_THRESHOLD,
+                 reset_timeout=DEFAULT_RESET_TIMEOUT, sleep=time.sleep, clock=time.monotonic):
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.sleep = sleep
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._breakers = {}
+
+    @classmethod
+    def from_config(cls, config):
+        """설정값으로 생성 (RETRY_MAX_ATTEMPTS, RETRY_BASE_DELAY_SECONDS, RETRY_MAX_DELAY_SECONDS,
+        CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_SECONDS)"""
+        config = config or {}
+        return cls(
+            retry_policy=RetryPolicy(
+                max_attempts=int(config.get('RETRY_MAX_ATTEMPTS', DEFAULT_MAX_ATTEMPTS)),
+                base_delay=float(config.get('RETRY_BASE_DELAY_SECONDS', DEFAULT_BASE_DELAY)),
+                max_delay=float(config.get('RETRY_MAX_DELAY_SECONDS', DEFAULT_MAX_DELAY)),
+            ),
+            failure_threshold=int(config.get('CIRCUIT_FAILURE_THRESHOLD', DEFAULT_FAILURE_THRESHOLD)),
+            reset_timeout=float(config.get('CIRCUIT_RESET_SECONDS', DEFAULT_RESET_TIMEOUT)),
+        )
+
+    def breaker(self, endpoint):
+        """엔드포인트의 차단기 (처음 요청 시 생성하고 상태 지표 등록)"""
+        with self._lock:
+            breaker = self._breakers.get(endpoint)
+            if breaker is None:
+                breaker = self._breakers[endpoint] = CircuitBreaker(
+                    endpoint, self.failure_threshold, self.reset_timeout, clock=self.clock
+                )
+                get_metrics().gauge(
+                    'circuit_breaker_state', '엔드포인트 차단기 상태 (0: 닫힘, 1: 시험 중, 2: 차단)'
+                ).set_function(lambda: STATE_VALUES[breaker.state], endpoint=endpoint)
+            return breaker
+
+    def retry_after(self, endpoint):
+        """엔드포인트가 차단 중이면 남은 시간(초), 아니면 0"""
+        with self._lock:
+            breaker = self._breakers.get(endpoint)
+        return breaker.retry_after() if breaker is not None else 0.0
+
+    def snapshot(self):
+        """엔드포인트별 차단기 상태 (모니터링용)"""
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {endpoint: breaker.snapshot() for endpoint, breaker in breakers.items()}
+
+    def call(self, endpoint, send, idempotent, is_failure, is_safe_error, retry_after_of=None):
+        """차단기/재시도를 적용하여 send() 실행
+
+        - is_failure(result): 재시도/차단 대상 응답인지 (예: 5xx)
+        - is_safe_error(exc): 요청이 서버에 전달되지 않은 오류인지 (멱등이 아닌 요청도 재시도 가능)
+        - retry_after_of(result): 응답이 지정한 재시도 대기 시간(초)
+        멱등이 아닌 요청은 응답을 받았거나 전달 여부를 알 수 없는 오류이면 재시도하지 않습니다.
+        """
+        breaker = self.breaker(endpoint)
+        policy = self.retry_policy
+        for attempt in range(1, policy.max_attempts + 1):
+            breaker.before_request()
+            try:
+                result = send()
+            except Exception as e:
+                breaker.record_failure()
+                if attempt >= policy.max_attempts or not (idempotent or is_safe_error(e)) or breaker.state == OPEN:
+                    raise
+                delay = policy.delay(attempt)
+                self._note_retry(endpoint, attempt, delay, f"{type(e).__name__}: {e}")
+                self.sleep(delay)
+                continue
+
+            if not is_failure(result):
+                breaker.record_success()
+                return result
+
+            breaker.record_failure()
+            # 이번 실패로 차단되었으면 재시도하지 않고 마지막 응답 반환
+            if attempt >= policy.max_attempts or not idempotent or breaker.state == OPEN:
+                return result
+            delay = policy.delay(attempt, retry_after_of(result) if retry_after_of else None)
+            self._note_retry(endpoint, attempt, delay, f"status {getattr(result, 'status_code', result)}")
+            self.sleep(delay)
+
+    def _note_retry(self, endpoint, attempt, delay, reason):
+        get_metrics().counter('http_client_retries_total', '외부 API 재시도 횟수').inc(endpoint=endpoint)
+        setup_logging().warning(
+            "%s 요청 실패 (%s), %.2f초 후 재시도 (%d/%d)",
+            endpoint, reason, delay, attempt, self.retry_policy.max_attempts - 1
+        )
@@ -0,0 +1,116 @@
+# scheduler.py
+import random
+import time
+from .http_client import parse_retry_after
+from .utils import setup_logging
+
+# 남은 호출 수/재시도 시간을 알려주는 응답 헤더
+RETRY_AFTER_HEADER = 'Retry-After'
+RATE_LIMIT_REMAINING_HEADERS = ('GNCP-GW-RateLimit-Remaining', 'X-RateLimit-Remaining')
+RATE_LIMIT_REPLENISH_HEADERS = ('GNCP-GW-RateLimit-Replenish-Rate',)
+
+
+class PollScheduler:
+    """주문 조회 주기 스케줄러
+
+    - 단조 시계 기준의 고정 주기(처리 시간이 주기에 더해지지 않음)
+    - 주문이 들어오면 min_interval로 줄이고, 조용하면 max_interval까지 지수적으로 늘림
+    - 지터로 여러 프로세스의 호출 시점을 분산
+    - Retry-After / 호출 한도 헤더가 오면 그 시간만큼 다음 호출을 미룸
+    """
+
+    def __init__(self, base_interval=10, min_interval=5, max_interval=60, backoff_factor=1.5,
+                 jitter_ratio=0.1, clock=time.monotonic, sleep=time.sleep):
+        self.base_interval = base_interval
+        self.min_interval = min(min_interval, base_interval)
+        self.max_interval = max(max_interval, base_interval)
+        self.backoff_factor = backoff_factor
+        self.jitter_ratio = jitter_ratio
+        self.clock = clock
+        self.sleep = sleep
+        self.logger = setup_logging()
+        self.interval = base_interval
+        self._last_tick = None
+        self._hold_until = 0.0
+
+    @classmethod
+    def from_config(cls, config):
+        """설정값으로 생성"""
+        config = config or {}
+        return cls(
+            base_interval=float(config.get('POLL_INTERVAL_SECONDS', 10)),
+            min_interval=float(config.get('POLL_MIN_INTERVAL_SECONDS', 5)),
+            max_interval=float(config.get('POLL_MAX_INTERVAL_SECONDS', 60)),
+            backoff_factor=float(config.get('POLL_BACKOFF_FACTOR', 1.5)),
+            jitter_ratio=float(config.get('POLL_JITTER_RATIO', 0.1)),
+        )
+
+    def record_result(self, orders_seen):
+        """조회 결과에 따라 다음 주기 조정"""
+        previous = self.interval
+        if orders_seen:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.max_interval, self.interval * self.backoff_factor)
+
+        if self.interval != previous:
+            self.logger.debug("조회 주기 변경: %.1f초 -> %.1f초", previous, self.interval)
+
+    def note_rate_limit(self, headers):
+        """응답 헤더의 호출 한도 정보 반영"""
+        if not headers:
+            return
+
+        delay = 0.0
+        retry_after = headers.get(RETRY_AFTER_HEADER)
+        if retry_after:
+            delay = parse_retry_after(retry_after)
+            if delay is None:
+                delay = self.interval
+
+        for name in RATE_LIMIT_REMAINING_HEADERS:
+            remaining = headers.get(name)
+            if remaining is not None and remaining.strip() == '0':
+                # 남은 호출이 없으면 토큰이 채워질 때까지 대기
+                replenish_rate = next(
+                    (headers.get(header) for header in RATE_LIMIT_REPLENISH_HEADERS if headers.get(header)),
+                    None
+                )
+                try:
+                    delay = max(delay, 1.0 / float(replenish_rate)) if replenish_rate else max(delay, 1.0)
+                except (ValueError, ZeroDivisionError):
+                    delay = max(delay, 1.0)
+                break
+
+        if delay > 0:
+            self._hold_until = max(self._hold_until, self.clock() + delay)
+            self.logger.warning(f"API 호출 한도로 다음 조회를 {delay:.1f}초 이상 지연")
+
+    def note_rate_limits(self, headers_list):
+        """여러 응답(변경 구분별 목록 조회)의 호출 한도 정보 반영"""
+        for headers in headers_list:
+            self.note_rate_limit(headers)
+
+    def next_delay(self):
+        """다음 조회까지 기다릴 시간(초) 계산 후 다음 시각을 예약"""
+        now = self.clock()
+        if self._last_tick is None:
+            self._last_tick = now
+            return 0.0
+
+        jitter = self.interval * self.jitter_ratio * random.uniform(-1, 1)
+        next_tick = self._last_tick + self.interval + jitter
+        next_tick = max(next_tick, self._hold_until)
+
+        # 처리 시간이 주기보다 길었다면 밀린 주기를 건너뛰고 바로 실행
+        if next_tick < now:
+            next_tick = now
+
+        self._last_tick = next_tick
+        return next_tick - now
+
+    def wait(self):
+        """다음 조회 시각까지 대기"""
+        delay = self.next_delay()
+        if delay > 0:
+            self.sleep(delay)
@@ -0,0 +1,219 @@
+# sharding.py
+import bisect
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from .utils import setup_logging
+
+# 기본 임대(lease) 유지 시간과 갱신 주기 (초)
+DEFAULT_LEASE_TTL = 30.0
+DEFAULT_RENEW_INTERVAL = 10.0
+
+
+def _hash(value):
+    return int.from_bytes(hashlib.md5(value.encode('utf-8')).digest()[:8], 'big')
+
+
+class ConsistentHashRing:
+    """일관된 해싱 링 (작업자가 추가/제외되어도 다른 작업자의 스토어는 대부분 그대로 유지)"""
+
+    def __init__(self, nodes=(), replicas=100):
+        self.replicas = replicas
+        self._keys = []
+        self._nodes = []
+        for node in nodes:
+            self.add(node)
+
+    def add(self, node):
+        for index in range(self.replicas):
+            key = _hash(f"{node}#{index}")
+            position = bisect.bisect(self._keys, key)
+            self._keys.insert(position, key)
+            self._nodes.insert(position, node)
+
+    def node_for(self, key):
+        """key를 담당하는 노드 (노드가 없으면 None)"""
+        if not self._keys:
+            return None
+        position = bisect.bisect(self._keys, _hash(str(key))) % len(self._keys)
+        return self._nodes[position]
+
+
+class LeaseStore:
+    """SQLite 기반 스토어 임대 저장소 (같은 디스크의 여러 프로세스가 공유)
+
+    - 스토어별 임대: 소유 작업자와 만료 시각을 저장하며, 만료되었거나 자신이 소유한 경우에만 획득
+    - 작업자 생존 신호(heartbeat): 살아 있는 작업자 목록으로 해싱 링을 구성
+    시각은 프로세스 간에 비교해야 하므로 time.time()을 사용합니다.
+    """
+
+    def __init__(self, filename='order_leases.db', clock=time.time):
+        self.filename = filename
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(filename, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS store_leases ("
+            "store_id TEXT PRIMARY KEY, "
+            "owner TEXT NOT NULL, "
+            "expires_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS workers ("
+            "worker_id TEXT PRIMARY KEY, "
+            "pid INTEGER, "
+            "heartbeat_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def acquire(self, store_id, owner, ttl, now=None):
+        """임대 획득 또는 연장 (비어 있거나 만료되었거나 이미 소유한 경우), 성공 여부 반환"""
+        now = self.clock() if now is None else now
+        with self._lock:
+            with self._conn:
+                cursor = self._conn.execute(
+                    "INSERT INTO store_leases (store_id, owner, expires_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(store_id) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+                    "WHERE store_leases.owner = excluded.owner OR store_leases.expires_at <= ?",
+                    (store_id, owner, now + ttl, now)
+                )
+                return cursor.rowcount == 1
+
+    def owner_of(self, store_id, now=None):
+        """현재 임대 소유 작업자 (만료되었으면 None)"""
+        now = self.clock() if now is None else now
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT owner FROM store_leases WHERE store_id = ? AND expires_at > ?", (store_id, now)
+            ).fetchone()
+        return row[0] if row else None
+
+    def heartbeat(self, worker_id, pid=None):
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO workers (worker_id, pid, heartbeat_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(worker_id) DO UPDATE SET pid = excluded.pid, heartbeat_at = excluded.heartbeat_at",
+                    (worker_id, pid, self.clock())
+                )
+
+    def remove_worker(self, worker_id):
+        """작업자 종료 시 생존 신호와 임대를 정리 (진행 중인 조회가 모두 끝난 뒤 호출)"""
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM workers WHERE worker_id = ?", (worker_id,))
+                self._conn.execute("UPDATE store_leases SET expires_at = 0 WHERE owner = ?", (worker_id,))
+
+    def live_workers(self, ttl):
+        """최근 ttl 초 안에 생존 신호를 보낸 작업자 목록"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT worker_id FROM workers WHERE heartbeat_at > ? ORDER BY worker_id", (self.clock() - ttl,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class LeaseCoordinator:
+    """작업자 프로세스의 스토어 소유권 관리
+
+    살아 있는 작업자로 해싱 링을 만들어 자신에게 배정된 스토어의 임대를 획득/연장합니다.
+    배정이 바뀐 스토어는 바로 조회를 멈추되 임대는 반환하지 않고 만료될 때까지 두므로,
+    진행 중이던 조회/알림이 끝나기 전에 새 작업자가 같은 스토어를 조회하지 않습니다.
+    작업자가 죽으면 생존 신호와 임대가 만료된 뒤 링에서 제외되어 남은 작업자가 그 스토어를 이어받습니다.
+    owns()는 만료까지 safety_margin 초 이상 남은 임대만 소유로 보므로, 임대가 끊긴 작업자는
+    다른 작업자가 획득하기 전에 조회를 멈춥니다.
+    """
+
+    def __init__(self, lease_store, worker_id, store_ids, ttl=DEFAULT_LEASE_TTL,
+                 renew_interval=DEFAULT_RENEW_INTERVAL, safety_margin=None, clock=time.time):
+        self.lease_store = lease_store
+        self.worker_id = worker_id
+        self.store_ids = list(store_ids)
+        self.ttl = ttl
+        self.renew_interval = min(renew_interval, ttl / 3)
+        self.safety_margin = self.renew_interval if safety_margin is None else safety_margin
+        self.clock = clock
+        self.logger = setup_logging()
+        self._lock = threading.Lock()
+        self._leases = {}  # 스토어 -> 임대 만료 시각(time.time())
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_config(cls, config, worker_id, store_ids):
+        """설정값으로 생성 (SHARD_LEASE_FILE, SHARD_LEASE_TTL_SECONDS, SHARD_LEASE_RENEW_SECONDS)"""
+        return cls(
+            LeaseStore(config.get('SHARD_LEASE_FILE', 'order_leases.db')),
+            worker_id,
+            store_ids,
+            ttl=float(config.get('SHARD_LEASE_TTL_SECONDS', DEFAULT_LEASE_TTL)),
+            renew_interval=float(config.get('SHARD_LEASE_RENEW_SECONDS', DEFAULT_RENEW_INTERVAL)),
+        )
+
+    def owns(self, store_id):
+        """현재 이 작업자가 스토어를 조회해도 되는지 여부"""
+        with self._lock:
+            expires_at = self._leases.get(store_id)
+        return expires_at is not None and expires_at - self.safety_margin > self.clock()
+
+    @property
+    def owned_stores(self):
+        return sorted(store_id for store_id in self._leases if self.owns(store_id))
+
+    def rebalance(self):
+        """생존 신호 전송 후 배정된 스토어의 임대 획득/연장, 배정에서 빠진 스토어는 조회 중단"""
+        self.lease_store.heartbeat(self.worker_id, os.getpid())
+        ring = ConsistentHashRing(self.lease_store.live_workers(self.ttl))
+
+        for store_id in self.store_ids:
+            assigned = ring.node_for(store_id) == self.worker_id
+            with self._lock:
+                held = store_id in self._leases
+
+            if assigned:
+                now = self.clock()
+                if self.lease_store.acquire(store_id, self.worker_id, self.ttl, now):
+                    with self._lock:
+                        self._leases[store_id] = now + self.ttl
+                    if not held:
+                        self.logger.info(f"스토어 담당 시작: {store_id} ({self.worker_id})")
+                elif held:
+                    with self._lock:
+                        self._leases.pop(store_id, None)
+                    self.logger.warning(f"스토어 임대를 잃음: {store_id} ({self.worker_id})")
+            elif held:
+                # 임대를 바로 반환하면 진행 중인 조회와 새 작업자의 조회가 겹칠 수 있으므로 만료까지 둠
+                with self._lock:
+                    self._leases.pop(store_id, None)
+                self.logger.info(f"스토어 담당 해제: {store_id} ({self.worker_id}, 임대 만료 후 다른 작업자가 이어받음)")
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.rebalance()
+            except Exception as e:
+                self.logger.error(f"스토어 임대 갱신 중 오류 발생: {str(e)}", exc_info=True)
+            self._stop_event.wait(self.renew_interval)
+
+    def start(self):
+        """임대 갱신 스레드 시작"""
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='lease-coordinator', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """임대 갱신 종료 후 소유한 임대 반환"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(5)
+            self._thread = None
+        with self._lock:
+            self._leases.clear()
+        self.lease_store.remove_worker(self.worker_id)
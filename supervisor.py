@@ -0,0 +1,189 @@
+# supervisor.py
+# 여러 작업자 프로세스에 스토어를 나누어 조회 (config.json의 STORES 필요)
+# 실행: 상위 디렉토리에서 python3 -m order_management.supervisor [--workers 4]
+import argparse
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from .utils import load_config, setup_logging
+from .config_service import default_config_path
+from .cursor_store import SQLiteCursorStore
+from .http_client import get_http_client
+from .multi_store import MultiStoreManager, SharedStoreResources
+from .sharding import LeaseCoordinator
+
+# 작업자 재시작 대기 시간 (초, 연속으로 죽을수록 두 배씩 증가)
+RESTART_MIN_DELAY = 1.0
+RESTART_MAX_DELAY = 60.0
+# 이 시간 이상 실행된 작업자가 죽으면 재시작 대기 시간을 초기화
+STABLE_RUN_SECONDS = 300.0
+
+
+def worker_file(filename, worker_id):
+    """작업자별 파일 이름 (order_outbox.db -> order_outbox.worker-0.db)"""
+    base, ext = os.path.splitext(filename)
+    return f"{base}.{worker_id}{ext}"
+
+
+def run_worker(worker_id, config_path):
+    """작업자 프로세스: 임대를 획득한 스토어만 조회
+
+    알림 완료 목록, 주문 보관소, 커서(SQLite), 임대 파일은 모든 작업자가 공유하고
+    알림 대기열(outbox)만 작업자별 파일을 사용합니다.
+    """
+    # OrderManager 등 설정을 직접 읽는 모듈도 같은 설정 파일을 사용하도록 지정
+    os.environ['ORDER_MANAGEMENT_CONFIG'] = config_path
+    os.environ['ORDER_LOG_FILE'] = os.path.join('logs', f'order_management.{worker_id}.log')
+    logger = setup_logging(use_queue=True)
+
+    # 종료 신호를 받으면 진행 중인 조회를 마친 뒤 임대를 반환하고 종료
+    def handle_sigterm(signum, frame):
+        raise KeyboardInterrupt
+    signal.signal(signal.SIGTERM, handle_sigterm)
+
+    multi_store_manager = None
+    try:
+        config = load_config(config_path)
+        if not config or not config.get('STORES'):
+            logger.error(f"설정 파일에 STORES 목록이 없습니다: {config_path}")
+            return
+
+        config = dict(config)
+        config['OUTBOX_FILE'] = worker_file(config.get('OUTBOX_FILE', 'order_outbox.db'), worker_id)
+        shared = SharedStoreResources(
+            config,
+            cursor_store=SQLiteCursorStore(config.get('SHARD_CURSOR_FILE', 'order_cursor.db'))
+        )
+        store_ids = [store_config['STORE_ID'] for store_config in config['STORES']]
+        ownership = LeaseCoordinator.from_config(config, worker_id, store_ids)
+
+        multi_store_manager = MultiStoreManager(config, token_refresh_minutes=30, ownership=ownership, shared=shared)
+        logger.info(f"작업자 시작: {worker_id} (pid {os.getpid()})")
+        multi_store_manager.run_forever()
+    except KeyboardInterrupt:
+        logger.info(f"작업자 종료: {worker_id}")
+    except Exception as e:
+        logger.error(f"작업자 오류 발생 ({worker_id}): {str(e)}", exc_info=True)
+        sys.exit(1)
+    finally:
+        if multi_store_manager is not None:
+            multi_store_manager.stop()
+        get_http_client().close()
+
+
+class WorkerSupervisor:
+    """작업자 프로세스 실행/감시
+
+    작업자 ID(worker-0 ... worker-N-1)는 재시작해도 유지되므로, 죽은 작업자를 다시 띄우면
+    같은 스토어와 알림 대기열 파일을 이어받습니다. 재시작이 늦어지는 동안에는 다른 작업자가
+    임대 만료 후 그 스토어를 넘겨받습니다.
+    """
+
+    def __init__(self, config_path, worker_count):
+        self.config_path = config_path
+        self.worker_ids = [f"worker-{index}" for index in range(worker_count)]
+        self.logger = setup_logging()
+        # 작업자에서 fork된 스레드/연결을 물려받지 않도록 spawn 사용
+        self._context = multiprocessing.get_context('spawn')
+        self._processes = {}
+        self._started_at = {}
+        self._restart_delay = {worker_id: RESTART_MIN_DELAY for worker_id in self.worker_ids}
+        self._restart_at = {}
+        self._stopping = False
+
+    def _start_worker(self, worker_id):
+        process = self._context.Process(
+            target=run_worker,
+            args=(worker_id, self.config_path),
+            name=f"order-{worker_id}",
+        )
+        process.start()
+        self._processes[worker_id] = process
+        self._started_at[worker_id] = time.monotonic()
+        self.logger.info(f"작업자 실행: {worker_id} (pid {process.pid})")
+
+    def check_workers(self):
+        """죽은 작업자를 대기 시간 후 재시작"""
+        now = time.monotonic()
+        for worker_id in self.worker_ids:
+            process = self._processes.get(worker_id)
+            if process is not None and process.is_alive():
+                continue
+
+            if process is not None:
+                process.join()
+                self._processes.pop(worker_id)
+                if now - self._started_at[worker_id] >= STABLE_RUN_SECONDS:
+                    self._restart_delay[worker_id] = RESTART_MIN_DELAY
+                delay = self._restart_delay[worker_id]
+                self._restart_at[worker_id] = now + delay
+                self._restart_delay[worker_id] = min(RESTART_MAX_DELAY, delay * 2)
+                self.logger.warning(
+                    f"작업자 종료 감지: {worker_id} (종료 코드 {process.exitcode}), {delay:.0f}초 후 재시작"
+                )
+
+            if now >= self._restart_at.get(worker_id, 0):
+                self._restart_at.pop(worker_id, None)
+                self._start_worker(worker_id)
+
+    def run(self, check_interval=1.0):
+        """작업자 실행 후 stop() 또는 종료 신호까지 감시"""
+        for worker_id in self.worker_ids:
+            self._start_worker(worker_id)
+        while not self._stopping:
+            time.sleep(check_interval)
+            if not self._stopping:
+                self.check_workers()
+
+    def stop(self, timeout=30):
+        """모든 작업자에 종료 신호를 보내고 종료 대기 (제한 시간이 지나면 강제 종료)"""
+        self._stopping = True
+        for process in self._processes.values():
+            if process.is_alive():
+                process.terminate()
+        deadline = time.monotonic() + timeout
+        for worker_id, process in self._processes.items():
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                self.logger.warning(f"작업자 강제 종료: {worker_id}")
+                process.kill()
+                process.join()
+        self._processes.clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='여러 작업자 프로세스로 스토어 주문 조회')
+    parser.add_argument('--workers', type=int, help='작업자 수 (기본: 설정의 WORKER_PROCESSES 또는 CPU 수)')
+    parser.add_argument('--config', help='설정 파일 경로 (기본: config.json)')
+    args = parser.parse_args()
+
+    logger = setup_logging(use_queue=True)
+    config_path = os.path.abspath(args.config or default_config_path())
+    config = load_config(config_path)
+    if not config:
+        logger.error(f"설정 파일을 찾을 수 없습니다: {config_path}")
+        return
+    if not config.get('STORES'):
+        logger.error("여러 작업자로 실행하려면 설정에 STORES 목록이 필요합니다.")
+        return
+
+    worker_count = args.workers or int(config.get('WORKER_PROCESSES', os.cpu_count() or 1))
+    supervisor = WorkerSupervisor(config_path, max(1, worker_count))
+    logger.info(f"작업자 {len(supervisor.worker_ids)}개로 스토어 {len(config['STORES'])}개 조회 시작")
+
+    def handle_sigterm(signum, frame):
+        raise KeyboardInterrupt
+    signal.signal(signal.SIGTERM, handle_sigterm)
+
+    try:
+        supervisor.run()
+    except KeyboardInterrupt:
+        logger.info("프로그램 종료")
+    finally:
+        supervisor.stop()
+
+
+if __name__ == '__main__':
+    main()
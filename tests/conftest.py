@@ -0,0 +1,136 @@
+# conftest.py
+# 여러 테스트에서 함께 쓰는 가짜 시계, 가짜 HTTP 클라이언트, 설정 파일
+import json
+
+import pytest
+
+# bcrypt 솔트 형식의 테스트용 시크릿 (get_secret_sign에서 사용)
+TEST_CLIENT_SECRET = '$2a$04$abcdefghijklmnopqrstuu'
+
+
+class FakeClock:
+    """time.time/time.monotonic 대신 주입하는 시계 (advance로만 흐름)"""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class FakeResponse:
+    def __init__(self, status_code, data=None, text=None, headers=None):
+        self.status_code = status_code
+        self._data = data
+        self.text = text if text is not None else (json.dumps(data) if data is not None else '')
+        self.headers = headers or {}
+
+    def json(self):
+        if self._data is None:
+            return json.loads(self.text)
+        return self._data
+
+
+class FakeHttpClient:
+    """네이버 커머스 API/Slack Webhook을 흉내 내는 HttpClient
+
+    orders: 변경 주문 목록 응답, list_headers: 변경 구분별 목록 조회 응답 헤더
+    slack_responses: Slack 응답을 차례로 반환 (비면 200)
+    on_slack(url, message): Slack 요청마다 호출 (전송 중 시간 경과 등을 흉내)
+    """
+
+    def __init__(self, orders=None):
+        self.orders = list(orders or [])
+        self.list_headers = {}
+        self.slack_messages = []
+        self.slack_responses = []
+        self.on_slack = None
+        self.requests = []
+
+    def request(self, method, url, **kwargs):
+        self.requests.append((method, url, kwargs))
+        if 'oauth2' in url:
+            return FakeResponse(200, {'access_token': 'token', 'expires_in': 10800})
+        if 'last-changed-statuses' in url:
+            change_type = kwargs['params'].get('lastChangedType')
+            return FakeResponse(200, {'data': {'lastChangeStatuses': self.orders}},
+                                headers=self.list_headers.get(change_type))
+        if 'product-orders/query' in url:
+            return FakeResponse(200, {'data': [make_order_detail(product_order_id)
+                                               for product_order_id in kwargs['json']['productOrderIds']]})
+        if 'slack' in url:
+            self.slack_messages.append(kwargs.get('json'))
+            if self.on_slack is not None:
+                self.on_slack(url, kwargs.get('json'))
+            if self.slack_responses:
+                return self.slack_responses.pop(0)
+            return FakeResponse(200, text='ok')
+        return FakeResponse(404, text='not found')
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def close(self):
+        pass
+
+
+def make_order_detail(product_order_id):
+    return {
+        'productOrder': {'productOrderId': product_order_id, 'productName': f'상품 {product_order_id}', 'productOption': '옵션'},
+        'order': {'ordererName': '홍길동', 'ordererTel': '010-0000-0000', 'orderDate': '2024-01-01T10:00:00.000+09:00'},
+    }
+
+
+def make_changed_order(product_order_id, last_changed_date='2024-01-01T10:00:00.000+09:00'):
+    return {
+        'productOrderId': product_order_id,
+        'lastChangedType': 'PAYED',
+        'lastChangedDate': last_changed_date,
+        'productOrderStatus': 'PAYED',
+    }
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def fake_http():
+    return FakeHttpClient()
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    """임시 디렉토리의 파일을 쓰는 설정 파일 (ORDER_MANAGEMENT_CONFIG로 지정)"""
+    config = {
+        'CLIENT_ID': 'client',
+        'CLIENT_SECRET': TEST_CLIENT_SECRET,
+        'WEBHOOK_LOG': 'http://slack/log',
+        'WEBHOOK_ORDER': 'http://slack/order',
+        'COMMERCE_API_BASE_URL': 'http://commerce',
+        'ACCESS_KEY': 'access',
+        'SECRET_KEY': 'secret',
+        'SMS_BASE_URL': 'http://sens',
+        'SMS_API_URL': '/sms/v2/services/test/messages',
+        'KAKAO_SERVICE_ID': 'test',
+        'KAKAO_BASE_URL': 'http://sens',
+        'TOKEN_BACKGROUND_REFRESH': False,
+        'ORDER_ARCHIVE_ENABLED': False,
+        'ORDER_LIFECYCLE_ENABLED': False,
+        'DETAIL_CACHE_ENABLED': False,
+        'SLACK_MAX_PARALLEL_SENDS': 1,
+        'DEDUP_DB_FILE': str(tmp_path / 'dedup.db'),
+        'CURSOR_FILE': str(tmp_path / 'cursor.json'),
+        'TOKEN_CACHE_FILE': str(tmp_path / 'token_cache.dat'),
+    }
+    path = tmp_path / 'config.json'
+    path.write_text(json.dumps(config), encoding='utf-8')
+    monkeypatch.setenv('ORDER_MANAGEMENT_CONFIG', str(path))
+    return path
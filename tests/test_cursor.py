@@ -0,0 +1,87 @@
+# test_cursor.py
+# 실행: python -m pytest tests
+from datetime import datetime, timedelta
+
+import pytest
+
+from ..cursor_store import KST, CursorStore, SQLiteCursorStore, format_changed_date
+from ..order_check import INITIAL_LOOKBACK_MINUTES, MAX_QUERY_WINDOW, OrderManager
+from .conftest import TEST_CLIENT_SECRET, make_changed_order
+
+NOW = datetime(2024, 1, 1, 12, 0, 0, tzinfo=KST)
+
+
+def changed_at(minutes):
+    return NOW + timedelta(minutes=minutes)
+
+
+@pytest.fixture
+def order_manager(config_file, fake_http):
+    manager = OrderManager(client_id='client', client_secret=TEST_CLIENT_SECRET, http_client=fake_http)
+    yield manager
+    manager.close()
+    manager.notified_order_ids.close()
+
+
+@pytest.mark.parametrize('store_class, filename', [(CursorStore, 'cursor.json'), (SQLiteCursorStore, 'cursor.db')])
+def test_cursor_survives_restart(tmp_path, store_class, filename):
+    store = store_class(str(tmp_path / filename))
+    store.update('PAYED', changed_at(5))
+    store.update('store-a:PAYED', changed_at(7))
+
+    restarted = store_class(str(tmp_path / filename))
+    assert restarted.get('PAYED') == changed_at(5)
+    assert restarted.get('store-a:PAYED') == changed_at(7)
+    assert restarted.get('store-b:PAYED') is None
+
+
+def test_first_poll_looks_back_and_later_polls_overlap(order_manager):
+    assert order_manager.get_poll_start(NOW) == NOW - timedelta(minutes=INITIAL_LOOKBACK_MINUTES)
+
+    order_manager.cursor_store.update(order_manager.cursor_key, changed_at(-10))
+    # 늦게 반영된 변경을 놓치지 않도록 커서보다 CURSOR_OVERLAP_SECONDS(기본 60초) 앞에서 조회
+    assert order_manager.get_poll_start(NOW) == changed_at(-11)
+
+
+def test_cursor_moves_to_latest_change_when_all_processed(order_manager):
+    orders = [
+        make_changed_order('1', format_changed_date(changed_at(1))),
+        make_changed_order('2', format_changed_date(changed_at(3))),
+    ]
+
+    order_manager.advance_cursor(orders)
+
+    assert order_manager.cursor_store.get(order_manager.cursor_key) == changed_at(3)
+
+
+def test_cursor_stays_at_earliest_failed_order(order_manager):
+    orders = [
+        make_changed_order('1', format_changed_date(changed_at(1))),
+        make_changed_order('2', format_changed_date(changed_at(2))),
+        make_changed_order('3', format_changed_date(changed_at(3))),
+    ]
+
+    order_manager.advance_cursor(orders, failed_order_ids={'2', '3'})
+
+    assert order_manager.cursor_store.get(order_manager.cursor_key) == changed_at(2)
+
+
+def test_empty_poll_advances_to_end_of_window(order_manager):
+    order_manager.last_poll_windows['PAYED'] = (changed_at(-30), NOW)
+    order_manager.advance_cursor([])
+    assert order_manager.cursor_store.get(order_manager.cursor_key) == NOW
+
+    # 한 번에 조회할 수 있는 구간(24시간)을 넘으면 구간 끝까지만 이동
+    long_ago = NOW - timedelta(days=3)
+    order_manager.last_poll_windows['PAYED'] = (long_ago, NOW)
+    order_manager.advance_cursor([])
+    assert order_manager.cursor_store.get(order_manager.cursor_key) == long_ago + MAX_QUERY_WINDOW
+
+
+def test_empty_poll_without_complete_window_keeps_cursor(order_manager):
+    order_manager.cursor_store.update(order_manager.cursor_key, changed_at(-10))
+    order_manager.last_poll_windows['PAYED'] = None
+
+    order_manager.advance_cursor([])
+
+    assert order_manager.cursor_store.get(order_manager.cursor_key) == changed_at(-10)
@@ -0,0 +1,99 @@
+# test_dedup_store.py
+# 실행: python -m pytest tests
+import sqlite3
+import threading
+
+import pytest
+
+from ..dedup_store import MemoryDedupStore, SQLiteDedupStore
+
+
+@pytest.fixture
+def db_file(tmp_path):
+    return str(tmp_path / 'dedup.db')
+
+
+def test_added_key_is_found_after_reopen(db_file):
+    store = SQLiteDedupStore(db_file)
+    store.add('order-1')
+    store.close()
+
+    reopened = SQLiteDedupStore(db_file)
+    assert 'order-1' in reopened
+    assert 'order-2' not in reopened
+    assert len(reopened) == 1
+    reopened.close()
+
+
+def test_expired_key_is_not_found(db_file):
+    store = SQLiteDedupStore(db_file, ttl_seconds=-1)
+    store.add('order-1')
+    assert 'order-1' not in store
+    store.close()
+
+
+def test_discard_removes_key(db_file):
+    store = SQLiteDedupStore(db_file)
+    store.add('order-1')
+    store.discard('order-1')
+    assert 'order-1' not in store
+    assert len(store) == 0
+    store.close()
+
+
+def test_add_waits_for_another_connection_writing(db_file):
+    # 다른 작업자가 쓰는 중이어도 "database is locked" 없이 기다렸다가 기록
+    store = SQLiteDedupStore(db_file)
+    store.add('order-0')
+
+    writer = sqlite3.connect(db_file, check_same_thread=False)
+    writer.execute("BEGIN IMMEDIATE")
+    writer.execute("INSERT INTO notified_orders (order_id, added_at) VALUES ('other', 0)")
+    timer = threading.Timer(0.5, writer.commit)
+    timer.start()
+    try:
+        store.add('order-1')
+    finally:
+        timer.join()
+        writer.close()
+
+    assert 'order-1' in store
+    store.close()
+
+
+def test_two_stores_write_concurrently(db_file):
+    # 같은 DB를 여는 두 작업자가 동시에 기록해도 모든 항목이 남음
+    stores = [SQLiteDedupStore(db_file), SQLiteDedupStore(db_file)]
+    errors = []
+
+    def add_many(store, prefix):
+        try:
+            for index in range(200):
+                store.add(f"{prefix}-{index}")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [
+        threading.Thread(target=add_many, args=(store, f"worker-{index}"))
+        for index, store in enumerate(stores)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    for store in stores:
+        store.close()
+    reopened = SQLiteDedupStore(db_file)
+    assert len(reopened) == 400
+    assert 'worker-0-199' in reopened and 'worker-1-199' in reopened
+    reopened.close()
+
+
+def test_memory_store_drops_oldest_over_max_size():
+    store = MemoryDedupStore(max_size=2)
+    for key in ('a', 'b', 'c'):
+        store.add(key)
+    assert 'a' not in store
+    assert 'b' in store and 'c' in store
@@ -0,0 +1,51 @@
+# test_detail_cache.py
+# 실행: python -m pytest tests
+from ..detail_cache import OrderDetailCache
+from .conftest import make_order_detail
+
+CHANGED_AT = '2024-01-01T10:00:00.000+09:00'
+CHANGED_LATER = '2024-01-01T11:00:00.000+09:00'
+
+
+def test_hit_only_when_last_changed_date_matches():
+    cache = OrderDetailCache()
+    cache.put('1', CHANGED_AT, make_order_detail('1'))
+
+    assert cache.get('1', CHANGED_AT) == make_order_detail('1')
+    # 주문이 다시 변경되었으면 상세 정보도 바뀌었을 수 있으므로 다시 조회
+    assert cache.get('1', CHANGED_LATER) is None
+    assert cache.get('1', None) is None
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 2
+
+
+def test_least_recently_used_item_is_evicted():
+    cache = OrderDetailCache(max_size=2)
+    cache.put('1', CHANGED_AT, make_order_detail('1'))
+    cache.put('2', CHANGED_AT, make_order_detail('2'))
+    cache.get('1', CHANGED_AT)
+    cache.put('3', CHANGED_AT, make_order_detail('3'))
+
+    assert len(cache) == 2
+    assert cache.get('2', CHANGED_AT) is None
+    assert cache.get('1', CHANGED_AT) is not None
+
+
+def test_expired_item_is_not_returned():
+    cache = OrderDetailCache(ttl_seconds=-1)
+    cache.put('1', CHANGED_AT, make_order_detail('1'))
+
+    assert cache.get('1', CHANGED_AT) is None
+    assert len(cache) == 0
+
+
+def test_items_are_reloaded_from_file(tmp_path):
+    filename = str(tmp_path / 'detail_cache.db')
+    cache = OrderDetailCache(filename=filename)
+    cache.put_many([('1', CHANGED_AT, make_order_detail('1')), ('2', None, make_order_detail('2'))])
+    cache.close()
+
+    reloaded = OrderDetailCache(filename=filename)
+    assert reloaded.get('1', CHANGED_AT) == make_order_detail('1')
+    # 변경 일시가 없는 항목은 저장하지 않음
+    assert reloaded.get('2', CHANGED_AT) is None
+    reloaded.close()
@@ -0,0 +1,125 @@
+# test_notifications.py
+# 실행: python -m pytest tests
+import threading
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+from ..http_client import HttpClient, parse_retry_after
+from ..notifications import OrderNotificationCoalescer, SlackManager
+from ..notifications.slack_manager import webhook_endpoint
+from ..resilience import ResilienceManager
+from .conftest import FakeResponse
+
+ORDER_WEBHOOK = 'http://slack/order'
+
+
+def make_orders(count, start=1):
+    return [
+        {'productOrderId': f"order-{index}", 'productName': f"상품 {index}", 'orderer': {'name': '홍길동'}}
+        for index in range(start, start + count)
+    ]
+
+
+def make_coalescer(fake_http, **kwargs):
+    slack_manager = SlackManager('http://slack/log', ORDER_WEBHOOK, http_client=fake_http)
+    return OrderNotificationCoalescer(slack_manager, max_parallel_sends=1, **kwargs)
+
+
+def test_parse_retry_after_accepts_seconds_and_http_date():
+    now = datetime(2024, 1, 1, 0, 0, 0, tzinfo=timezone.utc)
+    assert parse_retry_after('30') == 30.0
+    assert parse_retry_after(format_datetime(now + timedelta(seconds=90), usegmt=True), now=now) == 90.0
+    assert parse_retry_after(format_datetime(now - timedelta(seconds=90), usegmt=True), now=now) == 0.0
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after(None) is None
+
+
+def test_few_orders_are_sent_one_message_each(fake_http):
+    coalescer = make_coalescer(fake_http, digest_threshold=5)
+
+    delivered = coalescer.send_orders(make_orders(3))
+
+    assert delivered == ['order-1', 'order-2', 'order-3']
+    assert len(fake_http.slack_messages) == 3
+
+
+def test_burst_is_sent_as_digest(fake_http):
+    coalescer = make_coalescer(fake_http, digest_threshold=5, digest_size=4)
+
+    delivered = coalescer.send_orders(make_orders(10))
+
+    assert sorted(delivered) == sorted(f"order-{index}" for index in range(1, 11))
+    # 10건을 4건씩 묶어 3개의 요약 메시지로 전송
+    assert len(fake_http.slack_messages) == 3
+
+
+def test_http_date_retry_after_holds_webhook_and_keeps_orders(fake_http):
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=120)
+    fake_http.slack_responses.append(
+        FakeResponse(429, text='rate limited', headers={'Retry-After': format_datetime(retry_at, usegmt=True)})
+    )
+    coalescer = make_coalescer(fake_http)
+
+    assert coalescer.send_orders(make_orders(2)) == []
+
+    # 첫 429 이후에는 Webhook을 다시 호출하지 않고 보류
+    assert len(fake_http.slack_messages) == 1
+    assert coalescer.slack_manager.get_retry_after(ORDER_WEBHOOK) > 60
+    assert coalescer.pending_count == 2
+    assert coalescer.flush_pending() == []
+    assert len(fake_http.slack_messages) == 1
+
+
+def test_other_callers_are_not_blocked_while_sending(fake_http):
+    # 느린 Webhook 전송 중에도 다른 호출은 잠금을 기다리지 않고 자기 주문을 보냄
+    coalescer = make_coalescer(fake_http)
+    first_send_started = threading.Event()
+    release_first_send = threading.Event()
+
+    def on_slack(url, message):
+        if not first_send_started.is_set():
+            first_send_started.set()
+            release_first_send.wait(5)
+
+    fake_http.on_slack = on_slack
+    first_result = []
+    first = threading.Thread(target=lambda: first_result.extend(coalescer.send_orders(make_orders(1))))
+    first.start()
+    try:
+        assert first_send_started.wait(5)
+        second_result = []
+        second = threading.Thread(target=lambda: second_result.extend(coalescer.send_orders(make_orders(1, start=2))))
+        second.start()
+        second.join(2)
+        assert not second.is_alive()
+        # 전송 중인 주문은 두 번째 호출이 다시 보내지 않음
+        assert second_result == ['order-2']
+    finally:
+        release_first_send.set()
+        first.join(5)
+
+    assert first_result == ['order-1']
+    assert len(fake_http.slack_messages) == 2
+
+
+def test_each_webhook_has_its_own_circuit_breaker():
+    # 한 스토어의 Webhook이 계속 실패해도 다른 Webhook으로는 계속 보냄
+    http_client = HttpClient(resilience=ResilienceManager(failure_threshold=2, sleep=lambda seconds: None))
+    sent = []
+
+    def send(method, url, endpoint, **kwargs):
+        sent.append(url)
+        return FakeResponse(500 if url.endswith('store-a') else 200, text='')
+
+    http_client._send = send
+    store_a = SlackManager('http://slack/log', 'http://slack/store-a', http_client=http_client)
+    store_b = SlackManager('http://slack/log', 'http://slack/store-b', http_client=http_client)
+    try:
+        for _ in range(3):
+            assert not store_a.send_order_notification({'text': 'a'})
+        # 두 번 실패한 뒤 store-a는 차단되어 요청을 보내지 않음
+        assert sent.count('http://slack/store-a') == 2
+        assert store_b.send_order_notification({'text': 'b'})
+        assert 'store-a' not in webhook_endpoint('http://slack/store-a')
+    finally:
+        http_client.close()
@@ -0,0 +1,47 @@
+# test_order_csv.py
+# 실행: python -m pytest tests
+import os
+
+from ..order_csv import CSVManager
+from .conftest import make_order_detail
+
+
+def test_written_orders_are_skipped_after_restart(tmp_path):
+    filename = str(tmp_path / 'order.csv')
+    manager = CSVManager(filename)
+    assert manager.write_order_to_csv([make_order_detail('1'), make_order_detail('2'), make_order_detail('1')]) == 2
+
+    restarted = CSVManager(filename)
+    assert restarted.is_order_id_in_csv('1') and restarted.is_order_id_in_csv('2')
+    assert restarted.write_order_to_csv([make_order_detail('2'), make_order_detail('3')]) == 1
+
+    with open(filename, encoding='utf-8') as csvfile:
+        assert len(csvfile.read().splitlines()) == 4  # 헤더 + 3건
+
+
+def test_index_is_rebuilt_when_csv_is_newer(tmp_path):
+    filename = str(tmp_path / 'order.csv')
+    CSVManager(filename).write_order_to_csv([make_order_detail('1')])
+
+    # 색인 파일보다 나중에 CSV를 직접 수정한 경우 CSV에서 색인을 다시 만듦
+    with open(filename, 'a', encoding='utf-8') as csvfile:
+        csvfile.write('2,2024-01-01 10:00:00,홍길동,010,상품,옵션\n')
+    index_mtime = os.path.getmtime(f"{filename}.idx")
+    os.utime(filename, (index_mtime + 10, index_mtime + 10))
+
+    restarted = CSVManager(filename)
+    assert restarted.is_order_id_in_csv('2')
+
+
+def test_stale_index_is_removed_when_csv_is_missing(tmp_path):
+    filename = str(tmp_path / 'order.csv')
+    CSVManager(filename).write_order_to_csv([make_order_detail('1')])
+
+    # CSV만 삭제되고 색인 파일이 남은 채로 다시 시작하면 같은 주문을 새로 기록
+    os.remove(filename)
+    restarted = CSVManager(filename)
+    assert not os.path.exists(f"{filename}.idx")
+    assert not restarted.is_order_id_in_csv('1')
+    assert restarted.write_order_to_csv([make_order_detail('1')]) == 1
+
+    assert CSVManager(filename).is_order_id_in_csv('1')
@@ -0,0 +1,78 @@
+# test_order_lifecycle.py
+# 실행: python -m pytest tests
+from datetime import datetime, timedelta
+
+import pytest
+
+from ..cursor_store import KST, format_changed_date
+from ..order_lifecycle import OrderLifecycle
+
+DAY = 24 * 60 * 60
+# apply_changes가 실제 시각 기준으로 정리(prune_if_due)하므로 변경 일시도 현재 기준으로 만듦
+NOW = datetime.now(KST)
+
+
+def change(product_order_id, status, days_ago=0, **fields):
+    return {
+        'productOrderId': product_order_id,
+        'productOrderStatus': status,
+        'lastChangedType': status,
+        'lastChangedDate': format_changed_date(NOW - timedelta(days=days_ago)),
+        **fields,
+    }
+
+
+@pytest.fixture
+def lifecycle(tmp_path):
+    lifecycle = OrderLifecycle(str(tmp_path / 'lifecycle.db'), retention_seconds=30 * DAY)
+    yield lifecycle
+    lifecycle.close()
+
+
+def test_transitions_are_emitted_once_in_change_order(lifecycle):
+    received = []
+    lifecycle.subscribe(received.extend)
+
+    events = lifecycle.apply_changes([
+        change('1', 'DELIVERING', days_ago=1),
+        change('1', 'PAYED', days_ago=2),
+    ])
+
+    assert [(event['fromState'], event['toState']) for event in events] == [
+        ('UNKNOWN', 'PAYED'), ('PAYED', 'DELIVERING')
+    ]
+    assert received == events
+    # 겹침 구간에서 같은 변경을 다시 받거나 이전 변경이 늦게 도착하면 무시
+    assert lifecycle.apply_changes([change('1', 'DELIVERING', days_ago=1), change('1', 'PAYED', days_ago=2)]) == []
+    assert lifecycle.get_state('1') == 'DELIVERING'
+
+
+def test_open_claim_overrides_product_order_status(lifecycle):
+    lifecycle.apply_changes([change('1', 'PAYED', claimType='CANCEL', claimStatus='CANCEL_REQUEST')])
+    assert lifecycle.get_state('1') == 'CANCEL_REQUESTED'
+
+
+def test_prune_removes_only_old_terminal_orders(lifecycle):
+    lifecycle.apply_changes([
+        change('old-decided', 'PURCHASE_DECIDED', days_ago=20),
+        change('new-decided', 'PURCHASE_DECIDED', days_ago=5),
+        change('old-delivering', 'DELIVERING', days_ago=20),
+    ])
+    # 보관 기간(30일) 안이므로 반영 시점의 정리에서는 삭제되지 않음
+    assert lifecycle.get_state('old-decided') == 'PURCHASE_DECIDED'
+
+    assert lifecycle.prune(now=(NOW + timedelta(days=15)).timestamp()) == 1
+
+    assert lifecycle.get_state('old-decided') is None
+    assert lifecycle.get_state('new-decided') == 'PURCHASE_DECIDED'
+    # 아직 바뀔 수 있는 주문은 보관 기간이 지나도 유지
+    assert lifecycle.get_state('old-delivering') == 'DELIVERING'
+
+
+def test_retention_comes_from_config(tmp_path):
+    lifecycle = OrderLifecycle.from_config({
+        'ORDER_LIFECYCLE_FILE': str(tmp_path / 'lifecycle.db'),
+        'ORDER_LIFECYCLE_RETENTION_DAYS': 7,
+    })
+    assert lifecycle.retention_seconds == 7 * DAY
+    lifecycle.close()
@@ -0,0 +1,92 @@
+# test_outbox.py
+# 실행: python -m pytest tests
+import pytest
+
+from ..outbox import STATUS_DEAD, Outbox, OutboxDispatcher
+
+
+@pytest.fixture
+def outbox_file(tmp_path):
+    return str(tmp_path / 'outbox.db')
+
+
+@pytest.fixture
+def outbox(outbox_file):
+    outbox = Outbox(outbox_file)
+    yield outbox
+    outbox.close()
+
+
+def make_dispatcher(outbox, handler, batch_size=1, max_attempts=3, retry_after=None):
+    dispatcher = OutboxDispatcher(outbox, base_backoff=0, max_attempts=max_attempts)
+    dispatcher.register_handler('slack_order', handler, batch_size=batch_size, retry_after=retry_after)
+    return dispatcher
+
+
+def test_same_dedup_key_is_enqueued_once(outbox):
+    assert outbox.enqueue_many('slack_order', [('1', {'id': 1}), ('2', {'id': 2})]) == 2
+    assert outbox.enqueue_many('slack_order', [('2', {'id': 2}), ('3', {'id': 3})]) == 1
+    assert outbox.depth('slack_order') == 3
+
+
+def test_in_flight_items_are_replayed_after_restart(outbox_file):
+    outbox = Outbox(outbox_file)
+    outbox.enqueue_many('slack_order', [('1', {'id': 1}), ('2', {'id': 2})])
+    claimed = outbox.claim('slack_order', limit=2)
+    outbox.complete([claimed[0][0]])
+    outbox.close()
+
+    # 전송 중에 종료되었던 항목은 다시 시작하면 대기 상태로 돌아가 다시 전송
+    restarted = Outbox(outbox_file)
+    assert [payload for _, payload in restarted.claim('slack_order', limit=10)] == [{'id': 2}]
+    restarted.close()
+
+
+def test_failed_item_is_retried_then_marked_dead(outbox):
+    outbox.enqueue('slack_order', {'id': 1}, dedup_key='1')
+    attempts = []
+
+    def handler(payload):
+        attempts.append(payload)
+        return False
+
+    dispatcher = make_dispatcher(outbox, handler, max_attempts=3)
+    for _ in range(5):
+        dispatcher.dispatch_once('slack_order')
+
+    assert len(attempts) == 3
+    assert outbox.depth() == 0
+    assert outbox.dead_count('slack_order') == 1
+
+
+def test_batch_results_complete_retry_or_reject_each_item(outbox):
+    outbox.enqueue_many('slack_order', [('1', {'id': 1}), ('2', {'id': 2}), ('3', {'id': 3})])
+    results = {1: True, 2: False, 3: STATUS_DEAD}
+    dispatcher = make_dispatcher(outbox, lambda payloads: [results[payload['id']] for payload in payloads],
+                                 batch_size=10)
+
+    assert dispatcher.dispatch_once('slack_order') == 3
+
+    # 성공은 완료, 실패는 재시도 대기, 전송할 수 없는 항목은 바로 dead
+    assert outbox.depth() == 1
+    assert outbox.dead_count() == 1
+    assert [payload for _, payload in outbox.claim('slack_order', limit=10)] == [{'id': 2}]
+
+
+def test_channel_waits_while_retry_after_is_set(outbox):
+    outbox.enqueue('slack_order', {'id': 1}, dedup_key='1')
+    sent = []
+    dispatcher = make_dispatcher(outbox, lambda payload: sent.append(payload) or True, retry_after=lambda: 30)
+
+    assert dispatcher.dispatch_once('slack_order') == 0
+    assert sent == [] and outbox.depth() == 1
+
+
+def test_done_items_are_purged_after_retention(outbox):
+    outbox.enqueue('slack_order', {'id': 1}, dedup_key='1')
+    outbox.complete([outbox_id for outbox_id, _ in outbox.claim('slack_order')])
+
+    assert outbox.purge_done(older_than_seconds=3600) == 0
+    assert outbox.purge_done(older_than_seconds=-1) == 1
+    # 정리한 뒤에는 같은 키로 다시 추가할 수 있음
+    assert outbox.enqueue('slack_order', {'id': 1}, dedup_key='1')
@@ -0,0 +1,168 @@
+# test_resilience.py
+# 실행: python -m pytest tests
+import pytest
+
+from ..resilience import (
+    CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, ResilienceManager, RetryPolicy
+)
+
+
+class FakeResponse:
+    def __init__(self, status_code, retry_after=None):
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class SafeError(Exception):
+    """요청이 서버에 전달되지 않은 오류 (연결 실패)"""
+
+
+def make_sender(*outcomes):
+    """outcomes를 차례로 반환/발생시키는 send 함수와 호출 기록"""
+    calls = []
+    outcomes = list(outcomes)
+
+    def send():
+        calls.append(len(calls) + 1)
+        outcome = outcomes.pop(0) if len(outcomes) > 1 else outcomes[0]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    return send, calls
+
+
+def make_manager(clock, max_attempts=3, failure_threshold=5, reset_timeout=30.0, max_delay=10.0):
+    sleeps = []
+    manager = ResilienceManager(
+        retry_policy=RetryPolicy(max_attempts=max_attempts, base_delay=0.5, max_delay=max_delay,
+                                 random_func=lambda: 1.0),
+        failure_threshold=failure_threshold,
+        reset_timeout=reset_timeout,
+        sleep=sleeps.append,
+        clock=clock,
+    )
+    return manager, sleeps
+
+
+def call(manager, endpoint, send, idempotent):
+    return manager.call(
+        endpoint,
+        send,
+        idempotent=idempotent,
+        is_failure=lambda response: response.status_code >= 500,
+        is_safe_error=lambda error: isinstance(error, SafeError),
+        retry_after_of=lambda response: response.retry_after,
+    )
+
+
+def test_breaker_opens_after_threshold_and_fails_fast(clock):
+    breaker = CircuitBreaker('test', failure_threshold=2, reset_timeout=30.0, clock=clock)
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    clock.advance(10)
+    with pytest.raises(CircuitOpenError) as error:
+        breaker.before_request()
+    assert error.value.retry_after == pytest.approx(20.0)
+
+
+def test_half_open_allows_single_trial(clock):
+    breaker = CircuitBreaker('test', failure_threshold=1, reset_timeout=30.0, clock=clock)
+    breaker.record_failure()
+    clock.advance(30)
+    assert breaker.state == HALF_OPEN
+
+    breaker.before_request()
+    # 시험 요청이 끝나기 전의 다른 요청은 차단
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    breaker.before_request()
+
+
+def test_failed_trial_reopens_breaker(clock):
+    breaker = CircuitBreaker('test', failure_threshold=3, reset_timeout=30.0, clock=clock)
+    for _ in range(3):
+        breaker.record_failure()
+    clock.advance(30)
+
+    breaker.before_request()
+    breaker.record_failure()
+
+    assert breaker.state == OPEN
+    assert breaker.retry_after() == pytest.approx(30.0)
+
+
+def test_idempotent_request_retried_with_backoff(clock):
+    manager, sleeps = make_manager(clock)
+    send, calls = make_sender(FakeResponse(500), FakeResponse(502), FakeResponse(200))
+
+    response = call(manager, 'query', send, idempotent=True)
+
+    assert response.status_code == 200
+    assert len(calls) == 3
+    assert sleeps == [0.5, 1.0]
+
+
+def test_non_idempotent_request_not_retried_after_response(clock):
+    manager, sleeps = make_manager(clock)
+    send, calls = make_sender(FakeResponse(500))
+
+    response = call(manager, 'sms', send, idempotent=False)
+
+    assert response.status_code == 500
+    assert len(calls) == 1
+    assert sleeps == []
+
+
+def test_non_idempotent_request_not_retried_after_unknown_error(clock):
+    manager, sleeps = make_manager(clock)
+    send, calls = make_sender(TimeoutError('read timeout'))
+
+    with pytest.raises(TimeoutError):
+        call(manager, 'sms', send, idempotent=False)
+    assert len(calls) == 1
+
+
+def test_non_idempotent_request_retried_when_not_sent(clock):
+    manager, sleeps = make_manager(clock)
+    send, calls = make_sender(SafeError('connection refused'), FakeResponse(202))
+
+    response = call(manager, 'sms', send, idempotent=False)
+
+    assert response.status_code == 202
+    assert len(calls) == 2
+
+
+def test_retry_after_is_capped_by_max_delay(clock):
+    manager, sleeps = make_manager(clock, max_delay=10.0)
+    send, calls = make_sender(FakeResponse(503, retry_after=120), FakeResponse(503, retry_after=3),
+                              FakeResponse(200))
+
+    call(manager, 'query', send, idempotent=True)
+
+    assert sleeps == [10.0, 3.0]
+
+
+def test_retries_stop_once_breaker_opens(clock):
+    manager, sleeps = make_manager(clock, max_attempts=5, failure_threshold=2)
+    send, calls = make_sender(FakeResponse(500))
+
+    response = call(manager, 'query', send, idempotent=True)
+
+    assert response.status_code == 500
+    assert len(calls) == 2
+    with pytest.raises(CircuitOpenError):
+        call(manager, 'query', send, idempotent=True)
+    assert len(calls) == 2
+
+    # 차단 시간이 지나면 시험 요청 1건으로 다시 닫힘
+    clock.advance(30)
+    send, calls = make_sender(FakeResponse(200))
+    assert call(manager, 'query', send, idempotent=True).status_code == 200
+    assert manager.breaker('query').state == CLOSED
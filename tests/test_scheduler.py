@@ -0,0 +1,77 @@
+# test_scheduler.py
+# 실행: python -m pytest tests
+from ..order_check import OrderManager
+from ..scheduler import PollScheduler
+from .conftest import TEST_CLIENT_SECRET
+
+
+def make_scheduler(clock, **kwargs):
+    options = dict(base_interval=10, min_interval=5, max_interval=60, backoff_factor=2, jitter_ratio=0)
+    options.update(kwargs)
+    return PollScheduler(clock=clock, sleep=clock.advance, **options)
+
+
+def test_interval_backs_off_when_quiet_and_resets_on_orders(clock):
+    scheduler = make_scheduler(clock)
+
+    for expected in (20, 40, 60, 60):
+        scheduler.record_result(0)
+        assert scheduler.interval == expected
+
+    scheduler.record_result(3)
+    assert scheduler.interval == 5
+
+
+def test_next_delay_keeps_fixed_rate(clock):
+    scheduler = make_scheduler(clock)
+    assert scheduler.next_delay() == 0.0
+
+    # 처리에 4초 걸렸으면 남은 6초만 대기
+    clock.advance(4)
+    assert scheduler.next_delay() == 6
+
+    # 처리 시간이 주기보다 길면 밀린 주기를 건너뛰고 바로 실행
+    clock.advance(6 + 25)
+    assert scheduler.next_delay() == 0.0
+
+
+def test_retry_after_and_exhausted_quota_hold_next_poll(clock):
+    scheduler = make_scheduler(clock)
+    scheduler.next_delay()
+
+    scheduler.note_rate_limits([
+        {'Retry-After': '30'},
+        {'GNCP-GW-RateLimit-Remaining': '0', 'GNCP-GW-RateLimit-Replenish-Rate': '0.01'},
+    ])
+
+    # 두 응답 중 더 긴 대기(1 / 0.01 = 100초)를 따름
+    assert scheduler.next_delay() == 100
+
+
+def test_unparseable_retry_after_waits_one_interval(clock):
+    scheduler = make_scheduler(clock)
+    scheduler.next_delay()
+
+    scheduler.note_rate_limit({'Retry-After': 'later'})
+
+    assert scheduler.next_delay() == 10
+
+
+def test_response_headers_are_kept_per_change_type(config_file, fake_http):
+    # 변경 구분별 조회 스레드가 서로의 응답 헤더를 덮어쓰지 않고, 한 번 읽으면 비워짐
+    fake_http.list_headers = {
+        'PAYED': {'GNCP-GW-RateLimit-Remaining': '5'},
+        'CLAIM_REQUESTED': {'Retry-After': '30'},
+    }
+    manager = OrderManager(client_id='client', client_secret=TEST_CLIENT_SECRET, http_client=fake_http)
+    try:
+        for change_type in ('CLAIM_REQUESTED', 'PAYED'):
+            list(manager.iter_new_order_pages(change_type))
+
+        headers_list = manager.take_response_headers()
+        assert {'Retry-After': '30'} in headers_list
+        assert {'GNCP-GW-RateLimit-Remaining': '5'} in headers_list
+        assert manager.take_response_headers() == []
+    finally:
+        manager.close()
+        manager.notified_order_ids.close()
@@ -0,0 +1,89 @@
+# test_sens.py
+# 실행: python -m pytest tests
+import pytest
+
+from ..kakao_templates import KakaoTemplate, KakaoTemplateRegistry
+from ..order_kakao import KakaoTalkManager
+from ..order_sms import SMSManager
+from .conftest import FakeResponse
+
+
+class FakeSensClient:
+    """SENS 발송 요청마다 정해진 응답을 반환"""
+
+    def __init__(self, response):
+        self.response = response
+        self.requests = []
+
+    def post(self, url, **kwargs):
+        self.requests.append((url, kwargs))
+        return self.response
+
+
+@pytest.fixture
+def sms_manager(config_file):
+    def make(response):
+        manager = SMSManager(http_client=FakeSensClient(response))
+        managers.append(manager)
+        return manager
+
+    managers = []
+    yield make
+    for manager in managers:
+        manager.close()
+
+
+@pytest.fixture
+def kakao_manager(config_file):
+    templates = KakaoTemplateRegistry([KakaoTemplate('ORDER', '{고객명}님 주문이 접수되었습니다.')])
+
+    def make(response):
+        manager = KakaoTalkManager(http_client=FakeSensClient(response), template_registry=templates)
+        managers.append(manager)
+        return manager
+
+    managers = []
+    yield make
+    for manager in managers:
+        manager.close()
+
+
+def test_sms_non_json_error_keeps_status_code(sms_manager):
+    manager = sms_manager(FakeResponse(502, text='<html>Bad Gateway</html>'))
+
+    results = manager.send_bulk('01000000000', ['01011111111', '01022222222'], content='안내')
+
+    assert [result['to'] for result in results] == ['01011111111', '01022222222']
+    assert all(not result['success'] and result['statusCode'] == 502 for result in results)
+    assert results[0]['error'] == '<html>Bad Gateway</html>'
+
+
+def test_sms_accepted_response(sms_manager):
+    manager = sms_manager(FakeResponse(202, {'requestId': 'req-1', 'statusCode': '202'}))
+
+    results = manager.send_bulk('01000000000', ['01011111111'], content='안내')
+
+    assert results == [{'to': '01011111111', 'success': True, 'requestId': 'req-1', 'statusCode': '202', 'error': None}]
+
+
+def test_kakao_non_json_error_keeps_status_code(kakao_manager):
+    manager = kakao_manager(FakeResponse(502, text='<html>Bad Gateway</html>'))
+
+    results = manager.send_many('ORDER', [('01011111111', {'고객명': '홍길동'})])
+
+    assert len(results) == 1
+    assert not results[0]['success']
+    assert results[0]['statusCode'] == 502
+    assert results[0]['requestId'] is None
+
+
+def test_kakao_messages_are_sent_in_chunks(kakao_manager):
+    manager = kakao_manager(FakeResponse(202, {'requestId': 'req-1', 'statusCode': '202'}))
+    recipients = [(f'010{index:08d}', {'고객명': f'고객{index}'}) for index in range(150)]
+
+    results = manager.send_many('ORDER', recipients, max_workers=2, rate_per_second=1000)
+
+    assert [result['to'] for result in results] == [to_number for to_number, _ in recipients]
+    assert all(result['success'] for result in results)
+    # 요청당 최대 100건씩 나누어 발송
+    assert len(manager.http_client.requests) == 2
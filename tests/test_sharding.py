@@ -0,0 +1,177 @@
+# test_sharding.py
+# 실행: python -m pytest tests
+import json
+
+import pytest
+
+from ..order_check import OrderManager
+from ..sharding import ConsistentHashRing, LeaseCoordinator, LeaseStore
+from ..supervisor import worker_file
+from .conftest import TEST_CLIENT_SECRET, make_changed_order
+
+STORE_IDS = [f"store-{index}" for index in range(10)]
+LEASE_TTL = 30.0
+RENEW_INTERVAL = 10.0
+
+
+@pytest.fixture
+def lease_store(tmp_path, clock):
+    store = LeaseStore(str(tmp_path / 'leases.db'), clock=clock)
+    yield store
+    store.close()
+
+
+def make_coordinator(lease_store, clock, worker_id):
+    return LeaseCoordinator(
+        lease_store, worker_id, STORE_IDS, ttl=LEASE_TTL, renew_interval=RENEW_INTERVAL, clock=clock
+    )
+
+
+def assert_no_shared_store(*coordinators):
+    for store_id in STORE_IDS:
+        owners = [coordinator.worker_id for coordinator in coordinators if coordinator.owns(store_id)]
+        assert len(owners) <= 1, f"{store_id}를 여러 작업자가 조회: {owners}"
+
+
+def test_single_worker_acquires_all_stores(lease_store, clock):
+    worker = make_coordinator(lease_store, clock, 'worker-0')
+    worker.rebalance()
+
+    assert worker.owned_stores == sorted(STORE_IDS)
+    assert all(lease_store.owner_of(store_id) == 'worker-0' for store_id in STORE_IDS)
+
+
+def test_owns_turns_false_inside_safety_margin(lease_store, clock):
+    worker = make_coordinator(lease_store, clock, 'worker-0')
+    worker.rebalance()
+
+    clock.advance(LEASE_TTL - RENEW_INTERVAL - 0.1)
+    assert worker.owns('store-0')
+
+    clock.advance(0.2)
+    assert not worker.owns('store-0')
+    # 임대 자체는 아직 유효하므로 다른 작업자는 획득하지 못함
+    assert lease_store.owner_of('store-0') == 'worker-0'
+
+
+def test_second_worker_cannot_acquire_live_lease(lease_store, clock):
+    worker_0 = make_coordinator(lease_store, clock, 'worker-0')
+    worker_1 = make_coordinator(lease_store, clock, 'worker-1')
+    worker_0.rebalance()
+
+    worker_1.rebalance()
+
+    assert worker_1.owned_stores == []
+    assert worker_0.owned_stores == sorted(STORE_IDS)
+
+
+def test_expired_lease_is_taken_over(lease_store, clock):
+    worker_0 = make_coordinator(lease_store, clock, 'worker-0')
+    worker_1 = make_coordinator(lease_store, clock, 'worker-1')
+    worker_0.rebalance()
+
+    # worker-0이 멈춘 뒤 임대 만료 전에는 넘겨받지 못함
+    clock.advance(LEASE_TTL / 2)
+    worker_1.rebalance()
+    assert worker_1.owned_stores == []
+
+    clock.advance(LEASE_TTL / 2 + 1)
+    worker_1.rebalance()
+    assert worker_1.owned_stores == sorted(STORE_IDS)
+    assert not any(worker_0.owns(store_id) for store_id in STORE_IDS)
+
+
+def test_reassigned_store_is_handed_off_after_lease_expiry(lease_store, clock):
+    worker_0 = make_coordinator(lease_store, clock, 'worker-0')
+    worker_1 = make_coordinator(lease_store, clock, 'worker-1')
+    worker_0.rebalance()
+
+    ring = ConsistentHashRing(['worker-0', 'worker-1'])
+    moved = [store_id for store_id in STORE_IDS if ring.node_for(store_id) == 'worker-1']
+    kept = [store_id for store_id in STORE_IDS if ring.node_for(store_id) == 'worker-0']
+    assert moved and kept
+
+    # 두 작업자가 갱신 주기마다 번갈아 재배정
+    handed_off_at = None
+    for step in range(8):
+        worker_1.rebalance()
+        assert_no_shared_store(worker_0, worker_1)
+        worker_0.rebalance()
+        assert_no_shared_store(worker_0, worker_1)
+
+        # 배정에서 빠진 스토어는 바로 조회를 멈추지만 임대는 만료 전까지 반환하지 않음
+        assert not any(worker_0.owns(store_id) for store_id in moved)
+        if handed_off_at is None and worker_1.owned_stores:
+            handed_off_at = step * RENEW_INTERVAL
+        elif handed_off_at is None:
+            assert all(lease_store.owner_of(store_id) == 'worker-0' for store_id in moved)
+        clock.advance(RENEW_INTERVAL)
+
+    assert handed_off_at is not None and handed_off_at >= LEASE_TTL - RENEW_INTERVAL
+    assert worker_1.owned_stores == sorted(moved)
+    assert worker_0.owned_stores == sorted(kept)
+
+
+def test_stop_releases_leases_to_other_workers(lease_store, clock):
+    worker_0 = make_coordinator(lease_store, clock, 'worker-0')
+    worker_1 = make_coordinator(lease_store, clock, 'worker-1')
+    worker_0.rebalance()
+
+    worker_0.stop()
+    worker_1.rebalance()
+
+    assert worker_0.owned_stores == []
+    assert worker_1.owned_stores == sorted(STORE_IDS)
+
+
+def test_worker_file_name():
+    assert worker_file('order_outbox.db', 'worker-0') == 'order_outbox.worker-0.db'
+
+
+def make_order_manager(http_client, coordinator, store_id):
+    manager = OrderManager(client_id='client', client_secret=TEST_CLIENT_SECRET, http_client=http_client)
+    manager.poll_guard = lambda: coordinator.owns(store_id)
+    return manager
+
+
+def notified_ids(slack_messages, product_order_ids):
+    return [
+        product_order_id
+        for message in slack_messages
+        for product_order_id in product_order_ids
+        if product_order_id in json.dumps(message, ensure_ascii=False)
+    ]
+
+
+def test_slow_notify_stops_before_new_owner_takes_over(lease_store, clock, config_file, fake_http):
+    # Slack 전송이 느려 임대 만료가 다가오면 남은 알림은 보내지 않고, 새 담당 작업자가 나머지만 보냄
+    store_id = STORE_IDS[0]
+    product_order_ids = [f"order-{index}" for index in range(1, 6)]
+    orders = [make_changed_order(product_order_id) for product_order_id in product_order_ids]
+
+    worker_0 = make_coordinator(lease_store, clock, 'worker-0')
+    worker_1 = make_coordinator(lease_store, clock, 'worker-1')
+    worker_0.rebalance()
+    manager_0 = make_order_manager(fake_http, worker_0, store_id)
+    manager_1 = make_order_manager(fake_http, worker_1, store_id)
+    try:
+        fake_http.on_slack = lambda url, message: clock.advance(8) if url == 'http://slack/order' else None
+        failed = manager_0.process_order_page(orders)
+
+        sent_by_worker_0 = notified_ids(fake_http.slack_messages, product_order_ids)
+        assert 0 < len(sent_by_worker_0) < len(product_order_ids)
+        assert failed == set(product_order_ids) - set(sent_by_worker_0)
+        assert manager_0.notification_coalescer.pending_count == 0
+
+        # worker-0이 멈춰 임대가 만료되면 worker-1이 이어받아 같은 주문 목록을 처리
+        fake_http.on_slack = None
+        clock.advance(LEASE_TTL)
+        worker_1.rebalance()
+        assert worker_1.owns(store_id) and not worker_0.owns(store_id)
+        assert manager_1.process_order_page(orders) == set()
+
+        assert sorted(notified_ids(fake_http.slack_messages, product_order_ids)) == product_order_ids
+    finally:
+        for manager in (manager_0, manager_1):
+            manager.close()
+            manager.notified_order_ids.close()
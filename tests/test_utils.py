@@ -0,0 +1,47 @@
+# test_utils.py
+# 실행: python -m pytest tests
+import logging
+import queue
+
+from ..utils import _DeferredQueueHandler
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self, level=logging.NOTSET):
+        super().__init__(level)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def make_record(level, message):
+    return logging.LogRecord('order_management', level, __file__, 1, message, None, None)
+
+
+def test_full_log_queue_drops_low_levels_and_writes_warnings_directly():
+    log_queue = queue.Queue(maxsize=1)
+    fallback = RecordingHandler()
+    handler = _DeferredQueueHandler(log_queue, fallback_handlers=(fallback,))
+
+    handler.handle(make_record(logging.INFO, '첫 로그'))
+    # 큐가 가득 차도 호출 스레드는 기다리지 않음
+    handler.handle(make_record(logging.DEBUG, '버릴 로그'))
+    handler.handle(make_record(logging.INFO, '버릴 로그'))
+    handler.handle(make_record(logging.WARNING, '경고'))
+
+    assert handler.dropped == 2
+    assert [record.getMessage() for record in fallback.records] == ['경고']
+    assert log_queue.get_nowait().getMessage() == '첫 로그'
+
+
+def test_fallback_handler_level_is_respected():
+    log_queue = queue.Queue(maxsize=1)
+    fallback = RecordingHandler(level=logging.ERROR)
+    handler = _DeferredQueueHandler(log_queue, fallback_handlers=(fallback,))
+    log_queue.put_nowait(make_record(logging.INFO, '첫 로그'))
+
+    handler.handle(make_record(logging.WARNING, '경고'))
+    handler.handle(make_record(logging.ERROR, '오류'))
+
+    assert [record.getMessage() for record in fallback.records] == ['오류']
@@ -0,0 +1,46 @@
+# token_cache.py
+import json
+import os
+from .utils import setup_logging
+
+
+class TokenCache:
+    """액세스 토큰을 JSON 파일에 저장 (소유자만 읽고 쓸 수 있도록 0600 권한)
+
+    파일은 암호화하지 않으므로 권한으로만 보호합니다.
+    저장한 client_id가 다르면 다른 계정의 토큰이므로 읽지 않습니다.
+    """
+
+    def __init__(self, filename, client_id):
+        self.filename = filename
+        self.client_id = client_id
+        self.logger = setup_logging()
+
+    def load(self):
+        """저장된 토큰 정보(dict) 반환, 없거나 읽을 수 없으면 None"""
+        try:
+            with open(self.filename, 'r', encoding='utf-8') as f:
+                token_data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.logger.warning(f"토큰 캐시를 읽을 수 없습니다 (새로 발급): {str(e)}")
+            return None
+
+        if not isinstance(token_data, dict) or token_data.get('client_id') != self.client_id:
+            self.logger.info("다른 계정의 토큰 캐시이므로 사용하지 않습니다")
+            return None
+        return token_data
+
+    def save(self, token_data):
+        """토큰 정보 저장 (소유자만 읽을 수 있도록 권한 설정)"""
+        try:
+            tmp_filename = f"{self.filename}.tmp"
+            fd = os.open(tmp_filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            # 이미 있던 임시 파일은 생성 권한이 적용되지 않으므로 다시 설정
+            os.chmod(tmp_filename, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(dict(token_data, client_id=self.client_id), f)
+            os.replace(tmp_filename, self.filename)
+        except Exception as e:
+            self.logger.error(f"토큰 캐시 저장 중 오류 발생: {str(e)}", exc_info=True)
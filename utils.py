@@ -1,22 +1,106 @@
 # utils.py
+import atexit
 import json
 import os
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
-def setup_logging():
-    """로깅 설정"""
+# 로그 큐 최대 길이 (가득 차면 INFO 이하 로그는 버리고, WARNING 이상은 호출 스레드에서 직접 기록)
+LOG_QUEUE_SIZE = 10000
+
+_log_listener = None
+_queue_handler = None
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """한 줄에 하나의 JSON 객체로 출력하는 포맷터 (로그 수집기 연동용)"""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """메시지 포맷을 큐 작업 스레드로 미루는 QueueHandler
+
+    기본 QueueHandler.prepare()는 호출 스레드에서 메시지를 포맷하므로,
+    레코드를 그대로 넘기고 포맷/파일 쓰기는 모두 QueueListener 스레드에서 처리합니다.
+    큐가 가득 차면 WARNING 이상은 fallback_handlers로 직접 기록하고, 그 밖의 로그는 버린 건수만 셉니다.
+    """
+
+    def __init__(self, log_queue, fallback_handlers=()):
+        super().__init__(log_queue)
+        self.fallback_handlers = list(fallback_handlers)
+        self.dropped = 0
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if record.levelno < logging.WARNING:
+                # emit()은 핸들러 잠금 안에서 호출되므로 별도 잠금 없이 증가
+                self.dropped += 1
+                return
+            for handler in self.fallback_handlers:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+
+
+def get_dropped_log_count():
+    """로그 큐가 가득 차서 버린 로그 수 (큐를 사용하지 않으면 0)"""
+    return _queue_handler.dropped if _queue_handler is not None else 0
+
+
+def _env_flag(name):
+    return os.environ.get(name, '').lower() in ('1', 'true', 'yes', 'on')
+
+
+def _stop_log_listener():
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+
+def setup_logging(use_queue=None, json_lines=None):
+    """로깅 설정
+
+    처음 호출될 때 핸들러를 구성하고 이후에는 같은 로거를 반환합니다.
+    - use_queue: True이면 파일/콘솔 출력을 별도 스레드(QueueListener)에서 처리하여
+      호출 스레드가 디스크 I/O를 기다리지 않음 (None이면 환경 변수 ORDER_LOG_QUEUE)
+    - json_lines: True이면 JSON Lines 형식으로 출력 (None이면 환경 변수 ORDER_LOG_FORMAT=json)
+    로그 파일 경로는 환경 변수 ORDER_LOG_FILE로 바꿀 수 있습니다 (기본 logs/order_management.log).
+    """
+    global _log_listener, _queue_handler
     logger = logging.getLogger('OrderManagement')
     if not logger.handlers:
+        if use_queue is None:
+            use_queue = _env_flag('ORDER_LOG_QUEUE')
+        if json_lines is None:
+            json_lines = os.environ.get('ORDER_LOG_FORMAT', '').lower() == 'json'
+
         logger.setLevel(logging.INFO)
         
         # 파일 핸들러 설정
-        log_dir = 'logs'
-        if not os.path.exists(log_dir):
+        log_file = os.environ.get('ORDER_LOG_FILE') or os.path.join('logs', 'order_management.log')
+        log_dir = os.path.dirname(log_file)
+        if log_dir and not os.path.exists(log_dir):
             os.makedirs(log_dir)
             
         file_handler = RotatingFileHandler(
-            os.path.join(log_dir, 'order_management.log'),
+            log_file,
             maxBytes=10*1024*1024,
             backupCount=5
         )
@@ -27,41 +111,40 @@ def setup_logging():
         console_handler.setLevel(logging.INFO)
         
         # 포맷터 설정
-        formatter = logging.Formatter(
-            '%(asctime)s - %(levelname)s - %(message)s'
-        )
+        if json_lines:
+            formatter = JsonLinesFormatter()
+        else:
+            formatter = logging.Formatter(
+                '%(asctime)s - %(levelname)s - %(message)s'
+            )
         file_handler.setFormatter(formatter)
         console_handler.setFormatter(formatter)
         
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
+        if use_queue:
+            log_queue = queue.Queue(LOG_QUEUE_SIZE)
+            _log_listener = QueueListener(
+                log_queue, file_handler, console_handler, respect_handler_level=True
+            )
+            _log_listener.start()
+            # 종료 시 큐에 남은 로그를 모두 기록
+            atexit.register(_stop_log_listener)
+            _queue_handler = _DeferredQueueHandler(log_queue, fallback_handlers=(file_handler, console_handler))
+            logger.addHandler(_queue_handler)
+        else:
+            logger.addHandler(file_handler)
+            logger.addHandler(console_handler)
     
     return logger
 
 def load_config(config_path=None):
-    """설정 파일 로드"""
+    """설정 파일 로드 (한 번 읽은 설정을 캐시하고 파일이 바뀌면 다시 읽음)"""
+    from .config_service import get_config_service
+    
     logger = setup_logging()
     
     try:
-        if config_path is None:
-            # 기본 설정 파일 경로
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            config_path = os.path.join(current_dir, '..', 'config.json')
-        
-        logger.debug(f"설정 파일 경로: {config_path}")
-        
-        if not os.path.exists(config_path):
-            logger.error(f"설정 파일이 존재하지 않습니다: {config_path}")
-            return None
-            
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-            logger.debug("설정 파일 로드 성공")
-            return config
+        return get_config_service(config_path).get()
             
-    except json.JSONDecodeError as e:
-        logger.error(f"설정 파일 형식이 잘못되었습니다: {str(e)}")
-        return None
     except Exception as e:
         logger.error(f"설정 파일 로드 중 오류 발생: {str(e)}")
         return None